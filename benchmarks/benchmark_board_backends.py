@@ -0,0 +1,58 @@
+"""
+Benchmark comparing the list-of-lists Board with the BitBoard backend.
+Each run plays random games to completion, checking for a winner and a full
+board after every move, as GameManager does.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_board_backends.py
+Author: Emily Boegheim
+"""
+
+import random
+import time
+
+from bitboard import BitBoard
+from board import Board
+
+
+def play_random_games(board_class: type, size: int, move_orders: list) -> float:
+    """
+    Play one game per move order on a new board of the given class, and
+    return the time taken.
+    :param board_class: the board class to benchmark.
+    :param size: the size of the game board on each side.
+    :param move_orders: a list of shuffled move sequences, one per game.
+    :returns: the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    for move_order in move_orders:
+        board = board_class(size)
+        player = 1
+        for move in move_order:
+            board.add_player_move(player, move)
+            if board.find_winner() or board.is_board_full():
+                break
+            player = 3 - player
+    return time.perf_counter() - start
+
+
+def main(games: int = 200, seed: int = 0) -> None:
+    """
+    Run the benchmark for board sizes 3 through 16 and print the results.
+    :param games: the number of games to play per board size and backend.
+    :param seed: the seed for the random move orders.
+    """
+    generator = random.Random(seed)
+    print(f"{'size':>4} {'Board (s)':>10} {'BitBoard (s)':>13} {'speedup':>8}")
+    for size in range(3, 17):
+        move_orders = []
+        for _ in range(0, games):
+            move_order = list(range(0, size * size))
+            generator.shuffle(move_order)
+            move_orders.append(move_order)
+        list_time = play_random_games(Board, size, move_orders)
+        bit_time = play_random_games(BitBoard, size, move_orders)
+        print(f"{size:>4} {list_time:>10.4f} {bit_time:>13.4f} "
+              f"{list_time / bit_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
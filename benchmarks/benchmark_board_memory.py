@@ -0,0 +1,98 @@
+"""
+Memory benchmark for storing board positions. Uses tracemalloc to measure
+the bytes per position of keeping whole Board objects, copies of the
+list-of-lists board data, and BoardSnapshots, for several board sizes. The
+"original" column keeps the same positions in the original Board's layout,
+for comparison. Board is larger than that, as it also keeps the counters and
+indexes which make finding the winner and the empty cells fast; positions
+kept in bulk should be stored as snapshots.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_board_memory.py
+Author: Emily Boegheim
+"""
+
+import random
+import tracemalloc
+
+from board import Board
+
+
+class OriginalBoard:
+    """
+    The state the original Board kept, before the incremental counters,
+    indexes and __slots__ were added: the list-of-lists cells and a few
+    attributes in a __dict__. The cells are copied from a Board, so that the
+    same positions are measured.
+    """
+
+    def __init__(self, board: Board) -> None:
+        """
+        Copy a board's cells.
+        :param board: the board to copy.
+        """
+        self.size = board.size
+        self.empty = 0
+        self._minimum_move = 0
+        self._maximum_move = board.size * board.size - 1
+        self._board = [list(row) for row in board.get_board_data()]
+
+
+def measure_bytes_per_position(make_position, count: int) -> float:
+    """
+    Measure the memory used by keeping many positions.
+    :param make_position: a function taking a position number and returning
+        the object to keep.
+    :param count: the number of positions to keep.
+    :returns: the average number of bytes allocated per position.
+    """
+    # Make one position first, so that one-off allocations such as caches
+    # are not counted.
+    make_position(0)
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    positions = [make_position(number) for number in range(0, count)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del positions
+    return (end - start) / count
+
+
+def make_board(size: int, seed: int) -> Board:
+    """
+    Build a board with a random half-filled position.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for choosing the moves.
+    :returns: the board.
+    """
+    generator = random.Random(seed)
+    board = Board(size)
+    player = 1
+    for _ in range(0, size * size // 2):
+        board.add_player_move(player, board.get_random_empty_move(generator))
+        player = 3 - player
+    return board
+
+
+def main(count: int = 500) -> None:
+    """
+    Run the benchmark and print the results.
+    :param count: the number of positions to keep for each measurement.
+    """
+    print(f"{'size':>4} {'original':>10} {'Board':>10} {'list data':>10} "
+          f"{'snapshot':>10}")
+    for size in (3, 8, 32):
+        boards = [make_board(size, seed) for seed in range(0, count)]
+        original_bytes = measure_bytes_per_position(
+            lambda number: OriginalBoard(boards[number]), count)
+        board_bytes = measure_bytes_per_position(
+            lambda number: make_board(size, number), count)
+        list_bytes = measure_bytes_per_position(
+            lambda number: [list(row) for row in
+                            boards[number].get_board_data()], count)
+        snapshot_bytes = measure_bytes_per_position(
+            lambda number: boards[number].snapshot(), count)
+        print(f"{size:>4} {original_bytes:>10.0f} {board_bytes:>10.0f} "
+              f"{list_bytes:>10.0f} {snapshot_bytes:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
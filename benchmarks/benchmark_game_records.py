@@ -0,0 +1,76 @@
+"""
+Benchmark for the binary game record format. Plays random games, writes them
+to a record file and reads them back, reporting records per second for each
+direction and the average size of a record.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_game_records.py
+Author: Emily Boegheim
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from board import Board
+from game_record import GameRecord, GameRecordWriter, read_records
+
+
+def play_random_games(games: int, size: int, seed: int) -> list[GameRecord]:
+    """
+    Play games between two random players and record them.
+    :param games: the number of games to play.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for the random number generator.
+    :returns: a record of each game.
+    """
+    generator = random.Random(seed)
+    board = Board(size)
+    records = []
+    for _ in range(0, games):
+        board.reset()
+        moves = []
+        player = 1
+        winner = 0
+        while not board.is_board_full():
+            move = board.get_random_empty_move(generator)
+            board.add_player_move(player, move)
+            moves.append(move)
+            winner = board.find_winner()
+            if winner:
+                break
+            player = 3 - player
+        records.append(GameRecord(size, size, 2, moves, winner))
+    return records
+
+
+def main(games: int = 100000, sizes: tuple[int, ...] = (3, 4, 15)) -> None:
+    """
+    Run the benchmark and print the results.
+    :param games: the number of games to write and read for each size.
+    :param sizes: the board sizes to benchmark.
+    """
+    print(f"{'size':>4} {'written/s':>10} {'read/s':>10} {'bytes/game':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            records = play_random_games(games, size, size)
+            path = os.path.join(directory, f"games_{size}.ttr")
+
+            start = time.perf_counter()
+            with GameRecordWriter(path) as writer:
+                for record in records:
+                    writer.write(record)
+            write_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read_count = 0
+            for _ in read_records(path):
+                read_count += 1
+            read_seconds = time.perf_counter() - start
+
+            print(f"{size:>4} {games / write_seconds:>10.0f} "
+                  f"{read_count / read_seconds:>10.0f} "
+                  f"{os.path.getsize(path) / games:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
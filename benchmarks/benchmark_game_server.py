@@ -0,0 +1,149 @@
+"""
+Load test for the asyncio game server. Many clients play random games at
+once, each making every move in its game, and the time from sending each move
+to receiving the server's reply is recorded. Reports games per second, the
+peak number of concurrent games and the p50/p99 move latency. Then many
+clients each play one move against an alpha-beta opponent and keep their
+games open, and the memory held per open game is reported.
+By default a server is started in the same process. Pass a port to test a
+server which is already running.
+Run from the project root with:
+PYTHONPATH=src python benchmarks/benchmark_game_server.py [port]
+Author: Emily Boegheim
+"""
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+from game_server import GameServer
+
+
+async def play_random_game(port: int, generator: random.Random,
+                           latencies: list[float], size: int) -> None:
+    """
+    Connect to the server and play random moves for every player until the
+    game ends.
+    :param port: the server's TCP port on the local host.
+    :param generator: the random number generator used to choose moves.
+    :param latencies: a list to append the latency of each move to.
+    :param size: the size of the game board on each side.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    empty_moves = list(range(0, size * size))
+    generator.shuffle(empty_moves)
+    sent_at = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if line.startswith(b"Next move"):
+            if sent_at is not None:
+                latencies.append(time.perf_counter() - sent_at)
+            sent_at = time.perf_counter()
+            writer.write(b"%d\n" % empty_moves.pop())
+            await writer.drain()
+        elif line.startswith(b"Player") or line.startswith(b"It's"):
+            latencies.append(time.perf_counter() - sent_at)
+    writer.close()
+    await writer.wait_closed()
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """
+    Find a percentile of some values by the nearest-rank method.
+    :param values: the values, which must be sorted.
+    :param percentile: the percentile to find, between 0 and 100.
+    :returns: the value at that percentile.
+    """
+    rank = max(1, round(percentile / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+async def run_load_test(games: int, concurrency: int, port: int | None,
+                        size: int = 3, seed: int = 0) -> None:
+    """
+    Run the load test and print the results.
+    :param games: the total number of games to play.
+    :param concurrency: the number of games to play at once.
+    :param port: the port of a running server, or None to start one here.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for the random number generator.
+    """
+    server = None
+    listener = None
+    if port is None:
+        server = GameServer(size=size, max_games=concurrency)
+        listener = await server.start()
+        port = listener.sockets[0].getsockname()[1]
+
+    generator = random.Random(seed)
+    latencies = []
+    games_left = games
+
+    async def client() -> None:
+        nonlocal games_left
+        while games_left > 0:
+            games_left -= 1
+            await play_random_game(port, generator, latencies, size)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(0, concurrency)])
+    elapsed_seconds = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Games: {games} ({concurrency} concurrent clients)")
+    print(f"Games per second: {games / elapsed_seconds:.0f}")
+    print(f"Moves per second: {len(latencies) / elapsed_seconds:.0f}")
+    print(f"Move latency p50: {get_percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"Move latency p99: {get_percentile(latencies, 99) * 1000:.2f} ms")
+    if server is not None:
+        print(f"Peak concurrent games: {server.peak_active_games}")
+        listener.close()
+        await listener.wait_closed()
+
+
+async def measure_session_memory(sessions: int,
+                                 opponent: str = "alpha_beta") -> None:
+    """
+    Open many games against a computer opponent, play one move in each so
+    that the opponent has searched, and print the memory held per open game.
+    :param sessions: the number of games to hold open at once.
+    :param opponent: the name of the opponent's strategy.
+    """
+    tracemalloc.start()
+    server = GameServer(opponent=opponent, max_games=sessions)
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    memory_before = tracemalloc.get_traced_memory()[0]
+
+    async def open_game() -> asyncio.StreamWriter:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for _ in range(0, 2):
+            while not (await reader.readline()).startswith(b"Next move"):
+                pass
+            writer.write(b"4\n")
+        return writer
+
+    writers = await asyncio.gather(*[open_game() for _ in range(0, sessions)])
+    memory_used = tracemalloc.get_traced_memory()[0] - memory_before
+    tracemalloc.stop()
+    print(f"Open games against {opponent}: {sessions} "
+          f"({server.opponents_created} strategies created)")
+    print(f"Memory per open game: {memory_used / sessions / 1024:.1f} KiB")
+    for writer in writers:
+        writer.close()
+    while server.active_games > 0:
+        await asyncio.sleep(0.01)
+    listener.close()
+    await listener.wait_closed()
+
+
+if __name__ == "__main__":
+    server_port = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    for client_count in (1, 100, 1000):
+        asyncio.run(run_load_test(5000, client_count, server_port))
+    if server_port is None:
+        asyncio.run(measure_session_memory(200))
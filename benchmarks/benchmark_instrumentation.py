@@ -0,0 +1,82 @@
+"""
+Benchmark for the overhead of GameManager instrumentation. Plays the same
+random games with a plain gameplay loop (a copy of GameManager.main without
+the instrumentation check), with instrumentation disabled and with it
+enabled, and reports games per second and the overhead of each.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_instrumentation.py
+Author: Emily Boegheim
+"""
+
+import time
+
+from board import Board
+from game_manager import GameManager
+from instrumentation import GameInstrumentation
+from simulation import HeadlessUI
+from strategies import RandomStrategy
+
+
+class PlainGameManager(GameManager):
+    """A GameManager whose main loop has no instrumentation check."""
+
+    def main(self) -> None:
+        while True:
+            self.display_board()
+            if self.check_for_winner():
+                self.record_game(self.board.find_winner())
+                return
+            if self.check_for_tie():
+                self.record_game(0)
+                return
+            self.take_current_player_turn()
+            self.switch_players()
+
+
+def play_games(manager_class: type, games: int, size: int,
+               instrumentation: GameInstrumentation | None) -> float:
+    """
+    Play headless games between two seeded random players.
+    :param manager_class: the game manager class to use.
+    :param games: the number of games to play.
+    :param size: the size of the game board on each side.
+    :param instrumentation: the instrumentation to use, or None.
+    :returns: the elapsed time in seconds.
+    """
+    ui = HeadlessUI({})
+    start = time.perf_counter()
+    for game in range(0, games):
+        strategies = {1: RandomStrategy(game), 2: RandomStrategy(-game - 1)}
+        manager_class(Board(size), ui, strategies,
+                      instrumentation=instrumentation).main()
+    return time.perf_counter() - start
+
+
+def main(games: int = 20000, sizes: tuple[int, ...] = (3, 5),
+         repeats: int = 5) -> None:
+    """
+    Run the benchmark and print the results.
+    :param games: the number of games per run.
+    :param sizes: the board sizes to benchmark.
+    :param repeats: the number of runs of each variant; the fastest is used.
+    """
+    print(f"{'size':>4} {'variant':>9} {'games/s':>10} {'overhead':>9}")
+    for size in sizes:
+        variants = [("plain", PlainGameManager, None),
+                    ("disabled", GameManager, None),
+                    ("enabled", GameManager, GameInstrumentation())]
+        best_times = [float("inf")] * len(variants)
+        # Alternate between the variants, so that changes in machine load
+        # affect them all alike.
+        for _ in range(0, repeats):
+            for index, (_, manager_class, instrumentation) in enumerate(
+                    variants):
+                best_times[index] = min(best_times[index],
+                                        play_games(manager_class, games, size,
+                                                   instrumentation))
+        for (variant, _, _), elapsed in zip(variants, best_times):
+            print(f"{size:>4} {variant:>9} {games / elapsed:>10.0f} "
+                  f"{elapsed / best_times[0] - 1:>+8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark comparing two ways of walking the game tree: copying the board at
+every node, and making and undoing moves on a single board. Both walk every
+game from an empty board to a fixed depth and report nodes per second.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_make_unmake.py
+Author: Emily Boegheim
+"""
+
+import time
+
+from board import Board
+
+
+def count_nodes_with_copies(board: Board, player: int, depth: int) -> int:
+    """
+    Count the nodes of the game tree, copying the board for each child.
+    :param board: the game board.
+    :param player: the player whose move it is.
+    :param depth: the number of moves left to search.
+    :returns: the number of nodes visited.
+    """
+    nodes = 1
+    if depth == 0 or board.find_winner() or board.is_board_full():
+        return nodes
+    for move, cell in enumerate(board.get_cells()):
+        if cell == board.empty:
+            child = board.copy()
+            child.add_player_move(player, move)
+            nodes += count_nodes_with_copies(child, 3 - player, depth - 1)
+    return nodes
+
+
+def count_nodes_with_undo(board: Board, player: int, depth: int) -> int:
+    """
+    Count the nodes of the game tree, making and undoing moves on one board.
+    :param board: the game board.
+    :param player: the player whose move it is.
+    :param depth: the number of moves left to search.
+    :returns: the number of nodes visited.
+    """
+    nodes = 1
+    if depth == 0 or board.find_winner() or board.is_board_full():
+        return nodes
+    for move, cell in enumerate(board.get_cells()):
+        if cell == board.empty:
+            board.add_player_move(player, move)
+            nodes += count_nodes_with_undo(board, 3 - player, depth - 1)
+            board.undo_move()
+    return nodes
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    print(f"{'size':>4} {'depth':>5} {'nodes':>9} {'copy nodes/s':>13} "
+          f"{'undo nodes/s':>13} {'speedup':>8}")
+    for size, depth in ((3, 9), (4, 5), (6, 4), (10, 3)):
+        start = time.perf_counter()
+        nodes = count_nodes_with_copies(Board(size), 1, depth)
+        copy_rate = nodes / (time.perf_counter() - start)
+        start = time.perf_counter()
+        count_nodes_with_undo(Board(size), 1, depth)
+        undo_rate = nodes / (time.perf_counter() - start)
+        print(f"{size:>4} {depth:>5} {nodes:>9} {copy_rate:>13.0f} "
+              f"{undo_rate:>13.0f} {undo_rate / copy_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
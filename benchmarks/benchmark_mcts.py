@@ -0,0 +1,28 @@
+"""
+Benchmark for Monte Carlo Tree Search rollout throughput. Runs a fixed time
+budget from an empty board of several sizes and reports playouts per
+second, which mostly reflects the speed of the Board backend.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_mcts.py
+Author: Emily Boegheim
+"""
+
+from board import Board
+from mcts import MCTSStrategy
+
+
+def main(time_budget: float = 2.0) -> None:
+    """
+    Run the benchmark and print the results.
+    :param time_budget: the search time per board size, in seconds.
+    """
+    print(f"{'size':>4} {'win length':>10} {'playouts/s':>11}")
+    for size, win_length in ((3, 3), (5, 4), (7, 5), (9, 5), (15, 5)):
+        strategy = MCTSStrategy(seed=0, playout_budget=None,
+                                time_budget=time_budget)
+        strategy.choose_move(Board(size, win_length), 1)
+        print(f"{size:>4} {win_length:>10} "
+              f"{strategy.get_playouts_per_second():>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
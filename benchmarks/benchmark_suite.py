@@ -0,0 +1,194 @@
+"""
+Benchmark suite for the Board and ConsoleUI hot paths, with regression
+checking. Each benchmark is timed across several board sizes and the results
+are compared with a baseline stored in a JSON file. The suite fails (exits
+with status 1) when any benchmark is slower than its baseline by more than the
+threshold. Only the standard library is needed.
+
+Timings are the fastest of several repeats, in nanoseconds per call, since
+the fastest run is the one least disturbed by other activity on the machine.
+Baselines are only meaningful on the machine that recorded them, so record a
+new one with --save-baseline when the machine changes. The default baseline
+file is ignored by git for the same reason.
+Run from the project root with:
+PYTHONPATH=src python benchmarks/benchmark_suite.py [--save-baseline]
+    [--baseline PATH] [--threshold FRACTION] [--sizes 3 5 9 15]
+Author: Emily Boegheim
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Callable
+
+from board import Board
+from console_ui import ConsoleUI
+from utilities import all_items_in_collection_equal
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__),
+                                     "benchmark_baseline.json")
+DEFAULT_SIZES = (3, 5, 9, 15)
+DEFAULT_THRESHOLD = 0.25
+
+# The minimum time to spend on each repeat of a benchmark, in seconds.
+MINIMUM_REPEAT_SECONDS = 0.05
+REPEATS = 5
+
+
+class NullOutput:
+    """An output stream which discards everything written to it."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def get_half_filled_board(size: int) -> Board:
+    """
+    Build a board with about half its cells filled and no winner, so that
+    win checks cannot stop early.
+    :param size: the size of the game board on each side.
+    :returns: the board.
+    """
+    board = Board(size)
+    for move in range(0, size * size // 2):
+        row, column = divmod(move, size)
+        # Alternate players in pairs of columns, so no line is completed.
+        player = 1 + (column // 2 + row) % 2
+        board.add_player_move(player, move)
+    return board
+
+
+def get_benchmarks(size: int) -> dict[str, Callable[[], object]]:
+    """
+    Build the benchmarks for one board size.
+    :param size: the size of the game board on each side.
+    :returns: a dictionary of functions to time, by benchmark name.
+    """
+    fill_board = Board(size)
+    moves = range(0, size * size)
+
+    def add_player_move() -> None:
+        fill_board.reset()
+        add = fill_board.add_player_move
+        for move in moves:
+            add(1 + move % 2, move)
+
+    board = get_half_filled_board(size)
+    ui = ConsoleUI({0: ' ', 1: 'X', 2: 'O'}, output=NullOutput())
+    board_data = board.get_board_data()
+    equal_items = [1] * size
+    return {
+        "add_player_move (full board)": add_player_move,
+        "find_winner": board.find_winner,
+        "find_horizontal_winner": board.find_horizontal_winner,
+        "find_vertical_winner": board.find_vertical_winner,
+        "find_diagonal_winner": board.find_diagonal_winner,
+        "find_southeast_diagonal_winner":
+            board.find_southeast_diagonal_winner,
+        "find_southwest_diagonal_winner":
+            board.find_southwest_diagonal_winner,
+        "is_board_full": board.is_board_full,
+        "all_items_in_collection_equal":
+            lambda: all_items_in_collection_equal(equal_items),
+        "display_2d_board": lambda: ui.display_2d_board(board_data),
+    }
+
+
+def time_call(function: Callable[[], object]) -> float:
+    """
+    Time a function, calling it enough times for each repeat to take at
+    least MINIMUM_REPEAT_SECONDS.
+    :param function: the function to time.
+    :returns: the fastest time per call over REPEATS repeats, in nanoseconds.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(number, 1)
+    while timer.timeit(number) < MINIMUM_REPEAT_SECONDS:
+        number *= 2
+    return min(timer.repeat(REPEATS, number)) / number * 1e9
+
+
+def run_benchmarks(sizes: tuple[int, ...]) -> dict[str, float]:
+    """
+    Run every benchmark for every board size.
+    :param sizes: the board sizes to benchmark.
+    :returns: a dictionary of nanoseconds per call, keyed by
+        "<benchmark> [size=<size>]".
+    """
+    results = {}
+    for size in sizes:
+        for name, function in get_benchmarks(size).items():
+            results[f"{name} [size={size}]"] = time_call(function)
+    return results
+
+
+def find_regressions(baseline: dict[str, float], results: dict[str, float],
+                     threshold: float) -> list[tuple[str, float, float]]:
+    """
+    Compare results with a baseline. Benchmarks missing from either are
+    ignored.
+    :param baseline: the baseline nanoseconds per call, by benchmark.
+    :param results: the new nanoseconds per call, by benchmark.
+    :param threshold: the largest allowed slowdown, as a fraction of the
+        baseline (0.25 allows results up to 25% slower).
+    :returns: a list of (benchmark, baseline, result) tuples for each
+        benchmark slower than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and result > baseline[name] * (1 + threshold):
+            regressions.append((name, baseline[name], result))
+    return regressions
+
+
+def main(arguments: list[str]) -> int:
+    """
+    Run the suite and print the results.
+    :param arguments: the command line arguments.
+    :returns: the exit status: 1 if any benchmark regressed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH,
+                        help="the baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="record these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="the largest allowed slowdown as a fraction")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(DEFAULT_SIZES),
+                        help="the board sizes to benchmark")
+    options = parser.parse_args(arguments)
+
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = run_benchmarks(tuple(options.sizes))
+    print(f"{'benchmark':<48} {'ns/call':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        if name in baseline:
+            change = f"{result / baseline[name] - 1:+.1%}"
+            print(f"{name:<48} {result:>12.0f} {baseline[name]:>12.0f} "
+                  f"{change:>8}")
+        else:
+            print(f"{name:<48} {result:>12.0f} {'-':>12} {'-':>8}")
+
+    if options.save_baseline or not baseline:
+        with open(options.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {options.baseline}")
+        return 0
+
+    regressions = find_regressions(baseline, results, options.threshold)
+    for name, baseline_result, result in regressions:
+        print(f"REGRESSION: {name} took {result:.0f} ns, more than "
+              f"{options.threshold:.0%} slower than {baseline_result:.0f} ns")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Benchmark for the 4x4 tablebase. Builds the table in a temporary directory,
+reporting the build time, the peak memory traced during the build next to
+the size of the table, and then the time per lookup by rank and by board.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_tablebase.py [size]
+Author: Emily Boegheim
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from board import Board
+from tablebase import Tablebase, build_tablebase
+
+
+def get_random_positions(size: int, count: int,
+                         seed: int = 0) -> list[Board]:
+    """
+    Play random moves to build positions to look up.
+    :param size: the size of the game board on each side.
+    :param count: the number of positions.
+    :param seed: the seed for the random number generator.
+    :returns: the boards, each in an unfinished position.
+    """
+    generator = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = Board(size, number_of_players=2)
+        player = 1
+        for _ in range(0, generator.randrange(0, size * size)):
+            board.add_player_move(player,
+                                  board.get_random_empty_move(generator))
+            if board.find_winner():
+                break
+            player = 3 - player
+        else:
+            boards.append(board)
+    return boards
+
+
+def main(size: int = 4) -> None:
+    """
+    Run the benchmark and print the results.
+    :param size: the size of the game board on each side.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tablebase.bin")
+        tracemalloc.start()
+        start = time.perf_counter()
+        build_tablebase(path, size)
+        build_seconds = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Build: {build_seconds:.1f} s, table "
+              f"{os.path.getsize(path) / 1e6:.1f} MB, peak traced memory "
+              f"{peak_bytes / 1e6:.1f} MB")
+
+        with Tablebase(path) as table:
+            boards = get_random_positions(size, 1000)
+            ranks = [table.get_rank(board) for board in boards]
+            for name, function, items in (
+                    ("lookup_rank", table.lookup_rank, ranks),
+                    ("lookup", table.lookup, boards)):
+                seconds = min(timeit.repeat(
+                    lambda: [function(item) for item in items],
+                    number=100, repeat=5)) / (100 * len(items))
+                print(f"{name}: {seconds * 1e9:.0f} ns per lookup")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
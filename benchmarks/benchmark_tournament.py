@@ -0,0 +1,35 @@
+"""
+Benchmark for tournament scaling across worker processes. Plays the same
+tournament with 1, 2, 4 and N workers (N being the number of CPU cores) for
+several board sizes and reports the speedup over a single worker.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_tournament.py
+Author: Emily Boegheim
+"""
+
+import os
+
+from tournament import run_tournament
+
+
+def main(games: int = 200000, sizes: tuple[int, ...] = (3, 4, 5)) -> None:
+    """
+    Run the benchmark and print the results.
+    :param games: the number of games per tournament.
+    :param sizes: the board sizes to benchmark.
+    """
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpu_count})
+    print(f"{'size':>4} {'workers':>7} {'games/s':>10} {'speedup':>8}")
+    for size in sizes:
+        single_rate = None
+        for workers in worker_counts:
+            results = run_tournament(games, workers=workers, size=size)
+            rate = results.get_games_per_second()
+            if single_rate is None:
+                single_rate = rate
+            print(f"{size:>4} {workers:>7} {rate:>10.0f} "
+                  f"{rate / single_rate:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark for exporting board positions and writing training data. Compares
+converting a board to a NumPy array by copying its cells with a zero-copy
+view of its cell buffer, then reports the rate at which self-play samples are
+written to shards and read back through a memory map.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_training_data.py
+Author: Emily Boegheim
+"""
+
+import os
+import tempfile
+import time
+
+from board import Board
+import training_data
+from training_data import generate_self_play_data, load_shard
+
+
+def time_exports(size: int, repeats: int) -> tuple[float, float]:
+    """
+    Time converting a board's cells to a NumPy array.
+    :param size: the size of the game board on each side.
+    :param repeats: the number of conversions to time.
+    :returns: a tuple (copy_seconds, view_seconds) per conversion.
+    """
+    numpy = training_data.numpy
+    board = Board(size)
+    for move in range(0, size * size, 2):
+        board.add_player_move(1, move)
+
+    start = time.perf_counter()
+    for _ in range(0, repeats):
+        numpy.array(board.get_board_data(), dtype=numpy.uint8)
+    copy_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(0, repeats):
+        numpy.frombuffer(board.get_cell_buffer(), dtype=numpy.uint8)
+    view_seconds = (time.perf_counter() - start) / repeats
+    return copy_seconds, view_seconds
+
+
+def main(games: int = 100000) -> None:
+    """
+    Run the benchmark and print the results.
+    :param games: the number of self-play games to write.
+    """
+    if training_data.numpy is not None:
+        print(f"{'size':>4} {'copy (us)':>10} {'view (us)':>10}")
+        for size in (3, 15, 100):
+            copy_seconds, view_seconds = time_exports(size, 2000)
+            print(f"{size:>4} {copy_seconds * 1e6:>10.2f} "
+                  f"{view_seconds * 1e6:>10.2f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        samples = generate_self_play_data(directory, games)
+        write_seconds = time.perf_counter() - start
+        print(f"Self-play: {samples} samples from {games} games, "
+              f"{samples / write_seconds:.0f} samples/s including play")
+        if training_data.numpy is not None:
+            start = time.perf_counter()
+            outcome_total = 0
+            for name in sorted(os.listdir(directory)):
+                shard = load_shard(os.path.join(directory, name))
+                outcome_total += int(shard["outcome"].sum())
+            read_seconds = time.perf_counter() - start
+            print(f"Read back: {samples / read_seconds:.0f} samples/s")
+
+
+if __name__ == "__main__":
+    main()
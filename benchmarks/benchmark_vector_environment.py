@@ -0,0 +1,97 @@
+"""
+Benchmark comparing the lockstep VectorEnvironment with looping over Board
+objects. Every game is given a uniformly random move at each step, so some
+moves are invalid, just as an untrained agent's would be. Reports game-steps
+per second for each approach.
+Run from the project root with: PYTHONPATH=src python benchmarks/benchmark_vector_environment.py
+Author: Emily Boegheim
+"""
+
+import random
+import time
+
+from board import Board, BoardException
+import vector_environment
+from vector_environment import VectorEnvironment
+
+
+def step_boards(games: int, size: int, move_batches: list) -> float:
+    """
+    Play the moves on one Board per game, resetting finished games.
+    :param games: the number of games.
+    :param size: the size of each game board on each side.
+    :param move_batches: a list with one move per game for each step.
+    :returns: the elapsed time in seconds.
+    """
+    boards = [Board(size) for _ in range(0, games)]
+    players = [1] * games
+    start = time.perf_counter()
+    for moves in move_batches:
+        for game in range(0, games):
+            board = boards[game]
+            try:
+                board.add_player_move(players[game], moves[game])
+            except BoardException:
+                continue
+            if board.find_winner() or board.is_board_full():
+                board.reset()
+                players[game] = 1
+            else:
+                players[game] = 3 - players[game]
+    return time.perf_counter() - start
+
+
+def step_environment(games: int, size: int, move_batches: list,
+                     use_numpy: bool) -> float:
+    """
+    Play the moves in a VectorEnvironment.
+    :param games: the number of games.
+    :param size: the size of each game board on each side.
+    :param move_batches: a list with one move per game for each step.
+    :param use_numpy: whether the environment uses NumPy.
+    :returns: the elapsed time in seconds.
+    """
+    environment = VectorEnvironment(games, size, use_numpy)
+    if use_numpy:
+        move_batches = [vector_environment.numpy.array(moves)
+                        for moves in move_batches]
+    start = time.perf_counter()
+    for moves in move_batches:
+        environment.step(moves)
+    return time.perf_counter() - start
+
+
+def main(steps: int = 100, sizes: tuple[int, ...] = (3, 7),
+         game_counts: tuple[int, ...] = (100, 1000, 10000),
+         seed: int = 0) -> None:
+    """
+    Run the benchmark and print the results.
+    :param steps: the number of steps to take.
+    :param sizes: the board sizes to benchmark.
+    :param game_counts: the numbers of games to play at once.
+    :param seed: the seed for the random moves.
+    """
+    generator = random.Random(seed)
+    variants = ["Board loop", "vector (Python)"]
+    if vector_environment.numpy is not None:
+        variants.append("vector (NumPy)")
+    print(f"{'size':>4} {'games':>6} " +
+          " ".join(f"{variant:>16}" for variant in variants) +
+          "  (game-steps/s)")
+    for size in sizes:
+        for games in game_counts:
+            move_batches = [[generator.randrange(0, size * size)
+                             for _ in range(0, games)]
+                            for _ in range(0, steps)]
+            times = [step_boards(games, size, move_batches),
+                     step_environment(games, size, move_batches, False)]
+            if vector_environment.numpy is not None:
+                times.append(step_environment(games, size, move_batches,
+                                              True))
+            print(f"{size:>4} {games:>6} " +
+                  " ".join(f"{games * steps / elapsed:>16.0f}"
+                           for elapsed in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,11 @@ setup(
         # For this project, there are no dependencies, but typically it would look like this:
         # 'numpy', 'pandas', etc.
     ],
+    # Optional dependencies. NumPy speeds up batch_evaluation, which falls back
+    # to plain Python when it is not installed.
+    extras_require={
+        'numpy': ['numpy'],
+    },
 
     # Metadata for your project
     author="Your Name",
@@ -0,0 +1,299 @@
+"""
+An alpha-beta search player for two-player Tic-Tac-Toe. It uses negamax with
+alpha-beta pruning, move ordering, and a fixed-size transposition table keyed
+by the board's Zobrist hash.
+Author: Emily Boegheim
+"""
+
+import time
+from functools import lru_cache
+
+from board import Board
+from strategies import PlayerStrategy
+from zobrist import get_player_to_move_keys
+
+# Transposition table entry flags, recording how a stored value relates to
+# the true value of the position.
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    """
+    A fixed-size hash table of search results. Each slot holds at most one
+    entry, so memory use does not grow however long the table is used.
+    When two positions map to the same slot, the entry searched to the
+    greater depth is kept, unless the stored entry is from an earlier search,
+    in which case it is always replaced.
+    """
+
+    def __init__(self, size_bits: int = 20) -> None:
+        """
+        Initialise an empty table.
+        :param size_bits: the table has 2 ** size_bits slots.
+        """
+        self._mask = (1 << size_bits) - 1
+        self._entries = [None] * (1 << size_bits)
+        self._generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self) -> None:
+        """
+        Mark the start of a new search, so that entries from earlier searches
+        can be replaced by new ones.
+        """
+        self._generation += 1
+
+    def probe(self, key: int) -> tuple | None:
+        """
+        Look up a position in the table.
+        :param key: the position's hash.
+        :returns: a tuple (depth, value, flag, best_move) if the position is
+            in the table, or None if not.
+        """
+        self.probes += 1
+        entry = self._entries[key & self._mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int,
+              best_move: int) -> None:
+        """
+        Store a search result, following the table's replacement policy.
+        :param key: the position's hash.
+        :param depth: the depth the position was searched to.
+        :param value: the value found by the search.
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND.
+        :param best_move: the best move found, or -1 if none.
+        """
+        index = key & self._mask
+        entry = self._entries[index]
+        if (entry is None or entry[0] == key or depth >= entry[1] or
+                entry[5] != self._generation):
+            self._entries[index] = (key, depth, value, flag, best_move,
+                                    self._generation)
+
+    def get_hit_rate(self) -> float:
+        """
+        Calculate the proportion of probes that found their position.
+        :returns: the hit rate between 0 and 1, or 0 if there were no probes.
+        """
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes
+
+
+@lru_cache(maxsize=None)
+def get_static_move_order(size: int) -> tuple[int, ...]:
+    """
+    Order the moves on a board of the given size from most to least
+    promising: cells on more of the full-length lines first, then cells
+    nearer the centre.
+    :param size: the size of the game board on each side.
+    :returns: a tuple of all move numbers in order.
+    """
+    centre = (size - 1) / 2
+
+    def move_priority(move: int) -> tuple:
+        row, column = divmod(move, size)
+        lines_through_cell = (2 + (row == column) +
+                              (row + column == size - 1))
+        distance = (row - centre) ** 2 + (column - centre) ** 2
+        return -lines_through_cell, distance, move
+
+    return tuple(sorted(range(0, size * size), key=move_priority))
+
+
+@lru_cache(maxsize=None)
+def get_static_move_ranks(size: int) -> tuple[int, ...]:
+    """
+    Find each move's place in the static move order.
+    :param size: the size of the game board on each side.
+    :returns: a tuple indexed by move number, holding the move's index in
+        get_static_move_order.
+    """
+    ranks = [0] * (size * size)
+    for rank, move in enumerate(get_static_move_order(size)):
+        ranks[move] = rank
+    return tuple(ranks)
+
+
+class AlphaBetaStrategy(PlayerStrategy):
+    """
+    A computer player which searches the game tree with negamax and
+    alpha-beta pruning. It supports two-player games between players 1 and
+    2. Faster wins and slower losses are preferred, so the player finishes
+    games promptly.
+    """
+
+    def __init__(self, seed: int | None = None, max_depth: int | None = None,
+                 table_size_bits: int = 20) -> None:
+        """
+        Initialise the strategy.
+        :param seed: unused, as the search is deterministic. Accepted so the
+            strategy can be created in the same way as RandomStrategy.
+        :param max_depth: the maximum number of moves to search ahead.
+            Positions at this depth are scored as draws. Defaults to searching
+            to the end of the game.
+        :param table_size_bits: the transposition table has
+            2 ** table_size_bits slots.
+        """
+        self.max_depth = max_depth
+        self.table = TranspositionTable(table_size_bits)
+        self.nodes_searched = 0
+        self.search_seconds = 0.0
+        self._player_keys = get_player_to_move_keys()
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Search for the best move for the given player.
+        :param board: the current game board, which must not already be won
+            or full.
+        :param player: the player whose move it is (1 or 2).
+        :returns: the best move found.
+        """
+        start = time.perf_counter()
+        self.table.new_search()
+        moves = self._get_ordered_moves(board, -1)
+        depth = len(moves)
+        if self.max_depth is not None:
+            depth = min(depth, self.max_depth)
+        alpha = -len(moves) - 1
+        beta = len(moves) + 1
+        best_move = moves[0]
+        for move in moves:
+            value = self._evaluate_move(board, player, move, depth, alpha,
+                                        beta)
+            if value > alpha:
+                alpha = value
+                best_move = move
+        self.search_seconds += time.perf_counter() - start
+        return best_move
+
+    def evaluate_position(self, board: Board, player: int) -> int:
+        """
+        Find the value of a position for the player whose turn it is.
+        :param board: the game board, which must not already be won or full.
+        :param player: the player whose move it is (1 or 2).
+        :returns: a positive value if the player can force a win (larger for
+            faster wins), 0 for a draw and a negative value for a loss.
+        """
+        start = time.perf_counter()
+        self.table.new_search()
+        empty_cells = board.size * board.size - board.get_filled_cell_count()
+        depth = empty_cells
+        if self.max_depth is not None:
+            depth = min(depth, self.max_depth)
+        value = self._negamax(board, player, depth, -empty_cells - 1,
+                              empty_cells + 1)
+        self.search_seconds += time.perf_counter() - start
+        return value
+
+    def get_nodes_per_second(self) -> float:
+        """
+        Calculate the search speed over all searches so far.
+        :returns: the number of nodes searched per second, or 0 if no time
+            has been recorded.
+        """
+        if self.search_seconds <= 0:
+            return 0.0
+        return self.nodes_searched / self.search_seconds
+
+    def _evaluate_move(self, board: Board, player: int, move: int, depth: int,
+                       alpha: int, beta: int) -> int:
+        """
+        Find the value of making a move, from the mover's point of view. The
+        move is made on the board and undone again afterwards.
+        :param board: the game board before the move.
+        :param player: the player making the move.
+        :param move: the move to make.
+        :param depth: the remaining search depth, including this move.
+        :param alpha: the lowest value the mover is still interested in.
+        :param beta: the highest value the mover is still interested in.
+        :returns: the value of the move.
+        """
+        board.add_player_move(player, move)
+        if board.find_winner():
+            # Score wins by the number of cells left, so faster wins score
+            # higher. This only depends on the position, so it is safe to
+            # store in the transposition table.
+            value = (1 + board.size * board.size -
+                     board.get_filled_cell_count())
+        elif board.is_board_full() or depth <= 1:
+            value = 0
+        else:
+            value = -self._negamax(board, 3 - player, depth - 1, -beta,
+                                   -alpha)
+        board.undo_move()
+        return value
+
+    def _negamax(self, board: Board, player: int, depth: int, alpha: int,
+                 beta: int) -> int:
+        """
+        Search a non-terminal position with alpha-beta pruning.
+        :param board: the game board.
+        :param player: the player whose move it is.
+        :param depth: the number of moves left to search.
+        :param alpha: the lowest value the player is still interested in.
+        :param beta: the highest value the player is still interested in.
+        :returns: the value of the position for the player to move.
+        """
+        self.nodes_searched += 1
+        key = board.get_zobrist_hash() ^ self._player_keys[player]
+        original_alpha = alpha
+        table_move = -1
+        entry = self.table.probe(key)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, table_move = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_value
+                if entry_flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value
+
+        best_value = None
+        best_move = -1
+        for move in self._get_ordered_moves(board, table_move):
+            value = self._evaluate_move(board, player, move, depth, alpha,
+                                        beta)
+            if best_value is None or value > best_value:
+                best_value = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(key, depth, best_value, flag, best_move)
+        return best_value
+
+    def _get_ordered_moves(self, board: Board, first_move: int) -> list[int]:
+        """
+        List the empty cells in the order they should be searched.
+        :param board: the game board.
+        :param first_move: a move to search first (usually the best move from
+            the transposition table), or -1 for none.
+        :returns: the empty cells as move numbers.
+        """
+        # Sorting the board's empty-cell index takes time proportional to
+        # the number of empty cells, rather than scanning the whole board.
+        moves = board.get_empty_moves()
+        moves.sort(key=get_static_move_ranks(board.size).__getitem__)
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+        return moves
@@ -0,0 +1,126 @@
+"""
+Evaluates many Tic-Tac-Toe positions at once. The positions are passed in as
+a single array of shape (N, size, size) and checked for winners and full
+boards in one pass, using NumPy if it is installed and plain Python if not.
+The results match Board.find_winner and Board.is_board_full for boards using
+the default (full-line) win rules.
+Author: Emily Boegheim
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def evaluate_boards(boards, use_numpy: bool | None = None) -> tuple:
+    """
+    Find the winner of each board and whether it is full or tied.
+    :param boards: the board states, as an array (or nested sequence) of
+        shape (N, size, size) containing player numbers, with 0 representing
+        an empty cell.
+    :param use_numpy: whether to use NumPy. Defaults to using NumPy if it is
+        installed.
+    :returns: a tuple (winners, full, tied). With NumPy these are arrays of
+        length N; otherwise they are lists. winners holds the winning player
+        for each board, or 0 if there is no winner; full is True where the
+        board has no empty cells; tied is True where the board is full with
+        no winner.
+    :except ImportError: indicates that use_numpy is True but NumPy is not
+        installed.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("NumPy is required when use_numpy is True")
+        return _evaluate_boards_numpy(boards)
+    return _evaluate_boards_python(boards)
+
+
+def _evaluate_boards_numpy(boards) -> tuple:
+    """
+    Evaluate the boards using vectorised NumPy operations.
+    :param boards: the board states, as an array-like of shape
+        (N, size, size).
+    :returns: a tuple of arrays (winners, full, tied).
+    """
+    boards = numpy.ascontiguousarray(boards)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError("boards must have shape (N, size, size)")
+    if boards.shape[0] == 0 or boards.shape[1] == 0:
+        empty_result = numpy.zeros(boards.shape[0], dtype=bool)
+        return (numpy.zeros(boards.shape[0], dtype=boards.dtype),
+                empty_result, empty_result.copy())
+
+    diagonal_indices = numpy.arange(boards.shape[1])
+    southeast = boards[:, diagonal_indices, diagonal_indices]
+    southwest = boards[:, diagonal_indices, diagonal_indices[::-1]]
+    # Build the owner of every line, in the same order that Board checks
+    # them: rows, columns, then the two diagonals. Lines that are not
+    # complete for a single player have an owner of 0.
+    line_owners = numpy.concatenate([
+        _line_owners(boards, axis=2),
+        _line_owners(boards, axis=1),
+        _line_owners(southeast[:, numpy.newaxis, :], axis=2),
+        _line_owners(southwest[:, numpy.newaxis, :], axis=2),
+    ], axis=1)
+    first_winning_line = numpy.argmax(line_owners != 0, axis=1)
+    winners = numpy.take_along_axis(line_owners,
+                                    first_winning_line[:, numpy.newaxis],
+                                    axis=1)[:, 0]
+    full = numpy.all(boards != 0, axis=(1, 2))
+    tied = full & (winners == 0)
+    return winners, full, tied
+
+
+def _line_owners(lines, axis: int):
+    """
+    Find the owner of each line in a stack of lines.
+    :param lines: an array of shape (N, ..., ...) containing the lines.
+    :param axis: the axis running along each line.
+    :returns: an array of shape (N, number of lines) holding the player who
+        fills each line, or 0 if the line is not filled by a single player.
+    """
+    first_cells = numpy.take(lines, [0], axis=axis)
+    complete = numpy.all(lines == first_cells, axis=axis)
+    return numpy.where(complete, numpy.squeeze(first_cells, axis=axis), 0)
+
+
+def _evaluate_boards_python(boards) -> tuple:
+    """
+    Evaluate the boards one at a time in plain Python.
+    :param boards: the board states, as a nested sequence of shape
+        (N, size, size).
+    :returns: a tuple of lists (winners, full, tied).
+    """
+    winners = []
+    full = []
+    tied = []
+    for board_data in boards:
+        winner = _find_winner_python(board_data)
+        is_full = all(0 not in row for row in board_data)
+        winners.append(winner)
+        full.append(is_full)
+        tied.append(is_full and winner == 0)
+    return winners, full, tied
+
+
+def _find_winner_python(board_data) -> int:
+    """
+    Find the winner of a single board, checking lines in the same order as
+    Board.
+    :param board_data: a 2D sequence of player numbers.
+    :returns: the winning player, or 0 if there is no winner.
+    """
+    size = len(board_data)
+    lines = [list(row) for row in board_data]
+    lines += [[board_data[row][column] for row in range(0, size)]
+              for column in range(0, size)]
+    lines.append([board_data[index][index] for index in range(0, size)])
+    lines.append([board_data[index][size - 1 - index]
+                  for index in range(0, size)])
+    for line in lines:
+        if line[0] != 0 and line.count(line[0]) == size:
+            return line[0]
+    return 0
@@ -0,0 +1,204 @@
+"""
+Provides a bitboard implementation of the Tic-Tac-Toe game board. Each
+player's pieces are stored as a single integer bitmask, so win and fullness
+checks become a handful of bitwise operations.
+Author: Emily Boegheim
+"""
+
+from functools import lru_cache
+
+from board import DEFAULT_NUMBER_OF_PLAYERS
+from board import MoveOutOfBoundsException, PositionAlreadyFilledException
+
+
+@lru_cache(maxsize=None)
+def get_win_masks(size: int) -> tuple[int, ...]:
+    """
+    Calculate the bitmasks for every winning line on a board of the given
+    size. The masks are calculated once per board size and cached.
+    :param size: The size of the game board on each side.
+    :returns: a tuple of bitmasks, ordered rows first, then columns, then the
+        northwest-southeast diagonal and finally the northeast-southwest
+        diagonal (the same order in which Board.find_winner checks them).
+    """
+    row_mask = (1 << size) - 1
+    rows = [row_mask << (row * size) for row in range(0, size)]
+
+    column_mask = 0
+    for row in range(0, size):
+        column_mask |= 1 << (row * size)
+    columns = [column_mask << column for column in range(0, size)]
+
+    southeast_diagonal = 0
+    southwest_diagonal = 0
+    for row in range(0, size):
+        southeast_diagonal |= 1 << (row * size + row)
+        southwest_diagonal |= 1 << (row * size + size - 1 - row)
+
+    return tuple(rows + columns + [southeast_diagonal, southwest_diagonal])
+
+
+@lru_cache(maxsize=None)
+def get_cell_win_masks(size: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """
+    List the winning lines through each cell of a board of the given size.
+    :param size: The size of the game board on each side.
+    :returns: a tuple indexed by move number, each entry a tuple of
+        (line number, bitmask) pairs, numbered as in get_win_masks.
+    """
+    win_masks = get_win_masks(size)
+    return tuple(tuple((line, win_mask)
+                       for line, win_mask in enumerate(win_masks)
+                       if win_mask >> move & 1)
+                 for move in range(0, size * size))
+
+
+class BitBoard:
+    """
+    A Tic-Tac-Toe game board storing one bitmask per player. This provides
+    the same public interface as Board, so it can be used in its place.
+    """
+
+    def __init__(self, size: int = 3,
+                 number_of_players: int = DEFAULT_NUMBER_OF_PLAYERS) -> None:
+        """
+        Initialise the game board with the given size (defaults to 3).
+        :param size: The size of the game board on each side (the board is
+            always square)
+        :param number_of_players: The highest player number that can move on
+            the board. Players are numbered from 1.
+        """
+        self.size = size
+        self.number_of_players = number_of_players
+        self.empty = 0
+        self._minimum_move = 0
+        self._maximum_move = self.size*self.size - 1
+        self._full_mask = (1 << (self.size*self.size)) - 1
+        self._cell_win_masks = get_cell_win_masks(size)
+        self._occupied = 0
+        # One bitmask per player, indexed by player number. Entry 0 is unused.
+        self._player_masks = [0] * (number_of_players + 1)
+        # The winner, and the number of the line they completed. Only the
+        # earliest-numbered completed line counts, as in Board.find_winner.
+        self._winner = 0
+        self._winning_line = len(get_win_masks(size))
+
+    def get_board_data(self) -> list[list]:
+        """
+        Build a 2D data structure representing the board state. Unlike
+        Board.get_board_data, this is a new copy of the data, so changing it
+        does not change the board.
+        :returns: a list of rows, each a list of player numbers.
+        """
+        board_data = [[self.empty] * self.size for _ in range(0, self.size)]
+        for player, mask in enumerate(self._player_masks):
+            if not mask:
+                continue
+            for move in range(0, self.size*self.size):
+                if mask >> move & 1:
+                    board_data[move // self.size][move % self.size] = player
+        return board_data
+
+    def add_player_move(self, player: int, move: int) -> bool:
+        """
+        Add the given player's chosen move to the board.
+        :param player: the player making their move, represented as an integer.
+        :param move: the player's chosen move, represented as an integer
+            between 0 and the number of cells on the board minus 1.
+        :returns: True if the move was successful.
+        :except MoveOutOfBoundsException: indicates that the player's move is
+            outside the bounds of the game board.
+        :except PositionAlreadyFilledException: indicates that the player's
+            move is invalid as the space is already filled.
+        """
+        if move < self._minimum_move or move > self._maximum_move:
+            raise MoveOutOfBoundsException
+        return self._add_move_bit(player, move)
+
+    def add_move_by_coordinates(self, player: int, row: int,
+                                column: int) -> bool:
+        """
+        Add the given player's chosen move to the board, using coordinates
+        to identify the move on the board.
+        :param player: the player making their move, represented as an integer.
+        :param row: the row number of the player's chosen move.
+        :param column: the column number of the player's chosen move.
+        :returns: True if the move was successful.
+        :except MoveOutOfBoundsException: indicates that the player's move is
+            outside the bounds of the game board.
+        :except PositionAlreadyFilledException: indicates that the player's
+            move is invalid as the space is already filled.
+        """
+        if row < 0 or column < 0:
+            raise MoveOutOfBoundsException
+        if row >= self.size or column >= self.size:
+            raise MoveOutOfBoundsException
+        return self._add_move_bit(player, row * self.size + column)
+
+    def _add_move_bit(self, player: int, move: int) -> bool:
+        """
+        Set the move's bit in the player's bitmask, and check whether it
+        completes a line. Only the lines through the move are checked, and
+        only against the moving player's bitmask, so this does not depend on
+        the number of players.
+        :param player: the player making their move, represented as an integer.
+        :param move: the move number of the chosen cell.
+        :returns: True if the move was successful.
+        :except PositionAlreadyFilledException: indicates that the player's
+            move is invalid as the space is already filled.
+        :except ValueError: indicates that the player is not between 1 and
+            number_of_players.
+        """
+        if player < 1 or player > self.number_of_players:
+            raise ValueError("player must be between 1 and number_of_players")
+        bit = 1 << move
+        if self._occupied & bit:
+            raise PositionAlreadyFilledException
+        self._occupied |= bit
+        player_mask = self._player_masks[player] | bit
+        self._player_masks[player] = player_mask
+        for line, win_mask in self._cell_win_masks[move]:
+            if (player_mask & win_mask == win_mask and
+                    line < self._winning_line):
+                self._winning_line = line
+                self._winner = player
+        return True
+
+    def get_player_bitset(self, player: int) -> int:
+        """
+        Return the cells occupied by one player as a bitset.
+        :param player: the player, between 1 and number_of_players.
+        :returns: an integer with bit n set if the player has a piece at
+            move n.
+        """
+        return self._player_masks[player]
+
+    def find_winner(self) -> int:
+        """
+        Check for all possible win conditions. Lines are checked as each move
+        is added, so this takes constant time.
+        :returns: the number of the winning player as an integer, or 0 if there
+            is no winner.
+        """
+        return self._winner
+
+    def is_board_full(self) -> bool:
+        """
+        Check whether the board is full (so that no more moves can be made).
+        :returns: True if the board is full, False if not.
+        """
+        return self._occupied == self._full_mask
+
+    def get_maximum_move(self) -> int:
+        """
+        Returns the highest move allowable on this board.
+        :returns: The maximum move allowable on the board.
+        """
+        return self._maximum_move
+
+    def get_minimum_move(self) -> int:
+        """
+        Return the lowest-numbered move allowable on this board.
+        :returns: the minimum move allowable on this board.
+        """
+        return self._minimum_move
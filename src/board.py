@@ -4,8 +4,17 @@ Author: Emily Boegheim
 """
 
 import math
+import random
 
+from symmetry import get_canonical_form, get_canonical_hash
 from utilities import all_items_in_collection_equal
+from zobrist import MAXIMUM_PLAYER, get_zobrist_keys
+
+# The number of players a Board makes room for unless told otherwise.
+DEFAULT_NUMBER_OF_PLAYERS = MAXIMUM_PLAYER
+# The highest number of players a Board supports, as each cell is stored in a
+# single byte.
+MAXIMUM_NUMBER_OF_PLAYERS = 255
 
 
 class BoardException(Exception):
@@ -29,22 +38,76 @@ class PositionAlreadyFilledException(BoardException):
     pass
 
 
+class NoMoveToUndoException(BoardException):
+    """
+    An exception indicating that a move cannot be undone as no moves have
+    been made.
+    """
+    pass
+
+
 class Board:
     """A Tic-Tac-Toe game board and its current state"""
 
-    def __init__(self, size: int = 3) -> None:
+    # Using slots rather than a __dict__ keeps each board small, as many
+    # boards may be kept in memory at once.
+    __slots__ = ("size", "win_length", "number_of_players", "empty",
+                 "_minimum_move", "_maximum_move", "_board", "_cells",
+                 "_zobrist_keys", "_player_slots", "_player_bitsets",
+                 "_filled_cells",
+                 "_line_player_counts", "_move_stack", "_empty_moves",
+                 "_empty_move_positions", "_completed_lines", "_winner",
+                 "_zobrist_hash")
+
+    def __init__(self, size: int = 3, win_length: int | None = None,
+                 number_of_players: int = DEFAULT_NUMBER_OF_PLAYERS) -> None:
         """
         Initialise the Tic-Tac-Toe game board with the given size (defaults to
         3).
         :param size: The size of the game board on each side (the board is
             always square)
+        :param win_length: The number of pieces in a row (horizontally,
+            vertically or on any diagonal) needed to win. Defaults to the size
+            of the board, in which case a player must fill a whole row,
+            column or one of the two longest diagonals.
+        :param number_of_players: The highest player number that can move on
+            the board, up to MAXIMUM_NUMBER_OF_PLAYERS. Players are numbered
+            from 1. The per-line counters and bitsets only grow past two
+            players when a higher-numbered player moves.
+        :except ValueError: indicates that win_length is less than 1 or
+            greater than the size of the board, or that number_of_players is
+            less than 1 or greater than MAXIMUM_NUMBER_OF_PLAYERS.
         """
+        if win_length is None:
+            win_length = size
+        if win_length < 1 or win_length > size:
+            raise ValueError("win_length must be between 1 and the board size")
+        if number_of_players < 1 or (number_of_players >
+                                     MAXIMUM_NUMBER_OF_PLAYERS):
+            raise ValueError(f"number_of_players must be between 1 and "
+                             f"{MAXIMUM_NUMBER_OF_PLAYERS}")
         self.size = size
+        self.win_length = win_length
+        self.number_of_players = number_of_players
         self.empty = 0
         self._minimum_move = 0
         self._maximum_move = self.size*self.size - 1
         self._board = []
         self.construct_board(size)
+        # A flat copy of the cells in move-number order, one byte per cell,
+        # kept in step with _board so that it can be shared without copying
+        # through get_cell_buffer.
+        self._cells = bytearray(size * size)
+        # The Zobrist keys take a 64-bit integer per cell and player, so they
+        # are only looked up once get_zobrist_hash is first called. Until
+        # then the hash is not kept up to date.
+        self._zobrist_keys = None
+        # The number of entries per line in the per-player line counts: one
+        # for each player, plus an unused one for the empty value. Room is
+        # only made for two players at first, as most games have two, and
+        # grows when a higher-numbered player first moves.
+        self._player_slots = min(number_of_players, 2) + 1
+        self._reset_derived_state()
 
     def construct_board(self, size: int) -> None:
         """
@@ -57,6 +120,57 @@ class Board:
             row = [self.empty] * size
             self._board.append(row)
 
+    def _reset_derived_state(self) -> None:
+        """
+        Set up the occupancy counters and hash for an empty board. These are
+        updated as each move is added, so that the winner, whether the board
+        is full and the position's hash are known without scanning.
+        """
+        # For full-line wins, each line (row, column or diagonal) counts the
+        # pieces each player has in it. Lines are numbered in the order in
+        # which the scanning methods check them: rows, columns, then the
+        # northwest-southeast and northeast-southwest diagonals.
+        self._filled_cells = 0
+        # The counts are stored in one flat list, at index
+        # line * _player_slots + player.
+        self._line_player_counts = [0] * ((2 * self.size + 2) *
+                                          self._player_slots)
+        # Each player's occupied cells as a bitset, indexed by player, with
+        # bit n set if the player has a piece at move n.
+        self._player_bitsets = [0] * self._player_slots
+        # The moves made so far, so that they can be undone.
+        self._move_stack = []
+        # An index of the empty cells. _empty_moves holds the empty cells in
+        # no particular order, and _empty_move_positions holds each cell's
+        # index in _empty_moves. A filled cell is removed by moving the last
+        # entry into its place, and keeps its old position so that undoing
+        # the move can put it back exactly.
+        # Both lists start out holding the same int objects, which halves
+        # their memory use on large boards.
+        self._empty_moves = list(range(self._minimum_move,
+                                       self._maximum_move + 1))
+        self._empty_move_positions = list(self._empty_moves)
+        # Completed lines as (priority, player) pairs. For full-line wins the
+        # priority is the line number, so that find_winner reports the same
+        # winner as the scanning methods would. For shorter win lengths it is
+        # the number of filled cells when the line was completed.
+        self._completed_lines = []
+        self._winner = 0
+        self._zobrist_hash = 0
+
+    def reset(self) -> None:
+        """
+        Clear the board so that a new game can be played, reusing the existing
+        data structures.
+        """
+        for row in self._board:
+            for column in range(0, self.size):
+                row[column] = self.empty
+        # Assign in place, as the buffer may be shared through
+        # get_cell_buffer.
+        self._cells[:] = bytes(len(self._cells))
+        self._reset_derived_state()
+
     def get_board_data(self) -> list[list]:
         """
         Return the 2D data structure representing the board state.
@@ -99,35 +213,329 @@ class Board:
             outside the bounds of the game board.
         :except PositionAlreadyFilledException: indicates that the player's
             move is invalid as the space is already filled.
+        :except ValueError: indicates that the player is not between 1 and
+            number_of_players.
         """
+        if player < 1 or player > self.number_of_players:
+            raise ValueError("player must be between 1 and number_of_players")
         if row < 0 or column < 0:
             raise MoveOutOfBoundsException
         if row >= self.size or column >= self.size:
             raise MoveOutOfBoundsException
         if self._board[row][column] != self.empty:
             raise PositionAlreadyFilledException
+        if player >= self._player_slots:
+            self._add_player_slots(player)
 
         self._board[row][column] = player
+        move = row * self.size + column
+        self._cells[move] = player
+        self._player_bitsets[player] |= 1 << move
+        self._move_stack.append(move)
+        if self._zobrist_keys is not None:
+            self._zobrist_hash ^= self._zobrist_keys[move][player]
+        empty_moves = self._empty_moves
+        position = self._empty_move_positions[move]
+        last_move = empty_moves.pop()
+        if last_move != move:
+            empty_moves[position] = last_move
+            self._empty_move_positions[last_move] = position
+        self._update_counters(player, row, column)
         return True
 
+    def undo_move(self) -> int:
+        """
+        Undo the most recent move, restoring the board and all its derived
+        state (counters, winner and hash) to how they were before it. This
+        takes constant time for full-line wins, so search code can make and
+        undo moves on a single board rather than copying it.
+        :returns: the move that was undone.
+        :except NoMoveToUndoException: indicates that no moves have been made.
+        """
+        if not self._move_stack:
+            raise NoMoveToUndoException
+        move = self._move_stack.pop()
+        row = move // self.size
+        column = move % self.size
+        player = self._board[row][column]
+        self._board[row][column] = self.empty
+        self._cells[move] = self.empty
+        self._player_bitsets[player] ^= 1 << move
+        if self._zobrist_keys is not None:
+            self._zobrist_hash ^= self._zobrist_keys[move][player]
+        empty_moves = self._empty_moves
+        position = self._empty_move_positions[move]
+        if position == len(empty_moves):
+            empty_moves.append(move)
+        else:
+            moved_move = empty_moves[position]
+            self._empty_move_positions[moved_move] = len(empty_moves)
+            empty_moves.append(moved_move)
+            empty_moves[position] = move
+
+        completed_lines = self._completed_lines
+        if self.win_length < self.size:
+            if (completed_lines and
+                    completed_lines[-1][0] == self._filled_cells):
+                completed_lines.pop()
+        else:
+            counts = self._line_player_counts
+            player_slots = self._player_slots
+            for line in self._get_lines_through_cell(row, column):
+                index = line * player_slots + player
+                if counts[index] == self.size:
+                    completed_lines.remove((line, player))
+                counts[index] -= 1
+        self._filled_cells -= 1
+        self._winner = min(completed_lines)[1] if completed_lines else 0
+        return move
+
+    def copy(self) -> "Board":
+        """
+        Make an independent copy of the board and its state.
+        :returns: a new Board in the same state as this one.
+        """
+        board_copy = Board.__new__(Board)
+        for name in Board.__slots__:
+            setattr(board_copy, name, getattr(self, name))
+        board_copy._board = [list(row) for row in self._board]
+        board_copy._cells = bytearray(self._cells)
+        board_copy._line_player_counts = list(self._line_player_counts)
+        board_copy._player_bitsets = list(self._player_bitsets)
+        board_copy._move_stack = list(self._move_stack)
+        board_copy._empty_moves = list(self._empty_moves)
+        board_copy._empty_move_positions = list(self._empty_move_positions)
+        board_copy._completed_lines = list(self._completed_lines)
+        return board_copy
+
+    def get_filled_cell_count(self) -> int:
+        """
+        Return the number of cells that have been filled.
+        :returns: the number of moves made on the board.
+        """
+        return self._filled_cells
+
+    def get_moves_since(self, move_count: int) -> list[int]:
+        """
+        List the moves made after the first move_count moves, in the order
+        they were made. This takes time proportional to the number of moves
+        listed, not the board area.
+        :param move_count: the number of earlier moves to leave out.
+        :returns: the later moves.
+        """
+        return self._move_stack[move_count:]
+
+    def get_empty_move_count(self) -> int:
+        """
+        Return the number of empty cells.
+        :returns: the number of moves still available.
+        """
+        return len(self._empty_moves)
+
+    def snapshot(self) -> "BoardSnapshot":
+        """
+        Take an immutable, hashable snapshot of the current position.
+        :returns: a BoardSnapshot of the board's cells.
+        """
+        return BoardSnapshot(self.size, bytes(self._cells))
+
+    def get_empty_moves(self) -> list[int]:
+        """
+        List the empty cells in move-number order, from get_minimum_move to
+        get_maximum_move. This sorts the empty-cell index, so it takes time
+        proportional to the number of empty cells rather than the board area.
+        :returns: the available moves in ascending order.
+        """
+        return sorted(self._empty_moves)
+
+    def get_random_empty_move(self, generator: random.Random) -> int:
+        """
+        Choose an empty cell uniformly at random in constant time.
+        :param generator: the random number generator to use.
+        :returns: a random available move.
+        :except IndexError: indicates that the board is full.
+        """
+        empty_moves = self._empty_moves
+        return empty_moves[int(generator.random() * len(empty_moves))]
+
+    def get_cells(self) -> tuple[int, ...]:
+        """
+        Return the board's cells as a flat tuple, in move-number order.
+        :returns: a tuple of player numbers, one per cell.
+        """
+        return tuple(self._cells)
+
+    def get_cell_buffer(self) -> memoryview:
+        """
+        Return a read-only view of the board's cells which shares the
+        board's memory, so no copy is made. The view always reflects the
+        current position, and supports the buffer protocol, so it can be
+        passed to numpy.frombuffer, written to a file or compared with bytes.
+        :returns: a one-dimensional view of unsigned bytes, one per cell in
+            move-number order. Use cast("B", (size, size)) for a 2D view.
+        """
+        return memoryview(self._cells).toreadonly()
+
+    def get_canonical_form(self) -> tuple[tuple, int]:
+        """
+        Find the canonical form of the current position, which is the same for
+        all eight rotations and reflections of the position.
+        :returns: a tuple (canonical_cells, symmetry), where symmetry
+            identifies the transformation applied (see the symmetry module).
+        """
+        return get_canonical_form(self.get_cells(), self.size)
+
+    def get_canonical_hash(self) -> int:
+        """
+        Calculate a stable hash of the position which is the same for all its
+        rotations and reflections.
+        :returns: the hash as a non-negative integer.
+        """
+        return get_canonical_hash(self.get_cells(), self.size)
+
+    def get_player_bitset(self, player: int) -> int:
+        """
+        Return the cells occupied by one player as a bitset.
+        :param player: the player, between 1 and number_of_players.
+        :returns: an integer with bit n set if the player has a piece at
+            move n.
+        """
+        if player >= self._player_slots:
+            # The player has not moved yet, so has no room in the bitsets.
+            return 0
+        return self._player_bitsets[player]
+
+    def _add_player_slots(self, player: int) -> None:
+        """
+        Make room in the per-player line counts and bitsets for players up
+        to the given one, keeping the existing counts.
+        :param player: the highest player number to make room for.
+        """
+        old_slots = self._player_slots
+        new_slots = player + 1
+        old_counts = self._line_player_counts
+        counts = [0] * (len(old_counts) // old_slots * new_slots)
+        for line in range(0, len(old_counts) // old_slots):
+            counts[line * new_slots:line * new_slots + old_slots] = (
+                old_counts[line * old_slots:(line + 1) * old_slots])
+        self._line_player_counts = counts
+        self._player_bitsets.extend([0] * (new_slots - old_slots))
+        self._player_slots = new_slots
+
+    def get_zobrist_hash(self) -> int:
+        """
+        Return the Zobrist hash of the current position. The first call
+        looks up the keys and hashes the filled cells. After that the hash is
+        updated as each move is added, so this takes constant time.
+        :returns: a 64-bit hash of the filled cells.
+        """
+        if self._zobrist_keys is None:
+            self._zobrist_keys = get_zobrist_keys(len(self._cells),
+                                                  self.number_of_players)
+            zobrist_hash = 0
+            for move in self._move_stack:
+                zobrist_hash ^= self._zobrist_keys[move][self._cells[move]]
+            self._zobrist_hash = zobrist_hash
+        return self._zobrist_hash
+
+    def _update_counters(self, player: int, row: int, column: int) -> None:
+        """
+        Update the occupancy counters for every line passing through the
+        given cell, and record any line the move completes. Only the moving
+        player's counters are touched, so this does not depend on the number
+        of players.
+        :param player: the player who made the move.
+        :param row: the row number of the move.
+        :param column: the column number of the move.
+        """
+        self._filled_cells += 1
+        if self.win_length < self.size:
+            self._check_runs_through_cell(player, row, column)
+            return
+        size = self.size
+        counts = self._line_player_counts
+        player_slots = self._player_slots
+        for line in self._get_lines_through_cell(row, column):
+            index = line * player_slots + player
+            counts[index] += 1
+            if counts[index] == size:
+                self._completed_lines.append((line, player))
+                self._winner = min(self._completed_lines)[1]
+
+    def _get_lines_through_cell(self, row: int, column: int) -> tuple:
+        """
+        List the full-length lines passing through a cell.
+        :param row: the row number of the cell.
+        :param column: the column number of the cell.
+        :returns: a tuple of line numbers (see _reset_derived_state).
+        """
+        size = self.size
+        if row == column:
+            if row + column == size - 1:
+                return row, size + column, 2 * size, 2 * size + 1
+            return row, size + column, 2 * size
+        if row + column == size - 1:
+            return row, size + column, 2 * size + 1
+        return row, size + column
+
+    def _check_runs_through_cell(self, player: int, row: int,
+                                 column: int) -> None:
+        """
+        Check whether the move at the given cell completes a run of
+        win_length pieces in any direction. Only cells within win_length of
+        the move are examined, so the cost does not depend on the board size.
+        :param player: the player who made the move.
+        :param row: the row number of the move.
+        :param column: the column number of the move.
+        """
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            run_length = (1 +
+                          self._count_run(player, row, column,
+                                          row_step, column_step) +
+                          self._count_run(player, row, column,
+                                          -row_step, -column_step))
+            if run_length >= self.win_length:
+                self._completed_lines.append((self._filled_cells, player))
+                self._winner = min(self._completed_lines)[1]
+                return
+
+    def _count_run(self, player: int, row: int, column: int, row_step: int,
+                   column_step: int) -> int:
+        """
+        Count the player's pieces in a line leading away from the given cell,
+        stopping at the first cell that is not the player's, or once a win
+        would already be guaranteed.
+        :param player: the player whose pieces to count.
+        :param row: the row number of the starting cell (not counted).
+        :param column: the column number of the starting cell (not counted).
+        :param row_step: the change in row number for each step.
+        :param column_step: the change in column number for each step.
+        :returns: the number of consecutive pieces found.
+        """
+        count = 0
+        row += row_step
+        column += column_step
+        while (count < self.win_length - 1 and 0 <= row < self.size and
+               0 <= column < self.size and self._board[row][column] == player):
+            count += 1
+            row += row_step
+            column += column_step
+        return count
+
     def find_winner(self) -> int:
         """
-        Check for all possible win conditions.
+        Check for all possible win conditions. This uses the counters updated
+        as each move is added, so it takes constant time.
         :returns: the number of the winning player as an integer, or 0 if there
             is no winner.
         """
-        winner = self.find_horizontal_winner()
-        if winner != 0:
-            return winner
-        winner = self.find_vertical_winner()
-        if winner != 0:
-            return winner
-        winner = self.find_diagonal_winner()
-        return winner
+        return self._winner
 
     def find_horizontal_winner(self) -> int:
         """
-        Check for win conditions on the horizontal/in the rows.
+        Check for win conditions on the horizontal/in the rows. Like the other
+        directional checks, this scans the whole board for full lines and
+        ignores win_length.
         :returns: the number of the winning player as an integer, or 0 if there
             is no winner.
         """
@@ -200,10 +608,7 @@ class Board:
         Check whether the board is full (so that no more moves can be made).
         :returns: True if the board is full, False if not.
         """
-        for row in self._board:
-            if self.empty in row:
-                return False
-        return True
+        return self._filled_cells == self.size * self.size
 
     def get_maximum_move(self) -> int:
         """
@@ -218,3 +623,84 @@ class Board:
         :returns: the minimum move allowable on this board.
         """
         return self._minimum_move
+
+
+class BoardSnapshot:
+    """
+    An immutable, hashable snapshot of a board position, storing one byte per
+    cell. Snapshots are much smaller than Board objects, and can be used as
+    dictionary keys or set members.
+    """
+
+    __slots__ = ("size", "_cells")
+
+    def __init__(self, size: int, cells: bytes) -> None:
+        """
+        Initialise the snapshot.
+        :param size: the size of the game board on each side.
+        :param cells: the board's cells in move-number order, one byte (the
+            player number, or 0 for empty) per cell.
+        :except ValueError: indicates that the number of cells does not match
+            the board size.
+        """
+        if len(cells) != size * size:
+            raise ValueError("cells must contain size * size bytes")
+        object.__setattr__(self, "size", size)
+        object.__setattr__(self, "_cells", bytes(cells))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("BoardSnapshot is immutable")
+
+    def __reduce__(self) -> tuple:
+        # Pickling and copying would otherwise set the slots directly, which
+        # __setattr__ forbids, so rebuild the snapshot through __init__.
+        return BoardSnapshot, (self.size, bytes(self._cells))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardSnapshot):
+            return NotImplemented
+        return self.size == other.size and self._cells == other._cells
+
+    def __hash__(self) -> int:
+        # Bytes objects cache their own hash, so this is only calculated once.
+        return hash(self._cells)
+
+    def __repr__(self) -> str:
+        return f"BoardSnapshot({self.size}, {self._cells!r})"
+
+    def get_cells(self) -> bytes:
+        """
+        Return the snapshot's cells.
+        :returns: the cells in move-number order, one byte per cell.
+        """
+        return self._cells
+
+    def get_cell(self, row: int, column: int) -> int:
+        """
+        Return the contents of a cell.
+        :param row: the row number of the cell.
+        :param column: the column number of the cell.
+        :returns: the player in the cell, or 0 if it is empty.
+        """
+        return self._cells[row * self.size + column]
+
+    def to_board(self, win_length: int | None = None,
+                 number_of_players: int | None = None) -> Board:
+        """
+        Build a Board in the snapshot's position. The order in which the
+        moves were made is not recorded, so they are added in move-number
+        order.
+        :param win_length: the win length for the new board. Defaults to the
+            board size.
+        :param number_of_players: the number of players for the new board.
+            Defaults to DEFAULT_NUMBER_OF_PLAYERS, or the highest player in
+            the snapshot if that is greater.
+        :returns: a new Board.
+        """
+        if number_of_players is None:
+            number_of_players = max(DEFAULT_NUMBER_OF_PLAYERS, *self._cells)
+        board = Board(self.size, win_length, number_of_players)
+        for move, player in enumerate(self._cells):
+            if player:
+                board.add_player_move(player, move)
+        return board
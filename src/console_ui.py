@@ -3,12 +3,97 @@ A console UI for a Tic-Tac-Toe game.
 Author: Emily Boegheim
 """
 
+import sys
+from functools import lru_cache
+from typing import TextIO
+
+from sparse_board import SparseBoardView
 from utilities import get_int_from_input
 
+# ANSI escape sequences used by the diff display mode.
+ANSI_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+ANSI_SAVE_CURSOR = "\x1b7"
+ANSI_RESTORE_CURSOR = "\x1b8"
+
+# The number of rows and columns shown of sparse boards larger than this. Only
+# this window of the board is read and drawn.
+DISPLAY_WINDOW_SIZE = 19
+
+# Single-character symbols for players 1 onwards, in the order they are
+# given out. Characters which are easily confused with each other or with
+# digits are left out.
+PLAYER_SYMBOLS = ("XOABCDEFGHJKLMNPQRSTUVWYZ" "abcdefghjkmnpqrstuvwyz"
+                  "23456789")
+
+
+def build_player_map(number_of_players: int) -> dict[int, str]:
+    """
+    Choose a symbol for each player, for use as a ConsoleUI player_map.
+    Players 1 and 2 are always X and O. While there are enough single
+    characters in PLAYER_SYMBOLS every symbol is one character wide;
+    otherwise each player is shown by their number, and every symbol
+    (including the empty space) is padded to the same width.
+    :param number_of_players: the number of players.
+    :returns: a new dictionary mapping 0 (an empty space) and each player
+        number to its symbol.
+    """
+    if number_of_players <= len(PLAYER_SYMBOLS):
+        symbols = PLAYER_SYMBOLS[:number_of_players]
+    else:
+        width = len(str(number_of_players))
+        symbols = [str(player).rjust(width)
+                   for player in range(1, number_of_players + 1)]
+    player_map = {0: " " * len(symbols[-1])}
+    for player, symbol in enumerate(symbols, start=1):
+        player_map[player] = symbol
+    return player_map
+
+
+@lru_cache(maxsize=None)
+def format_row_separator(board_width: int, row_separator: str,
+                         column_separator: str, cell_width: int = 1) -> str:
+    """
+    Build the line drawn between rows of the 2D game board. The result is
+    cached for each combination of arguments.
+    :param board_width: the width of the game board, only counting the
+        game spaces (no visual elements of the board).
+    :param row_separator: the separator to use between rows. This will
+        be repeated to fill the full board width, so it should be a single
+        character.
+    :param column_separator: the separator to use between columns.
+    :param cell_width: the width of each player's symbol.
+    :returns: the separator line, without a line break.
+    """
+    separator_width = (len(column_separator))
+    board_visual_width = (board_width * (separator_width+cell_width)
+                          - separator_width)
+    return row_separator * board_visual_width
+
+
+def get_window_start(first: int, last: int, previous: int | None,
+                     size: int) -> int:
+    """
+    Choose where a display window starts along one side of a board, so that
+    it covers the occupied cells. The previous window is kept if it still
+    covers them all; otherwise the window is centred on them.
+    :param first: the first occupied row or column.
+    :param last: the last occupied row or column.
+    :param previous: the start of the previous window, or None if none.
+    :param size: the size of the board on each side.
+    :returns: the first row or column of the window.
+    """
+    if (previous is not None and previous <= first and
+            last < previous + DISPLAY_WINDOW_SIZE):
+        return previous
+    start = (first + last) // 2 - DISPLAY_WINDOW_SIZE // 2
+    return min(max(start, 0), size - DISPLAY_WINDOW_SIZE)
+
 
 class ConsoleUI:
     """A console UI for a Tic-Tac-Toe game."""
-    def __init__(self, player_map: dict) -> None:
+    def __init__(self, player_map: dict | None = None, diff_mode: bool = False,
+                 output: TextIO | None = None,
+                 number_of_players: int = 2) -> None:
         """
         Initialise the UI by recording the mapping between player number and
         symbol/piece, to use when displaying the board or printing messages.
@@ -16,9 +101,27 @@ class ConsoleUI:
         :param player_map: a dictionary with the keys 0 through the maximum
             number of players and values containing the characters to use as
             representations of each player. 0 is a special value representing
-            an empty space.
+            an empty space. Every symbol should be the same width. Defaults
+            to build_player_map(number_of_players).
+        :param diff_mode: if True, the board is drawn once at the top of a
+            cleared screen and later frames use ANSI escape sequences to
+            redraw only the cells that have changed. This assumes the board
+            stays on screen.
+        :param output: the stream to draw the board and write messages on.
+            Defaults to the current sys.stdout. Moves are always read from
+            the console.
+        :param number_of_players: the number of players to derive symbols
+            for, if no player_map is given.
         """
+        if player_map is None:
+            player_map = build_player_map(number_of_players)
         self.player_map = player_map
+        self._cell_width = len(player_map[0])
+        self.diff_mode = diff_mode
+        self.output = output
+        self._previous_cells = None
+        self._previous_layout = None
+        self._window_origin = None
         self.input_not_int_error = "Invalid move, try again."
         self.input_out_of_bounds_error = "Invalid move, try again."
         self.position_already_filled_error = "Invalid move, try again."
@@ -28,7 +131,8 @@ class ConsoleUI:
                          column_separator: str = " | ") -> None:
         """
         Display a 2-dimensional data structure as a game grid, using the
-        player_map dictionary to represent the data appropriately.
+        player_map dictionary to represent the data appropriately. The whole
+        frame is built first and written in a single call.
         :param board_data: a 2-dimensional data structure containing the game
             board data.
         :param row_separator: the separator to use between rows. This will
@@ -36,16 +140,136 @@ class ConsoleUI:
             character.
         :param column_separator: the separator to use between columns.
         """
-        board_height = len(board_data)
-        board_width = len(board_data[0])
+        if self.diff_mode:
+            frame = self.format_2d_board_changes(board_data, row_separator,
+                                                 column_separator)
+        else:
+            frame = self.format_2d_board(board_data, row_separator,
+                                         column_separator)
+        self._write(frame)
 
+    def format_2d_board(self, board_data: list[list],
+                        row_separator: str = "-",
+                        column_separator: str = " | ") -> str:
+        """
+        Build the text of a game grid, as displayed by display_2d_board. Of a
+        sparse board larger than DISPLAY_WINDOW_SIZE, only a window around
+        the occupied cells is shown, followed by a line giving its position.
+        :param board_data: a 2-dimensional data structure containing the game
+            board data.
+        :param row_separator: the separator to use between rows.
+        :param column_separator: the separator to use between columns.
+        :returns: the grid, followed by a blank line.
+        """
+        cells, caption = self._get_displayed_cells(board_data)
+        return self._format_grid(cells, row_separator, column_separator,
+                                 caption)
+
+    def format_2d_board_changes(self, board_data: list[list],
+                                row_separator: str = "-",
+                                column_separator: str = " | ") -> str:
+        """
+        Build the ANSI escape sequences to update the displayed grid to match
+        the given board data. The first frame, or a frame with a different
+        size, separators or window, clears the screen and draws the whole
+        grid at the top.
+        :param board_data: a 2-dimensional data structure containing the game
+            board data.
+        :param row_separator: the separator to use between rows.
+        :param column_separator: the separator to use between columns.
+        :returns: the text to write, which may be empty if nothing changed.
+        """
+        cells, caption = self._get_displayed_cells(board_data)
+        layout = (len(cells), len(cells[0]), row_separator,
+                  column_separator, caption)
+        previous_cells = self._previous_cells
+        self._previous_cells = [list(row) for row in cells]
+        if previous_cells is None or layout != self._previous_layout:
+            self._previous_layout = layout
+            return ANSI_CLEAR_SCREEN + self._format_grid(
+                cells, row_separator, column_separator, caption)
+
+        cell_width = len(column_separator) + self._cell_width
+        changes = []
+        for row_index, row in enumerate(self._previous_cells):
+            previous_row = previous_cells[row_index]
+            for column_index, cell_data in enumerate(row):
+                if cell_data != previous_row[column_index]:
+                    # ANSI screen positions start from 1, and each board row
+                    # is followed by a separator line.
+                    changes.append(f"\x1b[{2 * row_index + 1};"
+                                   f"{column_index * cell_width + 1}H"
+                                   f"{self.player_map[cell_data]}")
+        if not changes:
+            return ""
+        return ANSI_SAVE_CURSOR + "".join(changes) + ANSI_RESTORE_CURSOR
+
+    def _format_grid(self, cells: list[list], row_separator: str,
+                     column_separator: str, caption: str | None) -> str:
+        """
+        Build the text of a grid of cells.
+        :param cells: a 2-dimensional data structure containing the cells.
+        :param row_separator: the separator to use between rows.
+        :param column_separator: the separator to use between columns.
+        :param caption: a line to show below the grid, or None for none.
+        :returns: the grid, followed by a blank line.
+        """
+        board_height = len(cells)
+        board_width = len(cells[0])
+        separator_line = format_row_separator(board_width, row_separator,
+                                              column_separator,
+                                              self._cell_width)
+        lines = []
         for row_index in range(0, board_height):
-            self.display_2d_board_row(board_data[row_index],
-                                      column_separator)
+            lines.append(self.format_2d_board_row(cells[row_index],
+                                                  column_separator))
             if row_index < board_height - 1:
-                self.display_row_separator(board_width, row_separator,
-                                           column_separator)
-        print()
+                lines.append(separator_line)
+        if caption is not None:
+            lines.append(caption)
+        lines.append("\n")
+        return "\n".join(lines)
+
+    def _get_displayed_cells(self, board_data: list[list]
+                             ) -> tuple[list[list], str | None]:
+        """
+        Choose the cells to show of the given board data. Sparse boards
+        larger than DISPLAY_WINDOW_SIZE are shown through a window, which
+        stays where it is for as long as every occupied cell is inside it,
+        so only the cells in the window are ever read.
+        :param board_data: a 2-dimensional data structure containing the game
+            board data.
+        :returns: a tuple (cells, caption) of the cells to show and a line
+            describing the window, or None if the whole board is shown.
+        """
+        size = len(board_data)
+        if (not isinstance(board_data, SparseBoardView) or
+                size <= DISPLAY_WINDOW_SIZE):
+            return board_data, None
+        bounds = board_data.get_occupied_bounds()
+        if bounds is None:
+            bounds = (size // 2,) * 4
+        top_bound, left_bound, bottom_bound, right_bound = bounds
+        previous_top, previous_left = self._window_origin or (None, None)
+        top = get_window_start(top_bound, bottom_bound, previous_top, size)
+        left = get_window_start(left_bound, right_bound, previous_left, size)
+        self._window_origin = (top, left)
+        last = DISPLAY_WINDOW_SIZE - 1
+        caption = (f"Rows {top}-{top + last}, columns {left}-{left + last} "
+                   f"of {size}")
+        return (board_data.get_window(top, left, DISPLAY_WINDOW_SIZE,
+                                      DISPLAY_WINDOW_SIZE), caption)
+
+    def format_2d_board_row(self, row_data: list, separator: str) -> str:
+        """
+        Build the text of a single row of the 2D board.
+        :param row_data: the data from the current row of the board.
+        :param separator: the separator to put between columns.
+        :returns: the row, without a line break.
+        """
+        player_map = self.player_map
+        return separator.join([player_map[cell_data]
+                               for cell_data in row_data])
 
     def display_2d_board_row(self, row_data: list, separator: str) -> None:
         """
@@ -54,14 +278,7 @@ class ConsoleUI:
         :param row_data: the data from the current row of the board.
         :param separator: the separator to print between columns.
         """
-        board_width = len(row_data)
-        for column_index in range(0, board_width):
-            cell_data = row_data[column_index]
-            cell_content = self.player_map[cell_data]
-            if column_index < board_width - 1:
-                print(f"{cell_content}{separator}", end='')
-            else:
-                print(cell_content)
+        self._write(self.format_2d_board_row(row_data, separator) + "\n")
 
     def display_row_separator(self, board_width: int,
                               row_separator: str,
@@ -75,10 +292,17 @@ class ConsoleUI:
             character.
         :param column_separator: the separator to use between columns.
         """
-        separator_width = (len(column_separator))
-        board_visual_width = (board_width * (separator_width+1)
-                              - separator_width)
-        print(row_separator * board_visual_width)
+        self._write(format_row_separator(board_width, row_separator,
+                                         column_separator,
+                                         self._cell_width) + "\n")
+
+    def _write(self, text: str) -> None:
+        """
+        Write text to the output stream in a single call.
+        :param text: the text to write.
+        """
+        output = self.output if self.output is not None else sys.stdout
+        output.write(text)
 
     def get_current_player_move(self, current_player: int, minimum_move: int,
                                 maximum_move: int) -> int:
@@ -90,33 +314,51 @@ class ConsoleUI:
         :param maximum_move: The highest move allowable on the board.
         :returns: The player's selected move as an integer.
         """
-        player_icon = self.player_map[current_player]
-        prompt = (f"Next move for player {player_icon} " +
-                  f"({minimum_move}-{maximum_move}): ")
+        prompt = self.format_move_prompt(current_player, minimum_move,
+                                         maximum_move)
         error = self.input_not_int_error
         return get_int_from_input(prompt, error)
 
+    def format_move_prompt(self, current_player: int, minimum_move: int,
+                           maximum_move: int) -> str:
+        """
+        Build the prompt asking the current player for their move.
+        :param current_player: The current player, represented as an integer.
+        :param minimum_move: The lowest move allowable on the board.
+        :param maximum_move: The highest move allowable on the board.
+        :returns: The prompt, without a line break.
+        """
+        player_icon = self.player_map[current_player]
+        return (f"Next move for player {player_icon} " +
+                f"({minimum_move}-{maximum_move}): ")
+
     def announce_winner(self, winner: int) -> None:
         """
         Announce the winner of the Tic-Tac-Toe game.
         :param winner: the winning player, represented as an integer.
         """
-        print(f"Player {self.player_map[winner]} wins!")
+        self._write(f"Player {self.player_map[winner]} wins!\n")
 
     def announce_tie(self) -> None:
         """Announce that the game has ended in a tie."""
-        print("It's a tie!")
+        self._write("It's a tie!\n")
+
+    def show_input_not_int_error(self) -> None:
+        """
+        Inform the player that their input could not be read as a move.
+        """
+        self._write(self.input_not_int_error + "\n")
 
     def show_input_out_of_bounds_error(self) -> None:
         """
         Inform the player that their selected move is invalid due to being
         out of bounds.
         """
-        print(self.input_out_of_bounds_error)
+        self._write(self.input_out_of_bounds_error + "\n")
 
     def show_position_already_filled_error(self) -> None:
         """
         Inform the player that their selected move is invalid as the chosen
         position is already filled.
         """
-        print(self.position_already_filled_error)
+        self._write(self.position_already_filled_error + "\n")
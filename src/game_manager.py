@@ -4,9 +4,14 @@ basic program flow and gameplay loop for a game of Tic-Tac-Toe.
 Author: Emily Boegheim
 """
 
+import time
+
 from board import Board
 from board import MoveOutOfBoundsException, PositionAlreadyFilledException
-from console_ui import ConsoleUI
+from console_ui import ConsoleUI, build_player_map
+from game_record import GameRecordWriter
+from instrumentation import PHASES, GameInstrumentation
+from strategies import PlayerStrategy
 
 
 class GameManager:
@@ -15,34 +20,100 @@ class GameManager:
     gameplay loop for a game of Tic-Tac-Toe.
     """
 
-    def __init__(self) -> None:
-        """Initialise the Tic-Tac-Toe game"""
-        # Map player numbers to visual representation as single characters of
-        # text. 0 represents an empty space.
-        self.player_map = {
-            0: ' ',
-            1: 'X',
-            2: 'O',
-        }
-        self.number_of_players = len(self.player_map) - 1
+    def __init__(self, board: Board | None = None, ui=None,
+                 strategies: dict[int, PlayerStrategy] | None = None,
+                 recorder: GameRecordWriter | None = None,
+                 instrumentation: GameInstrumentation | None = None,
+                 number_of_players: int = 2) -> None:
+        """
+        Initialise the Tic-Tac-Toe game
+        :param board: the game board to play on. It must have room for
+            number_of_players players. Defaults to a 3x3 Board.
+        :param ui: the UI used to display the game and prompt for moves.
+            Defaults to a ConsoleUI.
+        :param strategies: a dictionary mapping player numbers to the
+            strategies that choose their moves. Players without a strategy are
+            prompted for their moves through the UI.
+        :param recorder: a writer to append a record of the game to when it
+            ends. Defaults to not recording the game.
+        :param instrumentation: where to record the time taken by each phase
+            of the game and the number of invalid moves. Defaults to no
+            instrumentation, which adds no overhead.
+        :param number_of_players: the number of players taking turns, from
+            player 1.
+        """
+        # Map player numbers to visual representation as text. 0 represents
+        # an empty space.
+        self.player_map = build_player_map(number_of_players)
+        self.number_of_players = number_of_players
         self.current_player = 1
 
-        self.board = Board()
+        self.board = (board if board is not None else
+                      Board(number_of_players=number_of_players))
         self._minimum_move = self.board.get_minimum_move()
         self._maximum_move = self.board.get_maximum_move()
-        self.ui = ConsoleUI(self.player_map)
+        self.ui = ui if ui is not None else ConsoleUI(self.player_map)
+        self.strategies = strategies if strategies is not None else {}
+        self.recorder = recorder
+        self.instrumentation = instrumentation
+        self.moves = []
 
     def main(self) -> None:
         """The main gameplay loop for the Tic-Tac-Toe game"""
+        if self.instrumentation is not None:
+            self._instrumented_main()
+            return
+        while not self.start_turn():
+            self.take_current_player_turn()
+            self.switch_players()
+
+    def _instrumented_main(self) -> None:
+        """
+        The main gameplay loop, timing each phase. This is kept separate from
+        main so that the uninstrumented loop has no timing overhead.
+        """
+        # Look up the histograms once, rather than for every observation.
+        display_histogram, winner_histogram, tie_histogram, turn_histogram = [
+            self.instrumentation.get_histogram(phase, self.board.size)
+            for phase in PHASES]
+        clock = time.perf_counter
         while True:
+            start = clock()
             self.display_board()
-            if self.check_for_winner():
+            display_histogram.observe(clock() - start)
+            start = clock()
+            finished = self.check_for_winner()
+            winner_histogram.observe(clock() - start)
+            if finished:
+                self.record_game(self.board.find_winner())
                 return
-            if self.check_for_tie():
+            start = clock()
+            finished = self.check_for_tie()
+            tie_histogram.observe(clock() - start)
+            if finished:
+                self.record_game(0)
                 return
+            start = clock()
             self.take_current_player_turn()
+            turn_histogram.observe(clock() - start)
             self.switch_players()
 
+    def start_turn(self) -> bool:
+        """
+        Display the board at the start of a turn and check whether the game
+        is over. If it is, announce and record the result.
+        :returns: True if the game is over, False if the current player
+            should take their turn.
+        """
+        self.display_board()
+        if self.check_for_winner():
+            self.record_game(self.board.find_winner())
+            return True
+        if self.check_for_tie():
+            self.record_game(0)
+            return True
+        return False
+
     def display_board(self) -> None:
         """Display the current state of the game board."""
         self.ui.display_2d_board(self.board.get_board_data())
@@ -72,17 +143,52 @@ class GameManager:
 
     def take_current_player_turn(self) -> None:
         """Get the current player's chosen move and action it."""
+        strategy = self.strategies.get(self.current_player)
         while True:
-            move = self.ui.get_current_player_move(self.current_player,
-                                                   self._minimum_move,
-                                                   self._maximum_move)
-            try:
-                if self.board.add_player_move(self.current_player, move):
-                    return
-            except MoveOutOfBoundsException:
-                self.ui.show_input_out_of_bounds_error()
-            except PositionAlreadyFilledException:
-                self.ui.show_position_already_filled_error()
+            if strategy is not None:
+                move = strategy.choose_move(self.board, self.current_player)
+            else:
+                move = self.ui.get_current_player_move(self.current_player,
+                                                       self._minimum_move,
+                                                       self._maximum_move)
+            if self.try_current_player_move(move):
+                return
+
+    def try_current_player_move(self, move: int) -> bool:
+        """
+        Try to make the given move for the current player, showing an error
+        through the UI if it is invalid.
+        :param move: the move to make.
+        :returns: True if the move was made, False if it was invalid.
+        """
+        try:
+            if self.board.add_player_move(self.current_player, move):
+                self.moves.append(move)
+                return True
+        except MoveOutOfBoundsException as exception:
+            self._count_retry(exception)
+            self.ui.show_input_out_of_bounds_error()
+        except PositionAlreadyFilledException as exception:
+            self._count_retry(exception)
+            self.ui.show_position_already_filled_error()
+        return False
+
+    def _count_retry(self, exception: Exception) -> None:
+        """
+        Count an invalid move, if instrumentation is enabled.
+        :param exception: the exception raised by the invalid move.
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.count_retry(exception)
+
+    def record_game(self, winner: int) -> None:
+        """
+        Append a record of the finished game to the recorder, if there is one.
+        :param winner: the winning player, or 0 for a tie.
+        """
+        if self.recorder is not None:
+            self.recorder.write_game(self.board, self.moves, winner,
+                                     self.number_of_players)
 
     def switch_players(self) -> None:
         """Switch to the next player's turn."""
@@ -0,0 +1,337 @@
+"""
+A compact binary format for archiving played Tic-Tac-Toe games, with a
+streaming writer which appends records to a file and a generator which reads
+them back with constant memory use.
+
+File format: the header RECORD_MAGIC, then the length of the file up to the
+end of the last record known to be complete, as an 8-byte little-endian
+integer, followed by any number of records. The writer updates the length
+whenever it is flushed or closed, so that reopening the file only has to
+check the records written since. Each record is a sequence of unsigned
+variable-length integers (7 bits per byte, least significant group first,
+with the high bit set on every byte except the last): the board size, the
+win length, the number of players, the number of moves, each move numbered
+as in Board.add_player_move, and finally the winning player, or 0 for a tie
+or unfinished game. Moves alternate between the players starting with
+player 1, so players are not stored.
+On boards up to 11x11 every field but the header takes one byte, so a 3x3
+game takes 5 bytes plus one per move.
+Author: Emily Boegheim
+"""
+
+import os
+from typing import Iterator
+
+RECORD_MAGIC = b"TTTR\x01"
+
+# The length of the header: RECORD_MAGIC and the checked length.
+RECORD_HEADER_LENGTH = len(RECORD_MAGIC) + 8
+
+# The amount of the file read at a time by read_records.
+READ_CHUNK_SIZE = 1 << 16
+
+
+class GameRecordException(Exception):
+    """An exception indicating that a game record file is invalid."""
+    pass
+
+
+class GameRecord:
+    """A record of a single game: its settings, moves and result."""
+
+    __slots__ = ("size", "win_length", "number_of_players", "moves", "winner")
+
+    def __init__(self, size: int, win_length: int, number_of_players: int,
+                 moves: list[int], winner: int) -> None:
+        """
+        Initialise the record.
+        :param size: the size of the game board on each side.
+        :param win_length: the number of pieces in a row needed to win.
+        :param number_of_players: the number of players taking turns.
+        :param moves: the moves made, in order, starting with player 1.
+        :param winner: the winning player, or 0 for a tie or unfinished game.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.number_of_players = number_of_players
+        self.moves = moves
+        self.winner = winner
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (self.size == other.size and
+                self.win_length == other.win_length and
+                self.number_of_players == other.number_of_players and
+                self.moves == other.moves and self.winner == other.winner)
+
+    def __repr__(self) -> str:
+        return (f"GameRecord(size={self.size}, win_length={self.win_length}, "
+                f"number_of_players={self.number_of_players}, "
+                f"moves={self.moves}, winner={self.winner})")
+
+
+def encode_varint(value: int, buffer: bytearray) -> None:
+    """
+    Append an unsigned variable-length integer to a buffer.
+    :param value: the integer to encode, which must not be negative.
+    :param buffer: the buffer to append to.
+    :except ValueError: indicates that the value is negative.
+    """
+    if value < 0:
+        raise ValueError("varints cannot be negative")
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def decode_varint(data: bytes, position: int) -> tuple[int, int]:
+    """
+    Read an unsigned variable-length integer from a buffer.
+    :param data: the buffer to read from.
+    :param position: the index of the integer's first byte.
+    :returns: a tuple (value, position), where position is the index of the
+        byte following the integer.
+    :except IndexError: indicates that the buffer ends partway through the
+        integer.
+    """
+    byte = data[position]
+    position += 1
+    if byte < 0x80:
+        return byte, position
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """
+    Encode a game record in the binary format.
+    :param record: the record to encode.
+    :returns: the encoded record.
+    """
+    buffer = bytearray()
+    encode_varint(record.size, buffer)
+    encode_varint(record.win_length, buffer)
+    encode_varint(record.number_of_players, buffer)
+    encode_varint(len(record.moves), buffer)
+    moves = record.moves
+    if moves and max(moves) < 0x80:
+        # Every move fits in a single byte, so they can be copied directly.
+        buffer += bytes(moves)
+    else:
+        for move in moves:
+            encode_varint(move, buffer)
+    encode_varint(record.winner, buffer)
+    return bytes(buffer)
+
+
+def decode_record(data: bytes, position: int = 0) -> tuple[GameRecord, int]:
+    """
+    Decode one game record from a buffer.
+    :param data: the buffer to read from.
+    :param position: the index of the record's first byte.
+    :returns: a tuple (record, position), where position is the index of the
+        byte following the record.
+    :except IndexError: indicates that the buffer ends partway through the
+        record.
+    """
+    size, position = decode_varint(data, position)
+    win_length, position = decode_varint(data, position)
+    number_of_players, position = decode_varint(data, position)
+    move_count, position = decode_varint(data, position)
+    move_bytes = data[position:position + move_count]
+    if len(move_bytes) == move_count and (not move_bytes or
+                                          max(move_bytes) < 0x80):
+        # Every move fits in a single byte, so they can be copied directly.
+        moves = list(move_bytes)
+        position += move_count
+    else:
+        moves = []
+        for _ in range(0, move_count):
+            move, position = decode_varint(data, position)
+            moves.append(move)
+    winner, position = decode_varint(data, position)
+    return (GameRecord(size, win_length, number_of_players, moves, winner),
+            position)
+
+
+class GameRecordWriter:
+    """
+    Appends game records to a file. Records are buffered by the file object,
+    so call close (or use the writer as a context manager) to make sure they
+    are all written.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a record file for appending, creating it if it does not exist.
+        The records written to an existing file since its header was last
+        updated are read through, and a record left partly written at its
+        end (for example by an interrupted run) is removed, so that the new
+        records are not misaligned.
+        :param path: the path of the record file.
+        :except GameRecordException: indicates that the file exists but is not
+            a game record file.
+        """
+        # Create the file if it does not exist, without truncating it.
+        with open(path, "ab"):
+            pass
+        self._file = open(path, "r+b")
+        try:
+            self._checked_length = self._find_end(path)
+        except BaseException:
+            self._file.close()
+            raise
+        self.records_written = 0
+
+    def _find_end(self, path: str) -> int:
+        """
+        Check the file's header, remove any partly written record from its
+        end and move to the end of the file, writing a header if the file is
+        empty.
+        :param path: the path of the record file, for error messages.
+        :returns: the length recorded in the file's header.
+        :except GameRecordException: indicates that the file is not a game
+            record file.
+        """
+        record_file = self._file
+        header = record_file.read(RECORD_HEADER_LENGTH)
+        if not header:
+            record_file.write(RECORD_MAGIC +
+                              RECORD_HEADER_LENGTH.to_bytes(8, "little"))
+            return RECORD_HEADER_LENGTH
+        if (len(header) < RECORD_HEADER_LENGTH or
+                not header.startswith(RECORD_MAGIC)):
+            raise GameRecordException(f"Not a game record file: {path}")
+        checked_length = int.from_bytes(header[len(RECORD_MAGIC):], "little")
+        end = record_file.seek(0, os.SEEK_END)
+        if checked_length < RECORD_HEADER_LENGTH or checked_length > end:
+            # The file was cut short after its header was written, so check
+            # every record.
+            checked_length = RECORD_HEADER_LENGTH
+        record_file.seek(checked_length)
+        complete_length = checked_length
+        for _, complete_length in _iterate_records(record_file,
+                                                   READ_CHUNK_SIZE):
+            pass
+        if complete_length < end:
+            record_file.truncate(complete_length)
+        record_file.seek(complete_length)
+        return checked_length
+
+    def _update_header(self) -> None:
+        """
+        Record the current length of the file in its header, once the
+        records have been written.
+        """
+        end = self._file.tell()
+        if end != self._checked_length:
+            # Seeking writes the buffered records before the header.
+            self._file.seek(len(RECORD_MAGIC))
+            self._file.write(end.to_bytes(8, "little"))
+            self._file.seek(end)
+            self._checked_length = end
+
+    def write(self, record: GameRecord) -> None:
+        """
+        Append a record to the file.
+        :param record: the record to write.
+        """
+        self._file.write(encode_record(record))
+        self.records_written += 1
+
+    def write_game(self, board, moves: list[int], winner: int,
+                   number_of_players: int = 2) -> None:
+        """
+        Append a record of a game played on the given board.
+        :param board: the board the game was played on, used for its size and
+            win length.
+        :param moves: the moves made, in order, starting with player 1.
+        :param winner: the winning player, or 0 for a tie or unfinished game.
+        :param number_of_players: the number of players taking turns.
+        """
+        self.write(GameRecord(board.size, board.win_length, number_of_players,
+                              moves, winner))
+
+    def flush(self) -> None:
+        """Write any buffered records to the file and update its header."""
+        self._update_header()
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Write any buffered records, update the file's header and close the
+        file.
+        """
+        if not self._file.closed:
+            self._update_header()
+            self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exception_details) -> None:
+        self.close()
+
+
+def read_records(path: str,
+                 chunk_size: int = READ_CHUNK_SIZE) -> Iterator[GameRecord]:
+    """
+    Read the records in a file, one at a time. The file is read in chunks,
+    so memory use does not depend on the size of the file.
+    :param path: the path of the record file.
+    :param chunk_size: the number of bytes to read at a time.
+    :returns: a generator of the records in the order they were written.
+    :except GameRecordException: indicates that the file is not a game
+        record file or ends partway through a record.
+    """
+    with open(path, "rb") as record_file:
+        header = record_file.read(RECORD_HEADER_LENGTH)
+        if (len(header) < RECORD_HEADER_LENGTH or
+                not header.startswith(RECORD_MAGIC)):
+            raise GameRecordException(f"Not a game record file: {path}")
+        complete_length = RECORD_HEADER_LENGTH
+        for record, complete_length in _iterate_records(record_file,
+                                                        chunk_size):
+            yield record
+        if complete_length < record_file.tell():
+            raise GameRecordException(f"Truncated game record in {path}")
+
+
+def _iterate_records(record_file,
+                     chunk_size: int) -> Iterator[tuple[GameRecord, int]]:
+    """
+    Read the complete records in an open record file, in chunks. Anything
+    left after the last complete record is not decoded.
+    :param record_file: the file, open for reading just after its header.
+    :param chunk_size: the number of bytes to read at a time.
+    :returns: a generator of tuples (record, end), where end is the offset
+        in the file of the byte following the record.
+    """
+    data = b""
+    position = 0
+    # The offset in the file of the start of data.
+    offset = record_file.tell()
+    while True:
+        chunk = record_file.read(chunk_size)
+        if not chunk:
+            break
+        offset += position
+        data = data[position:] + chunk
+        position = 0
+        end = len(data)
+        while position < end:
+            try:
+                record, position = decode_record(data, position)
+            except IndexError:
+                # The record continues in the next chunk.
+                break
+            yield record, offset + position
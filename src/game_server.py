@@ -0,0 +1,253 @@
+"""
+An asyncio Tic-Tac-Toe server which hosts many games concurrently in one
+event loop, on a local TCP or Unix socket. Each connection plays one game.
+
+The protocol is line-based UTF-8 text mirroring ConsoleUI: the server sends
+the board and then a prompt line such as "Next move for player X (0-8): ",
+and the client replies with a line holding the move number. Invalid input
+gets the same error messages as the console, followed by the prompt again.
+The game ends with "Player X wins!" or "It's a tie!", after which the server
+closes the connection. Players without a connection of their own are either
+played by a computer opponent or, by default, by the same connection in turn.
+
+Each connection waits for its output to drain before reading the next move,
+so a slow client only holds up its own game. Games left idle for too long
+are closed, as are connections whose clients stop reading. Computer
+opponents choose their moves on the event loop's default executor, so a
+slow search does not stall the other connections. Opponent strategies are
+pooled and lent to a game only while it searches, so their memory is bounded
+by the size of the pool rather than growing with the number of games.
+Run from the project root with: PYTHONPATH=src python src/game_server.py [port]
+Author: Emily Boegheim
+"""
+
+import asyncio
+import io
+import sys
+
+from board import Board
+from console_ui import ConsoleUI
+from game_manager import GameManager
+from game_record import GameRecordWriter
+from strategies import PlayerStrategy
+from tournament import STRATEGY_FACTORIES
+
+# The longest line a client may send, in bytes.
+MAXIMUM_LINE_LENGTH = 1024
+
+SERVER_FULL_MESSAGE = "Server full, try again later."
+IDLE_MESSAGE = "Game closed after being idle."
+
+
+class GameServer:
+    """Hosts Tic-Tac-Toe games for clients connecting over a socket."""
+
+    def __init__(self, size: int = 3, win_length: int | None = None,
+                 opponent: str | None = None, idle_timeout: float = 60.0,
+                 max_games: int = 10000,
+                 recorder: GameRecordWriter | None = None,
+                 max_opponents: int = 4) -> None:
+        """
+        Initialise the server.
+        :param size: the size of each game board on each side.
+        :param win_length: the number of pieces in a row needed to win.
+            Defaults to the board size.
+        :param opponent: the name of the strategy, from STRATEGY_FACTORIES,
+            which plays player 2. Defaults to the client playing every player.
+        :param idle_timeout: the number of seconds to wait for a move before
+            closing the game.
+        :param max_games: the most games to host at once. Further connections
+            are told the server is full and closed.
+        :param recorder: a writer to append a record of each finished game
+            to. Defaults to not recording games.
+        :param max_opponents: the most opponent strategies to create. Games
+            whose opponent is due to move wait for one of them to be free.
+        :except KeyError: indicates an unknown opponent name.
+        """
+        if opponent is not None and opponent not in STRATEGY_FACTORIES:
+            raise KeyError(f"Unknown strategy: {opponent}")
+        self.size = size
+        self.win_length = win_length
+        self.opponent = opponent
+        self.idle_timeout = idle_timeout
+        self.max_games = max_games
+        self.recorder = recorder
+        self.active_games = 0
+        self.peak_active_games = 0
+        self.games_finished = 0
+        self.games_evicted = 0
+        self.connections_refused = 0
+        self.opponents_created = 0
+        self._idle_opponents = []
+        self._opponent_slots = asyncio.Semaphore(max_opponents)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0,
+                    path: str | None = None,
+                    backlog: int = 4096) -> asyncio.AbstractServer:
+        """
+        Start listening for connections.
+        :param host: the address to listen on for TCP connections.
+        :param port: the TCP port to listen on. Defaults to any free port.
+        :param path: the path of a Unix socket to listen on instead of TCP.
+        :param backlog: the number of connections which may wait to be
+            accepted. The operating system may lower this. Bursts of more
+            connections than this can stall until clients retry.
+        :returns: the listening server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection,
+                                                   path,
+                                                   limit=MAXIMUM_LINE_LENGTH,
+                                                   backlog=backlog)
+        return await asyncio.start_server(self.handle_connection, host, port,
+                                          limit=MAXIMUM_LINE_LENGTH,
+                                          backlog=backlog)
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Play one game with a connected client, then close the connection.
+        :param reader: the stream to read the client's moves from.
+        :param writer: the stream to send the game to the client on.
+        """
+        if self.active_games >= self.max_games:
+            self.connections_refused += 1
+            writer.write((SERVER_FULL_MESSAGE + "\n").encode())
+            await self._close(writer)
+            return
+        self.active_games += 1
+        self.peak_active_games = max(self.peak_active_games,
+                                     self.active_games)
+        try:
+            if await self.play_game(reader, writer):
+                self.games_finished += 1
+            else:
+                self.games_evicted += 1
+        except ConnectionError:
+            self.games_evicted += 1
+        finally:
+            self.active_games -= 1
+            await self._close(writer)
+
+    async def play_game(self, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> bool:
+        """
+        Run the gameplay loop of GameManager.main, reading moves from the
+        client instead of the console.
+        :param reader: the stream to read the client's moves from.
+        :param writer: the stream to send the game to the client on.
+        :returns: True if the game was played to the end, False if the client
+            disconnected or was idle for too long.
+        """
+        output = io.StringIO()
+        strategies = {}
+        game_manager = GameManager(Board(self.size, self.win_length),
+                                   ui=None, strategies=strategies,
+                                   recorder=self.recorder)
+        game_manager.ui = ui = ConsoleUI(game_manager.player_map,
+                                         output=output)
+        board = game_manager.board
+        loop = asyncio.get_running_loop()
+        while not game_manager.start_turn():
+            if self.opponent is not None and game_manager.current_player == 2:
+                async with self._opponent_slots:
+                    strategies[2] = self._borrow_opponent()
+                    # Nothing else touches this game's board, output or
+                    # borrowed strategy while the strategy runs, so it is
+                    # safe to use them in another thread. If the game is
+                    # cancelled meanwhile, the strategy may still be in use
+                    # and is not returned to the pool.
+                    await loop.run_in_executor(
+                        None, game_manager.take_current_player_turn)
+                    self._idle_opponents.append(strategies.pop(2))
+            else:
+                while True:
+                    prompt = ui.format_move_prompt(
+                        game_manager.current_player,
+                        board.get_minimum_move(), board.get_maximum_move())
+                    output.write(prompt + "\n")
+                    await self._send(writer, output)
+                    try:
+                        line = await asyncio.wait_for(reader.readline(),
+                                                      self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        writer.write((IDLE_MESSAGE + "\n").encode())
+                        return False
+                    except ValueError:
+                        # The line was longer than MAXIMUM_LINE_LENGTH.
+                        return False
+                    if not line:
+                        return False
+                    try:
+                        move = int(line)
+                    except ValueError:
+                        ui.show_input_not_int_error()
+                        continue
+                    if game_manager.try_current_player_move(move):
+                        break
+            game_manager.switch_players()
+        await self._send(writer, output)
+        return True
+
+    def _borrow_opponent(self) -> PlayerStrategy:
+        """
+        Take an idle opponent strategy from the pool, creating one if every
+        strategy is in use. The caller must hold one of the opponent slots.
+        Strategies keep their search tables between games, which is safe
+        because their entries are keyed by the whole position.
+        :returns: a strategy for the caller's sole use until it is returned
+            to the pool.
+        """
+        if self._idle_opponents:
+            return self._idle_opponents.pop()
+        self.opponents_created += 1
+        return STRATEGY_FACTORIES[self.opponent]()
+
+    async def _send(self, writer: asyncio.StreamWriter,
+                    output: io.StringIO) -> None:
+        """
+        Send everything written to the game's output since the last send,
+        waiting until the connection's buffer has drained.
+        :param writer: the stream to send on.
+        :param output: the game's output.
+        :except ConnectionAbortedError: indicates that the client stopped
+            reading for longer than the idle timeout, so the connection was
+            dropped.
+        """
+        writer.write(output.getvalue().encode())
+        output.seek(0)
+        output.truncate()
+        try:
+            await asyncio.wait_for(writer.drain(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            # Closing the connection normally would wait for the unsent
+            # output to drain as well, so drop it at once.
+            writer.transport.abort()
+            raise ConnectionAbortedError("Client stopped reading")
+
+    async def _close(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Close a connection, ignoring errors from clients that have already
+        gone.
+        :param writer: the stream to close.
+        """
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Run a game server until the process is stopped.
+    :param host: the address to listen on.
+    :param port: the TCP port to listen on.
+    """
+    server = await GameServer().start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
@@ -0,0 +1,171 @@
+"""
+Opt-in instrumentation for GameManager. Records how long each phase of the
+gameplay loop takes, as latency histograms for each board size, and counts
+invalid moves by the exception raised. Results can be exported as JSON or in
+the Prometheus text exposition format.
+Author: Emily Boegheim
+"""
+
+import json
+from bisect import bisect_left
+from collections import Counter
+
+# The phases of GameManager.main, in the order they run.
+PHASES = ("display_board", "check_for_winner", "check_for_tie",
+          "take_current_player_turn")
+
+# Upper bounds of the histogram buckets, in seconds. A final bucket holds
+# everything slower.
+DEFAULT_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class LatencyHistogram:
+    """A histogram of latencies with fixed bucket bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialise an empty histogram.
+        :param buckets: the upper bound of each bucket in seconds, in
+            increasing order.
+        """
+        self.buckets = buckets
+        # One count per bucket, plus one for latencies above every bound.
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_seconds = 0.0
+        self.observations = 0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add a latency to the histogram.
+        :param seconds: the latency in seconds.
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total_seconds += seconds
+        self.observations += 1
+
+    def get_cumulative_counts(self) -> list[int]:
+        """
+        Count the latencies at or below each bucket's upper bound, as
+        Prometheus histograms do.
+        :returns: a cumulative count for each bucket, followed by the total.
+        """
+        cumulative_counts = []
+        running_total = 0
+        for count in self.counts:
+            running_total += count
+            cumulative_counts.append(running_total)
+        return cumulative_counts
+
+    def to_dict(self) -> dict:
+        """
+        Describe the histogram in a form which can be converted to JSON.
+        :returns: a dictionary of the histogram's bounds, counts and totals.
+        """
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "sum_seconds": self.total_seconds,
+            "count": self.observations,
+        }
+
+
+class GameInstrumentation:
+    """
+    Timings and counters collected from one or more GameManagers. Pass an
+    instance to GameManager to enable instrumentation; without one,
+    GameManager runs its uninstrumented loop.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialise the instrumentation with nothing recorded.
+        :param buckets: the upper bound of each histogram bucket in seconds.
+        """
+        self.buckets = buckets
+        # Histograms keyed by (phase, board size).
+        self.histograms = {}
+        # Invalid move retries, keyed by exception class name.
+        self.retries = Counter()
+
+    def get_histogram(self, phase: str, board_size: int) -> LatencyHistogram:
+        """
+        Find the histogram for a phase on boards of the given size, creating
+        it if needed.
+        :param phase: the name of the phase, from PHASES.
+        :param board_size: the size of the game board on each side.
+        :returns: the histogram.
+        """
+        key = (phase, board_size)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = LatencyHistogram(self.buckets)
+            self.histograms[key] = histogram
+        return histogram
+
+    def observe_phase(self, phase: str, board_size: int,
+                      seconds: float) -> None:
+        """
+        Record the time taken by one run of a phase.
+        :param phase: the name of the phase, from PHASES.
+        :param board_size: the size of the game board on each side.
+        :param seconds: the time taken in seconds.
+        """
+        self.get_histogram(phase, board_size).observe(seconds)
+
+    def count_retry(self, exception: Exception) -> None:
+        """
+        Record that a player has to choose again after an invalid move.
+        :param exception: the exception raised by the invalid move.
+        """
+        self.retries[type(exception).__name__] += 1
+
+    def to_dict(self) -> dict:
+        """
+        Describe everything recorded in a form which can be converted to JSON.
+        :returns: a dictionary with "phases" (histograms by phase, then by
+            board size) and "retries" (counts by exception name).
+        """
+        phases = {}
+        for (phase, board_size), histogram in sorted(self.histograms.items()):
+            phases.setdefault(phase, {})[str(board_size)] = histogram.to_dict()
+        return {"phases": phases,
+                "retries": dict(sorted(self.retries.items()))}
+
+    def to_json(self) -> str:
+        """
+        Export everything recorded as JSON.
+        :returns: a JSON document, as described by to_dict.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "tictactoe") -> str:
+        """
+        Export everything recorded in the Prometheus text exposition format.
+        :param prefix: the prefix for every metric name.
+        :returns: the metrics, one sample per line.
+        """
+        phase_metric = f"{prefix}_phase_seconds"
+        retry_metric = f"{prefix}_invalid_move_retries_total"
+        lines = [
+            f"# HELP {phase_metric} Time spent in each phase of the "
+            f"gameplay loop.",
+            f"# TYPE {phase_metric} histogram",
+        ]
+        for (phase, board_size), histogram in sorted(self.histograms.items()):
+            labels = f'phase="{phase}",board_size="{board_size}"'
+            bounds = [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds,
+                                    histogram.get_cumulative_counts()):
+                lines.append(f'{phase_metric}_bucket{{{labels},le="{bound}"}} '
+                             f'{count}')
+            lines.append(f"{phase_metric}_sum{{{labels}}} "
+                         f"{histogram.total_seconds!r}")
+            lines.append(f"{phase_metric}_count{{{labels}}} "
+                         f"{histogram.observations}")
+        lines.append(f"# HELP {retry_metric} Invalid moves which had to be "
+                     f"chosen again, by exception.")
+        lines.append(f"# TYPE {retry_metric} counter")
+        for exception_name, count in sorted(self.retries.items()):
+            lines.append(f'{retry_metric}{{exception="{exception_name}"}} '
+                         f'{count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,293 @@
+"""
+A Monte Carlo Tree Search player for Tic-Tac-Toe. It grows a search tree
+with UCT selection and random rollouts, within a budget of playouts or
+wall-clock time per move, and reuses its tree between turns. It works on
+boards of any size, where exact search is impractical.
+Author: Emily Boegheim
+"""
+
+import math
+import random
+import time
+
+from board import Board
+from strategies import PlayerStrategy
+
+
+class MCTSNode:
+    """A node in the search tree, representing the position after a move."""
+
+    __slots__ = ("move", "player", "parent", "children", "untried_moves",
+                 "visits", "reward")
+
+    def __init__(self, move: int, player: int, parent: "MCTSNode | None",
+                 untried_moves: list[int]) -> None:
+        """
+        Initialise a node which has not yet been visited.
+        :param move: the move leading to this node, or -1 for a root node.
+        :param player: the player who made the move.
+        :param parent: the parent node, or None for a root node.
+        :param untried_moves: the moves from this position which do not yet
+            have child nodes.
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried_moves = untried_moves
+        self.visits = 0
+        self.reward = 0.0
+
+
+class MCTSStrategy(PlayerStrategy):
+    """
+    A computer player using Monte Carlo Tree Search with UCT selection.
+    Each playout scores 1 for the player who wins, 0.5 for each player in a
+    tie and 0 otherwise. The most-visited move is played.
+    """
+
+    def __init__(self, seed: int | None = None,
+                 playout_budget: int | None = 1000,
+                 time_budget: float | None = None,
+                 exploration: float = math.sqrt(2),
+                 number_of_players: int = 2, reuse_tree: bool = True) -> None:
+        """
+        Initialise the strategy.
+        :param seed: the seed for the random number generator used in
+            rollouts. Defaults to an unpredictable seed.
+        :param playout_budget: the maximum number of playouts per move, or
+            None for no limit.
+        :param time_budget: the maximum wall-clock time per move in seconds,
+            or None for no limit.
+        :param exploration: the UCT exploration constant.
+        :param number_of_players: the number of players taking turns.
+        :param reuse_tree: whether to keep the relevant part of the search
+            tree from one move to the next.
+        :except ValueError: indicates that neither budget was given, or that
+            a budget was not positive.
+        """
+        if playout_budget is None and time_budget is None:
+            raise ValueError("a playout budget or time budget is required")
+        if playout_budget is not None and playout_budget < 1:
+            raise ValueError("playout_budget must be at least 1")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        self.random = random.Random(seed)
+        self.playout_budget = playout_budget
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.number_of_players = number_of_players
+        self.reuse_tree = reuse_tree
+        self.playouts = 0
+        self.search_seconds = 0.0
+        self._root = None
+        self._root_board = None
+        self._root_move_count = 0
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Search for the best move within the budget.
+        :param board: the current game board, which must not already be won
+            or full.
+        :param player: the player whose move it is.
+        :returns: the most-visited move.
+        """
+        start = time.perf_counter()
+        root = self._find_reusable_root(board, player)
+        if root is None:
+            root = MCTSNode(-1, self._previous_player(player), None,
+                            self._get_shuffled_moves(board))
+        deadline = None
+        if self.time_budget is not None:
+            deadline = start + self.time_budget
+        playouts = 0
+        # The budgets are positive, so at least one playout runs and the
+        # root has a child to choose.
+        while True:
+            self._run_playout(board, root)
+            playouts += 1
+            if (self.playout_budget is not None and
+                    playouts >= self.playout_budget):
+                break
+            # Checking the clock is relatively slow, so only do it
+            # occasionally.
+            if (deadline is not None and playouts % 16 == 0 and
+                    time.perf_counter() >= deadline):
+                break
+        self.playouts += playouts
+        self.search_seconds += time.perf_counter() - start
+
+        best_child = max(root.children, key=lambda child: child.visits)
+        self._root = best_child
+        self._root_board = board
+        self._root_move_count = board.get_filled_cell_count() + 1
+        return best_child.move
+
+    def reset(self) -> None:
+        """Discard the search tree before a new game."""
+        self._root = None
+        self._root_board = None
+        self._root_move_count = 0
+
+    def get_playouts_per_second(self) -> float:
+        """
+        Calculate the search speed over all searches so far.
+        :returns: the number of playouts per second, or 0 if no time has been
+            recorded.
+        """
+        if self.search_seconds <= 0:
+            return 0.0
+        return self.playouts / self.search_seconds
+
+    def _run_playout(self, board: Board, root: MCTSNode) -> None:
+        """
+        Run one playout: select a path down the tree, expand one new node,
+        play randomly to the end of the game, and record the result along
+        the path.
+        :param board: the game board at the root of the tree. It is returned
+            to the same state afterwards.
+        :param root: the root node.
+        """
+        # Moves are made on the board itself and undone at the end of the
+        # playout, so no copies are needed.
+        moves_at_root = board.get_filled_cell_count()
+        node = root
+        while not node.untried_moves and node.children:
+            node = self._select_child(node)
+            board.add_player_move(node.player, node.move)
+
+        winner = board.find_winner()
+        if not winner and node.untried_moves:
+            move = node.untried_moves.pop()
+            player = self._next_player(node.player)
+            board.add_player_move(player, move)
+            winner = board.find_winner()
+            untried_moves = []
+            if not winner and not board.is_board_full():
+                untried_moves = self._get_shuffled_moves(board)
+            child = MCTSNode(move, player, node, untried_moves)
+            node.children.append(child)
+            node = child
+
+        if not winner and not board.is_board_full():
+            winner = self._rollout(board, self._next_player(node.player))
+
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.reward += 1.0
+            elif winner == 0:
+                node.reward += 0.5
+            node = node.parent
+
+        for _ in range(moves_at_root, board.get_filled_cell_count()):
+            board.undo_move()
+
+    def _select_child(self, node: MCTSNode) -> MCTSNode:
+        """
+        Select the child with the highest UCT score.
+        :param node: a fully expanded node.
+        :returns: the selected child.
+        """
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best_child = None
+        best_score = -1.0
+        for child in node.children:
+            score = (child.reward / child.visits +
+                     exploration * math.sqrt(log_visits / child.visits))
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
+
+    def _rollout(self, board: Board, player: int) -> int:
+        """
+        Play random moves until the game ends. Moves are sampled from the
+        board's empty-cell index, so each step takes constant time and the
+        loop allocates nothing.
+        :param board: the board to play on. The moves are left on the board
+            for the caller to undo.
+        :param player: the player to move first.
+        :returns: the winning player, or 0 for a tie.
+        """
+        generator = self.random
+        number_of_players = self.number_of_players
+        while True:
+            board.add_player_move(player,
+                                  board.get_random_empty_move(generator))
+            winner = board.find_winner()
+            if winner:
+                return winner
+            if board.is_board_full():
+                return 0
+            if player == number_of_players:
+                player = 1
+            else:
+                player += 1
+
+    def _find_reusable_root(self, board: Board,
+                            player: int) -> MCTSNode | None:
+        """
+        Find the node of the previous search tree matching the current
+        position, by following the moves made since that search.
+        :param board: the current game board.
+        :param player: the player whose move it is.
+        :returns: the matching node, detached from its parent, or None if the
+            tree cannot be reused.
+        """
+        if (not self.reuse_tree or self._root is None or
+                board is not self._root_board or
+                board.get_filled_cell_count() < self._root_move_count):
+            return None
+        # Start from the move chosen in the last search, to check that it was
+        # played and has not been undone since.
+        moves = board.get_moves_since(self._root_move_count - 1)
+        cells = board.get_board_data()
+        if (moves[0] != self._root.move or
+                cells[moves[0] // board.size][moves[0] % board.size] !=
+                self._root.player):
+            return None
+        node = self._root
+        for move in moves[1:]:
+            move_player = cells[move // board.size][move % board.size]
+            for child in node.children:
+                if child.move == move and child.player == move_player:
+                    break
+            else:
+                return None
+            node = child
+        if self._next_player(node.player) != player:
+            return None
+        node.parent = None
+        return node
+
+    def _get_shuffled_moves(self, board: Board) -> list[int]:
+        """
+        List the empty cells in random order.
+        :param board: the game board.
+        :returns: the empty cells as move numbers.
+        """
+        moves = board.get_empty_moves()
+        self.random.shuffle(moves)
+        return moves
+
+    def _next_player(self, player: int) -> int:
+        """
+        Find the player who moves after the given player.
+        :param player: a player number.
+        :returns: the next player number.
+        """
+        if player == self.number_of_players:
+            return 1
+        return player + 1
+
+    def _previous_player(self, player: int) -> int:
+        """
+        Find the player who moved before the given player.
+        :param player: a player number.
+        :returns: the previous player number.
+        """
+        if player == 1:
+            return self.number_of_players
+        return player - 1
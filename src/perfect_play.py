@@ -0,0 +1,271 @@
+"""
+A precomputed perfect-play table for 3x3 Tic-Tac-Toe. Every position
+reachable from an empty board is solved once and written to a compact binary
+file, which is opened with mmap so lookups need no parsing at load time and
+the memory is shared between processes.
+
+File format: the header TABLE_MAGIC, followed by one byte per position,
+indexed by the base-3 rank of the position's canonical form (see
+rank_cells). The high two bits of each byte hold the position's value for
+the player to move (VALUE_WIN, VALUE_DRAW or VALUE_LOSS, or 0 if the position
+is not in the table) and the low four bits hold the best move on the
+canonical board (NO_MOVE for finished games).
+
+Build a table from the project root with:
+PYTHONPATH=src python src/perfect_play.py perfect_play_3x3.bin
+Author: Emily Boegheim
+"""
+
+import mmap
+import os
+import sys
+
+from alpha_beta import AlphaBetaStrategy
+from board import Board
+from strategies import PlayerStrategy
+from symmetry import from_canonical_move, get_canonical_form
+
+TABLE_SIZE = 3
+TABLE_MAGIC = b"TTT3\x01"
+TABLE_ENTRIES = 3 ** (TABLE_SIZE * TABLE_SIZE)
+
+VALUE_WIN = 1
+VALUE_DRAW = 2
+VALUE_LOSS = 3
+NO_MOVE = 0xF
+
+
+class PerfectPlayTableException(Exception):
+    """An exception indicating that a perfect-play table file is invalid."""
+    pass
+
+
+def rank_cells(cells) -> int:
+    """
+    Calculate the base-3 rank of a position, treating each cell (0, 1 or 2)
+    as a digit with the first cell least significant.
+    :param cells: the board's cells as a flat sequence of player numbers.
+    :returns: the rank, between 0 and 3 ** len(cells) - 1.
+    """
+    rank = 0
+    for cell in reversed(cells):
+        rank = rank * 3 + cell
+    return rank
+
+
+def solve_positions() -> dict[int, tuple[int, int]]:
+    """
+    Solve every position reachable from an empty 3x3 board, with player 1
+    moving first.
+    :returns: a dictionary mapping the rank of each canonical position to a
+        tuple (value, canonical_best_move).
+    """
+    entries = {}
+    _solve(Board(TABLE_SIZE), 1, entries)
+    return entries
+
+
+def _solve(board: Board, player: int, entries: dict) -> int:
+    """
+    Solve a position and all positions reachable from it, recording them in
+    entries.
+    :param board: the game board.
+    :param player: the player whose move it is.
+    :param entries: the table entries found so far, by canonical rank.
+    :returns: the position's score for the player to move: positive for a
+        win (larger for faster wins), 0 for a draw and negative for a loss.
+    """
+    canonical_cells, symmetry = board.get_canonical_form()
+    rank = rank_cells(canonical_cells)
+    if rank in entries:
+        return entries[rank][2]
+
+    empty_cells = board.size * board.size - board.get_filled_cell_count()
+    if board.find_winner():
+        # The previous player has just won.
+        score = -1 - empty_cells
+        entries[rank] = (VALUE_LOSS, NO_MOVE, score)
+        return score
+    if board.is_board_full():
+        entries[rank] = (VALUE_DRAW, NO_MOVE, 0)
+        return 0
+
+    best_score = None
+    best_move = NO_MOVE
+    for move, cell in enumerate(canonical_cells):
+        if cell != board.empty:
+            continue
+        child = Board(TABLE_SIZE)
+        for child_move, child_cell in enumerate(canonical_cells):
+            if child_cell != board.empty:
+                child.add_player_move(child_cell, child_move)
+        child.add_player_move(player, move)
+        score = -_solve(child, 3 - player, entries)
+        if best_score is None or score > best_score:
+            best_score = score
+            best_move = move
+
+    if best_score > 0:
+        value = VALUE_WIN
+    elif best_score < 0:
+        value = VALUE_LOSS
+    else:
+        value = VALUE_DRAW
+    entries[rank] = (value, best_move, best_score)
+    return best_score
+
+
+def build_table(path: str) -> None:
+    """
+    Solve every reachable 3x3 position and write the table to a file.
+    :param path: the path of the file to write. An existing file is replaced.
+    """
+    table = bytearray(TABLE_ENTRIES)
+    for rank, (value, move, _) in solve_positions().items():
+        table[rank] = value << 6 | move
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as table_file:
+        table_file.write(TABLE_MAGIC)
+        table_file.write(table)
+    os.replace(temporary_path, path)
+
+
+class PerfectPlayTable:
+    """A read-only perfect-play table, memory-mapped from a file."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a table file.
+        :param path: the path of a file written by build_table.
+        :except PerfectPlayTableException: indicates that the file is not a
+            valid table.
+        """
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        expected_length = len(TABLE_MAGIC) + TABLE_ENTRIES
+        if (len(self._map) != expected_length or
+                self._map[:len(TABLE_MAGIC)] != TABLE_MAGIC):
+            self._map.close()
+            raise PerfectPlayTableException(f"Invalid table file: {path}")
+        self._offset = len(TABLE_MAGIC)
+
+    @classmethod
+    def open_or_build(cls, path: str) -> "PerfectPlayTable":
+        """
+        Open a table file, building it first if it does not exist.
+        :param path: the path of the table file.
+        :returns: the opened table.
+        """
+        if not os.path.exists(path):
+            build_table(path)
+        return cls(path)
+
+    def lookup(self, board: Board) -> tuple[int, int]:
+        """
+        Look up a position in the table.
+        :param board: a 3x3 game board in a position reachable with player 1
+            moving first.
+        :returns: a tuple (value, move), where value is VALUE_WIN, VALUE_DRAW
+            or VALUE_LOSS for the player to move, and move is the best move
+            on this board, or -1 if the game is over.
+        :except KeyError: indicates that the position is not in the table.
+        """
+        return self.lookup_cells(board.get_cells())
+
+    def lookup_cells(self, cells: tuple[int, ...]) -> tuple[int, int]:
+        """
+        Look up a position, given as its cells, in the table.
+        :param cells: the nine cells of a 3x3 board in move-number order.
+        :returns: a tuple (value, move), as for lookup.
+        :except KeyError: indicates that the position is not in the table.
+        """
+        canonical_cells, symmetry = get_canonical_form(cells, TABLE_SIZE)
+        entry = self._map[self._offset + rank_cells(canonical_cells)]
+        value = entry >> 6
+        if value == 0:
+            raise KeyError("Position is not in the perfect-play table")
+        move = entry & NO_MOVE
+        if move == NO_MOVE:
+            return value, -1
+        return value, from_canonical_move(move, symmetry, TABLE_SIZE)
+
+    def close(self) -> None:
+        """Close the memory map."""
+        self._map.close()
+
+    def __enter__(self) -> "PerfectPlayTable":
+        return self
+
+    def __exit__(self, *exception_details) -> None:
+        self.close()
+
+
+def _get_table_player(player_1_count: int, player_2_count: int) -> int:
+    """
+    Find whose move it is in the table, where player 1 moves first.
+    :param player_1_count: the number of cells player 1 has filled.
+    :param player_2_count: the number of cells player 2 has filled.
+    :returns: 1 or 2, or 0 if player 1 cannot have moved first.
+    """
+    if player_1_count == player_2_count:
+        return 1
+    if player_1_count == player_2_count + 1:
+        return 2
+    return 0
+
+
+class PerfectPlayStrategy(PlayerStrategy):
+    """
+    A computer player which plays perfectly on 3x3 boards using a
+    precomputed table, and uses another strategy on other boards.
+    """
+
+    def __init__(self, table: PerfectPlayTable,
+                 fallback: PlayerStrategy | None = None) -> None:
+        """
+        Initialise the strategy.
+        :param table: the perfect-play table to use on 3x3 boards.
+        :param fallback: the strategy to use when the table does not apply.
+            Defaults to an AlphaBetaStrategy.
+        """
+        self.table = table
+        self.fallback = (fallback if fallback is not None
+                         else AlphaBetaStrategy())
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Choose the best move, from the table if possible.
+        :param board: the current game board.
+        :param player: the player whose move it is.
+        :returns: the chosen move.
+        """
+        if board.size == TABLE_SIZE and board.win_length == TABLE_SIZE:
+            cells = board.get_cells()
+            player_1_count = cells.count(1)
+            player_2_count = cells.count(2)
+            if player_1_count + player_2_count == len(cells) - cells.count(0):
+                # The table has player 1 moving first. If that does not fit
+                # the player to move, player 2 may have opened instead, so
+                # swap the players' pieces to match the table.
+                if _get_table_player(player_1_count, player_2_count) != player:
+                    if _get_table_player(player_2_count,
+                                         player_1_count) != 3 - player:
+                        return self.fallback.choose_move(board, player)
+                    cells = tuple(3 - cell if cell else 0 for cell in cells)
+                try:
+                    _, move = self.table.lookup_cells(cells)
+                    return move
+                except KeyError:
+                    pass
+        return self.fallback.choose_move(board, player)
+
+    def reset(self) -> None:
+        """Reset the fallback strategy for a new game."""
+        self.fallback.reset()
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else "perfect_play_3x3.bin"
+    build_table(output_path)
+    print(f"Wrote {output_path}")
@@ -0,0 +1,320 @@
+"""
+Replay and analysis of archived Tic-Tac-Toe games. Records are read lazily
+from game record files, each game is played back through
+Board.add_player_move, and the replayed games are fed to aggregators which
+each collect one kind of statistic. Only one game is held in memory at a time.
+Record files can be analysed in a pool of worker processes, each returning
+its partial aggregates to be merged.
+Run from the project root with:
+PYTHONPATH=src python src/replay.py games.ttr [more_games.ttr ...]
+Author: Emily Boegheim
+"""
+
+import multiprocessing
+import os
+import sys
+from collections import Counter
+from typing import Iterable, Iterator
+
+from board import Board
+from game_record import GameRecord, read_records
+
+
+class ReplayException(Exception):
+    """
+    An exception indicating that a recorded game does not match its replay,
+    for example because the recorded winner is wrong or moves continue after
+    the game was won.
+    """
+    pass
+
+
+class Aggregator:
+    """
+    The interface for collecting statistics from replayed games. Partial
+    aggregates collected from different games can be merged, so aggregators
+    must only hold small, picklable values.
+    """
+
+    def add_game(self, record: GameRecord, board: Board) -> None:
+        """
+        Add a replayed game to the statistics.
+        :param record: the game's record.
+        :param board: the board after replaying the game. It is reused for
+            later games, so it must not be kept.
+        """
+        raise NotImplementedError
+
+    def merge(self, other: "Aggregator") -> None:
+        """
+        Add the statistics collected by another aggregator of the same type.
+        :param other: the aggregator to merge into this one.
+        """
+        raise NotImplementedError
+
+
+class OpeningFrequencies(Aggregator):
+    """Counts how often each sequence of opening moves was played."""
+
+    def __init__(self, depth: int = 2) -> None:
+        """
+        Initialise the aggregator with no games.
+        :param depth: the number of moves in an opening. Games with fewer
+            moves are counted under all of their moves.
+        """
+        self.depth = depth
+        self.counts = Counter()
+
+    def add_game(self, record: GameRecord, board: Board) -> None:
+        self.counts[tuple(record.moves[:self.depth])] += 1
+
+    def merge(self, other: "OpeningFrequencies") -> None:
+        self.counts.update(other.counts)
+
+    def get_most_common(self, number: int | None = None) -> list[tuple]:
+        """
+        List the most frequently played openings.
+        :param number: the number of openings to list. Defaults to all.
+        :returns: a list of (opening, count) tuples, most common first.
+        """
+        return self.counts.most_common(number)
+
+
+class WinRateByFirstMove(Aggregator):
+    """Counts the results of games by the first move played."""
+
+    def __init__(self) -> None:
+        """Initialise the aggregator with no games."""
+        # Results keyed by first move. Each value is a Counter of winners,
+        # with 0 counting ties.
+        self.results = {}
+
+    def add_game(self, record: GameRecord, board: Board) -> None:
+        if not record.moves:
+            return
+        first_move = record.moves[0]
+        if first_move not in self.results:
+            self.results[first_move] = Counter()
+        self.results[first_move][record.winner] += 1
+
+    def merge(self, other: "WinRateByFirstMove") -> None:
+        for first_move, winners in other.results.items():
+            if first_move not in self.results:
+                self.results[first_move] = Counter()
+            self.results[first_move].update(winners)
+
+    def get_win_rate(self, first_move: int, player: int = 1) -> float:
+        """
+        Calculate a player's win rate in games with the given first move.
+        :param first_move: the first move played.
+        :param player: the player whose win rate to calculate.
+        :returns: the proportion of those games the player won, or 0 if
+            there were no such games.
+        """
+        winners = self.results.get(first_move)
+        if not winners:
+            return 0.0
+        return winners[player] / sum(winners.values())
+
+
+class GameLengthHistogram(Aggregator):
+    """Counts games by the number of moves played."""
+
+    def __init__(self) -> None:
+        """Initialise the aggregator with no games."""
+        self.counts = Counter()
+
+    def add_game(self, record: GameRecord, board: Board) -> None:
+        self.counts[len(record.moves)] += 1
+
+    def merge(self, other: "GameLengthHistogram") -> None:
+        self.counts.update(other.counts)
+
+    def get_histogram(self) -> list[tuple[int, int]]:
+        """
+        List the number of games of each length.
+        :returns: a list of (length, count) tuples in order of length.
+        """
+        return sorted(self.counts.items())
+
+
+class CellHeatMap(Aggregator):
+    """
+    Counts how often each cell was played, separately for each board size.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the aggregator with no games."""
+        # Flat lists of counts indexed by move number, keyed by board size.
+        self.counts = {}
+
+    def add_game(self, record: GameRecord, board: Board) -> None:
+        counts = self.counts.get(record.size)
+        if counts is None:
+            counts = [0] * (record.size * record.size)
+            self.counts[record.size] = counts
+        for move in record.moves:
+            counts[move] += 1
+
+    def merge(self, other: "CellHeatMap") -> None:
+        for size, other_counts in other.counts.items():
+            counts = self.counts.get(size)
+            if counts is None:
+                self.counts[size] = list(other_counts)
+            else:
+                for move, count in enumerate(other_counts):
+                    counts[move] += count
+
+    def get_heat_map(self, size: int) -> list[list[int]]:
+        """
+        Build a 2D grid of the number of times each cell was played.
+        :param size: the size of the game board on each side.
+        :returns: a list of rows of counts, all 0 if no games of this size
+            were seen.
+        """
+        counts = self.counts.get(size, [0] * (size * size))
+        return [counts[row * size:(row + 1) * size]
+                for row in range(0, size)]
+
+
+# Aggregators available to analyse_files, by name. Names are used rather
+# than aggregator objects so that only small, picklable values are sent to
+# the workers.
+AGGREGATOR_FACTORIES = {
+    'openings': OpeningFrequencies,
+    'first_move_win_rate': WinRateByFirstMove,
+    'game_lengths': GameLengthHistogram,
+    'heat_map': CellHeatMap,
+}
+
+
+def replay_games(records: Iterable[GameRecord]
+                 ) -> Iterator[tuple[GameRecord, Board]]:
+    """
+    Replay each recorded game on a board, checking that the recorded result
+    matches the replay. One board is kept for each board size, win length and
+    number of players, and reset between games, so nothing is allocated per
+    game.
+    :param records: the games to replay.
+    :returns: a generator of (record, board) tuples, where the board holds
+        the final position of the game until the next game is replayed.
+    :except BoardException: indicates that a recorded move is invalid.
+    :except ReplayException: indicates that a recorded game does not match
+        its replay.
+    """
+    boards = {}
+    for record in records:
+        key = (record.size, record.win_length, record.number_of_players)
+        board = boards.get(key)
+        if board is None:
+            board = Board(record.size, record.win_length,
+                          record.number_of_players)
+            boards[key] = board
+        else:
+            board.reset()
+        player = 1
+        for move in record.moves:
+            if board.find_winner():
+                raise ReplayException("Moves recorded after the game was won")
+            board.add_player_move(player, move)
+            if player == record.number_of_players:
+                player = 1
+            else:
+                player += 1
+        if board.find_winner() != record.winner:
+            raise ReplayException(f"Recorded winner {record.winner} does not "
+                                  f"match replayed winner "
+                                  f"{board.find_winner()}")
+        yield record, board
+
+
+def analyse_records(records: Iterable[GameRecord],
+                    aggregators: list[Aggregator]) -> list[Aggregator]:
+    """
+    Replay games and add each one to the aggregators.
+    :param records: the games to replay.
+    :param aggregators: the aggregators to add the games to.
+    :returns: the aggregators.
+    """
+    for record, board in replay_games(records):
+        for aggregator in aggregators:
+            aggregator.add_game(record, board)
+    return aggregators
+
+
+def analyse_file(shard: tuple[str, tuple[str, ...]]) -> list[Aggregator]:
+    """
+    Analyse one record file. This is run in the worker processes.
+    :param shard: a tuple (path, aggregator_names) giving the file to read
+        and the names of the aggregators to use, from AGGREGATOR_FACTORIES.
+    :returns: the partial aggregates for the file, in the order named.
+    """
+    path, aggregator_names = shard
+    aggregators = [AGGREGATOR_FACTORIES[name]() for name in aggregator_names]
+    return analyse_records(read_records(path), aggregators)
+
+
+def analyse_files(paths: list[str],
+                  aggregator_names: tuple[str, ...] = tuple(
+                      AGGREGATOR_FACTORIES),
+                  workers: int | None = None) -> dict[str, Aggregator]:
+    """
+    Analyse record files, spread across a pool of worker processes with one
+    file per task. Each worker returns only its aggregates, which are merged
+    here, so memory use does not depend on the number of games.
+    :param paths: the record files to analyse.
+    :param aggregator_names: the names of the aggregators to use, from
+        AGGREGATOR_FACTORIES.
+    :param workers: the number of worker processes. Defaults to the number
+        of CPU cores, but no more than the number of files. With 1 worker the
+        files are analysed in this process.
+    :returns: a dictionary of the merged aggregators, by name.
+    :except KeyError: indicates an unknown aggregator name.
+    """
+    for name in aggregator_names:
+        if name not in AGGREGATOR_FACTORIES:
+            raise KeyError(f"Unknown aggregator: {name}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+
+    merged = [AGGREGATOR_FACTORIES[name]() for name in aggregator_names]
+    shards = [(path, tuple(aggregator_names)) for path in paths]
+    if workers == 1:
+        for partial in map(analyse_file, shards):
+            for aggregator, partial_aggregator in zip(merged, partial):
+                aggregator.merge(partial_aggregator)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for partial in pool.imap_unordered(analyse_file, shards):
+                for aggregator, partial_aggregator in zip(merged, partial):
+                    aggregator.merge(partial_aggregator)
+    return dict(zip(aggregator_names, merged))
+
+
+def main(paths: list[str]) -> None:
+    """
+    Analyse record files and print a summary of the statistics.
+    :param paths: the record files to analyse.
+    """
+    results = analyse_files(paths)
+    lengths = results['game_lengths']
+    print(f"Games: {sum(lengths.counts.values())}")
+    print("Most common openings:")
+    for opening, count in results['openings'].get_most_common(5):
+        print(f"  {' '.join(str(move) for move in opening)}: {count}")
+    print("Player 1 win rate by first move:")
+    win_rates = results['first_move_win_rate']
+    for first_move in sorted(win_rates.results):
+        print(f"  {first_move}: {win_rates.get_win_rate(first_move):.3f}")
+    print("Game lengths:")
+    for length, count in lengths.get_histogram():
+        print(f"  {length}: {count}")
+    for size in sorted(results['heat_map'].counts):
+        print(f"Cell heat map ({size}x{size}):")
+        for row in results['heat_map'].get_heat_map(size):
+            print("  " + " ".join(f"{count:>8}" for count in row))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
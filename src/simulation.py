@@ -0,0 +1,298 @@
+"""
+Headless Tic-Tac-Toe simulation. Plays many games back to back between
+computer-controlled player strategies, with no console input or output, and
+reports aggregate results and throughput.
+
+Simulator plays one game at a time with any strategies, at tens of thousands
+of random 3x3 games per second per core in CPython. For random self-play at
+a higher rate, run_random_games plays two random players in lockstep batches
+on a VectorEnvironment. With NumPy this reaches hundreds of thousands of
+games per second per core.
+Run from the project root with: PYTHONPATH=src python src/simulation.py
+Author: Emily Boegheim
+"""
+
+import random
+import time
+
+from board import Board
+from strategies import PlayerStrategy, RandomStrategy
+from vector_environment import VectorEnvironment
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HeadlessUI:
+    """
+    A UI that displays nothing, for running GameManager without a console.
+    It provides the same methods as ConsoleUI.
+    """
+
+    def __init__(self, player_map: dict) -> None:
+        """
+        Initialise the UI.
+        :param player_map: a dictionary mapping player numbers to symbols.
+            It is kept for compatibility with ConsoleUI but is not used.
+        """
+        self.player_map = player_map
+
+    def display_2d_board(self, board_data: list[list],
+                         row_separator: str = "-",
+                         column_separator: str = " | ") -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+    def get_current_player_move(self, current_player: int, minimum_move: int,
+                                maximum_move: int) -> int:
+        """
+        There is no way to ask a person for a move without a console, so
+        every player must be given a strategy.
+        :except RuntimeError: always.
+        """
+        raise RuntimeError("HeadlessUI cannot read moves; give every player "
+                           "a strategy")
+
+    def announce_winner(self, winner: int) -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+    def announce_tie(self) -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+    def show_input_not_int_error(self) -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+    def show_input_out_of_bounds_error(self) -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+    def show_position_already_filled_error(self) -> None:
+        """Do nothing, as there is no display."""
+        pass
+
+
+class SimulationResults:
+    """Aggregate results of a batch of simulated games."""
+
+    def __init__(self, number_of_players: int) -> None:
+        """
+        Initialise the results with no games played.
+        :param number_of_players: the number of players in each game.
+        """
+        self.number_of_players = number_of_players
+        self.wins = [0] * (number_of_players + 1)
+        self.ties = 0
+        self.games = 0
+        self.elapsed_seconds = 0.0
+
+    def add_counts(self, wins: list[int], ties: int, games: int) -> None:
+        """
+        Add the results of further games, for example from another process.
+        :param wins: the number of wins for each player, indexed by player
+            number (index 0 is unused).
+        :param ties: the number of tied games.
+        :param games: the total number of games.
+        """
+        for player in range(0, len(wins)):
+            self.wins[player] += wins[player]
+        self.ties += ties
+        self.games += games
+
+    def get_games_per_second(self) -> float:
+        """
+        Calculate the simulation throughput.
+        :returns: the number of games played per second, or 0 if no time was
+            recorded.
+        """
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.games / self.elapsed_seconds
+
+    def summary(self) -> str:
+        """
+        Describe the results in a human-readable form.
+        :returns: a multi-line summary of wins, ties and throughput.
+        """
+        lines = [f"Games played: {self.games}"]
+        for player in range(1, self.number_of_players + 1):
+            lines.append(f"Player {player} wins: {self.wins[player]}")
+        lines.append(f"Ties: {self.ties}")
+        lines.append(f"Games per second: {self.get_games_per_second():.0f}")
+        return "\n".join(lines)
+
+
+class Simulator:
+    """Plays games between player strategies at machine speed."""
+
+    def __init__(self, strategies: dict[int, PlayerStrategy],
+                 board: Board | None = None) -> None:
+        """
+        Initialise the simulator.
+        :param strategies: a dictionary mapping each player number (1 up to
+            the number of players) to the strategy that chooses their moves.
+        :param board: the board to play on. It is reset before each game, so
+            the same board object is reused throughout. Defaults to a 3x3
+            Board with room for just these players.
+        """
+        self.strategies = strategies
+        self.number_of_players = len(strategies)
+        self.board = (board if board is not None else
+                      Board(number_of_players=self.number_of_players))
+
+    def run(self, games: int) -> SimulationResults:
+        """
+        Play the given number of games back to back. Player 1 moves first in
+        every game.
+        :param games: the number of games to play.
+        :returns: the aggregate results of all the games.
+        :except BoardException: indicates that a strategy chose an invalid
+            move.
+        """
+        results = SimulationResults(self.number_of_players)
+        board = self.board
+        strategies = [None] + [self.strategies[player] for player in
+                               range(1, self.number_of_players + 1)]
+        wins = results.wins
+        start = time.perf_counter()
+        for _ in range(0, games):
+            board.reset()
+            for strategy in strategies[1:]:
+                strategy.reset()
+            player = 1
+            while True:
+                board.add_player_move(player,
+                                      strategies[player].choose_move(board,
+                                                                     player))
+                winner = board.find_winner()
+                if winner:
+                    wins[winner] += 1
+                    break
+                if board.is_board_full():
+                    results.ties += 1
+                    break
+                if player == self.number_of_players:
+                    player = 1
+                else:
+                    player += 1
+        results.elapsed_seconds = time.perf_counter() - start
+        results.games = games
+        return results
+
+
+def run_random_games(games: int, size: int = 3, seed: int | None = None,
+                     batch_size: int = 4096,
+                     use_numpy: bool | None = None) -> SimulationResults:
+    """
+    Play games between two random players, many at a time in lockstep on a
+    VectorEnvironment. The games are the same as a Simulator would play with
+    two RandomStrategy players, with player 1 moving first and full-line
+    wins, but the random moves come from a different sequence.
+    :param games: the number of games to play.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for the random number generator. Defaults to an
+        unpredictable seed.
+    :param batch_size: the number of games to play at once.
+    :param use_numpy: whether to use NumPy. Defaults to using NumPy if it is
+        installed.
+    :returns: the aggregate results of all the games.
+    :except ImportError: indicates that use_numpy is True but NumPy is not
+        installed.
+    """
+    batch_size = max(1, min(batch_size, games))
+    environment = VectorEnvironment(batch_size, size, use_numpy)
+    results = SimulationResults(2)
+    # Each game slot plays a fixed share of the games, so that short games
+    # are not over-represented when the last batch is cut off.
+    remaining = [games // batch_size + (1 if slot < games % batch_size else 0)
+                 for slot in range(0, batch_size)]
+    start = time.perf_counter()
+    if environment.use_numpy:
+        _run_random_games_numpy(environment, remaining, seed, results)
+    else:
+        _run_random_games_python(environment, remaining, seed, results)
+    results.elapsed_seconds = time.perf_counter() - start
+    results.games = games
+    return results
+
+
+def _run_random_games_numpy(environment: VectorEnvironment,
+                            remaining: list[int], seed: int | None,
+                            results: SimulationResults) -> None:
+    """
+    Play random games using vectorised NumPy operations.
+    :param environment: the environment to play on, using NumPy.
+    :param remaining: the number of games left to play in each slot.
+    :param seed: the seed for the random number generator.
+    :param results: the results to add each finished game to.
+    """
+    generator = numpy.random.default_rng(seed)
+    remaining = numpy.array(remaining, dtype=numpy.int64)
+    wins = numpy.zeros(3, dtype=numpy.int64)
+    shape = environment.cells.shape
+    while remaining.any():
+        # A random empty cell in each game: the highest of a random score
+        # per cell, with filled cells scored below every empty one.
+        scores = generator.random(shape)
+        scores[environment.cells != 0] = -1.0
+        _, winners, done = environment.step(scores.argmax(axis=1))
+        counted = done & (remaining > 0)
+        wins += numpy.bincount(winners[counted], minlength=3)
+        remaining -= counted
+    ties = int(wins[0])
+    results.add_counts([0, int(wins[1]), int(wins[2])], ties, 0)
+
+
+def _run_random_games_python(environment: VectorEnvironment,
+                             remaining: list[int], seed: int | None,
+                             results: SimulationResults) -> None:
+    """
+    Play random games in plain Python.
+    :param environment: the environment to play on, without NumPy.
+    :param remaining: the number of games left to play in each slot.
+    :param seed: the seed for the random number generator.
+    :param results: the results to add each finished game to.
+    """
+    generator = random.Random(seed)
+    cells = environment.cells
+    cells_per_game = environment.size * environment.size
+    wins = [0, 0, 0]
+    unfinished = sum(remaining)
+    while unfinished:
+        moves = []
+        for start in range(0, len(cells), cells_per_game):
+            moves.append(generator.choice(
+                [move for move in range(0, cells_per_game)
+                 if not cells[start + move]]))
+        _, winners, done = environment.step(moves)
+        for slot, finished in enumerate(done):
+            if finished and remaining[slot]:
+                wins[winners[slot]] += 1
+                remaining[slot] -= 1
+                unfinished -= 1
+    results.add_counts([0, wins[1], wins[2]], wins[0], 0)
+
+
+def main(games: int = 100000, size: int = 3, seed: int = 0) -> None:
+    """
+    Simulate games between two random players, one at a time and then in
+    batches, and print the results.
+    :param games: the number of games to play each way.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for the players' random number generators.
+    """
+    simulator = Simulator({1: RandomStrategy(seed),
+                           2: RandomStrategy(seed + 1)},
+                          Board(size, number_of_players=2))
+    print("One game at a time:")
+    print(simulator.run(games).summary())
+    print("\nIn batches:")
+    print(run_random_games(games, size, seed).summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,589 @@
+"""
+An exact solver for two-player Tic-Tac-Toe on boards too large for a single
+search, such as 4x4 and 5x5. The game tree is split at a shallow depth into
+independent subtrees, one for each distinct position at that depth (up to
+rotation and reflection), and each subtree is searched to the end of the game
+in a pool of worker processes. The subtree values are then combined by
+minimax over the shallow tree, giving the value of the empty board and of
+every opening move.
+
+Values are WIN, DRAW or LOSS for the player to move, without regard to how
+quickly the game ends, which lets positions reached by different move orders
+share results. Player 1 always moves first, so the player to move follows
+from the number of filled cells.
+
+Proven subtree values can be kept in a cache file, so that an interrupted run
+resumes with only the unsolved subtrees. The file is the header CACHE_MAGIC,
+then one byte each for the board size and win length, then one CACHE_RECORD
+per solved position: the base-3 rank of its canonical form (see
+perfect_play.rank_cells) and its value. Records are appended and flushed as
+each subtree is solved, and a partly written record at the end of the file
+is ignored. Ranks must fit in 64 bits, which limits boards to MAXIMUM_SIZE.
+
+Solve from the project root with:
+PYTHONPATH=src python src/solver.py SIZE [--win-length N] [--split-depth D]
+    [--cache PATH] [--workers N]
+Author: Emily Boegheim
+"""
+
+import argparse
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from typing import Callable
+
+from alpha_beta import get_static_move_order
+from board import Board
+from perfect_play import rank_cells
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+VALUE_NAMES = {WIN: "win", DRAW: "draw", LOSS: "loss"}
+
+# The largest board whose positions can be ranked in 64 bits.
+MAXIMUM_SIZE = 6
+
+CACHE_MAGIC = b"TTTC\x01"
+CACHE_RECORD = struct.Struct("<Qb")
+
+# The number of positions each worker remembers between searches before its
+# transposition table is cleared.
+DEFAULT_TABLE_ENTRIES = 1 << 21
+
+# Transposition table entries are (lower bound, upper bound) pairs. There are
+# only six possible pairs, so the same tuples are shared by every entry.
+_BOUNDS = {(lower, upper): (lower, upper)
+           for lower in (LOSS, DRAW, WIN) for upper in (LOSS, DRAW, WIN)
+           if lower <= upper}
+
+
+class SolverException(Exception):
+    """An exception indicating that a solver cache file is invalid."""
+    pass
+
+
+def get_player_to_move(board: Board) -> int:
+    """
+    Find whose turn it is, with player 1 moving first.
+    :param board: the game board.
+    :returns: 1 or 2.
+    """
+    return 1 + board.get_filled_cell_count() % 2
+
+
+def get_position_rank(board: Board) -> int:
+    """
+    Identify a position and all its symmetric variants by one number.
+    :param board: the game board.
+    :returns: the base-3 rank of the position's canonical form.
+    """
+    canonical_cells, _ = board.get_canonical_form()
+    return rank_cells(canonical_cells)
+
+
+class ExactSearcher:
+    """
+    Finds the exact value of positions with negamax and alpha-beta pruning
+    over the three values LOSS, DRAW and WIN. Results are kept in a
+    transposition table keyed by the board's Zobrist hash, which is reused
+    between searches on boards of the same size and win length.
+    """
+
+    def __init__(self, max_table_entries: int = DEFAULT_TABLE_ENTRIES) -> None:
+        """
+        Initialise the searcher with an empty transposition table.
+        :param max_table_entries: the number of positions to remember. The
+            table is cleared when a new position would take it past this
+            size, even in the middle of a search.
+        """
+        self.max_table_entries = max_table_entries
+        self.table = {}
+        self.nodes = 0
+
+    def solve(self, board: Board) -> int:
+        """
+        Find the value of a position for the player to move. The board is
+        returned to the same position afterwards.
+        :param board: the game board, which must not already be won or full.
+        :returns: WIN, DRAW or LOSS.
+        """
+        return self._negamax(board, board.get_cell_buffer(),
+                             get_static_move_order(board.size),
+                             get_player_to_move(board), LOSS, WIN)
+
+    def _negamax(self, board: Board, cells: memoryview, move_order: tuple,
+                 player: int, alpha: int, beta: int) -> int:
+        """
+        Search a position which is not won or full.
+        :param board: the game board.
+        :param cells: a live view of the board's cells.
+        :param move_order: every move, in the order to search them.
+        :param player: the player whose move it is.
+        :param alpha: the lowest value the player is still interested in.
+        :param beta: the highest value the player is still interested in.
+        :returns: the value of the position for the player to move, exact if
+            it lies strictly between alpha and beta, and otherwise a bound
+            on the side it falls.
+        """
+        self.nodes += 1
+        store = self._store
+        key = board.get_zobrist_hash()
+        entry = self.table.get(key)
+        if entry is not None:
+            lower, upper = entry
+            if lower == upper or lower >= beta:
+                return lower
+            if upper <= alpha:
+                return upper
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        else:
+            lower, upper = LOSS, WIN
+
+        add = board.add_player_move
+        undo = board.undo_move
+        find_winner = board.find_winner
+        moves = [move for move in move_order if not cells[move]]
+        # A move which wins straight away needs no further search.
+        for move in moves:
+            add(player, move)
+            won = find_winner()
+            undo()
+            if won:
+                store(key, _BOUNDS[WIN, WIN])
+                return WIN
+        # Otherwise, if the opponent threatens to win, the player must block.
+        # Two threats cannot both be blocked.
+        opponent = 3 - player
+        threats = []
+        for move in moves:
+            add(opponent, move)
+            won = find_winner()
+            undo()
+            if won:
+                threats.append(move)
+        if len(threats) > 1:
+            store(key, _BOUNDS[LOSS, LOSS])
+            return LOSS
+        if threats:
+            moves = threats
+
+        original_alpha = alpha
+        best_value = LOSS
+        for move in moves:
+            add(player, move)
+            if board.is_board_full():
+                value = DRAW
+            else:
+                value = -self._negamax(board, cells, move_order, opponent,
+                                       -beta, -alpha)
+            undo()
+            if value > best_value:
+                best_value = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best_value <= original_alpha:
+            upper = min(upper, best_value)
+        elif best_value >= beta:
+            lower = max(lower, best_value)
+        else:
+            lower = upper = best_value
+        store(key, _BOUNDS[lower, upper])
+        return best_value
+
+    def _store(self, key: int, bounds: tuple[int, int]) -> None:
+        """
+        Record the bounds on a position's value, clearing the table first if
+        it is full. Clearing everything is cheaper than evicting entries one
+        at a time, and the positions near the root are soon found again.
+        :param key: the position's Zobrist hash.
+        :param bounds: the (lower, upper) bounds, from _BOUNDS.
+        """
+        table = self.table
+        if len(table) >= self.max_table_entries and key not in table:
+            table.clear()
+        table[key] = bounds
+
+
+class SolverCache:
+    """
+    Proven position values for one board size and win length, loaded from
+    and appended to a cache file.
+    """
+
+    def __init__(self, path: str | None, size: int, win_length: int) -> None:
+        """
+        Open a cache file, loading any values already in it. The file is
+        created if it does not exist.
+        :param path: the path of the cache file, or None to keep values in
+            memory only.
+        :param size: the size of the game board on each side.
+        :param win_length: the number of pieces in a row needed to win.
+        :except SolverException: indicates that the file is not a cache, or
+            is a cache for a different board.
+        """
+        self.values = {}
+        self._file = None
+        if path is None:
+            return
+        header = CACHE_MAGIC + bytes([size, win_length])
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as cache_file:
+                cache_file.write(header)
+        with open(path, "rb") as cache_file:
+            data = cache_file.read()
+        if data[:len(header)] != header:
+            raise SolverException(f"Not a cache for a {size}x{size} board "
+                                  f"with win length {win_length}: {path}")
+        # Ignore a record left partly written by an interrupted run.
+        end = len(data) - (len(data) - len(header)) % CACHE_RECORD.size
+        for rank, value in CACHE_RECORD.iter_unpack(data[len(header):end]):
+            self.values[rank] = value
+        self._file = open(path, "r+b")
+        self._file.seek(end)
+        self._file.truncate()
+
+    def get(self, rank: int) -> int | None:
+        """
+        Look up a position's value.
+        :param rank: the position's rank, from get_position_rank.
+        :returns: the value for the player to move, or None if unknown.
+        """
+        return self.values.get(rank)
+
+    def add(self, rank: int, value: int) -> None:
+        """
+        Record a position's value, writing it to the file straight away.
+        :param rank: the position's rank, from get_position_rank.
+        :param value: the value for the player to move.
+        """
+        self.values[rank] = value
+        if self._file is not None:
+            self._file.write(CACHE_RECORD.pack(rank, value))
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the cache file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "SolverCache":
+        return self
+
+    def __exit__(self, *exception_details) -> None:
+        self.close()
+
+
+class SolverProgress:
+    """How far a solve has got, as passed to the progress callback."""
+
+    def __init__(self, subtrees_total: int, subtrees_cached: int) -> None:
+        """
+        Initialise the progress at the start of a solve.
+        :param subtrees_total: the number of distinct subtrees.
+        :param subtrees_cached: the number of subtrees already in the cache.
+        """
+        self.subtrees_total = subtrees_total
+        self.subtrees_cached = subtrees_cached
+        self.subtrees_done = subtrees_cached
+        self.nodes = 0
+        self.elapsed_seconds = 0.0
+
+    def get_nodes_per_second(self) -> float:
+        """
+        Calculate the search speed so far, across all workers.
+        :returns: the number of nodes searched per second of wall time, or 0
+            if no time has been recorded.
+        """
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.nodes / self.elapsed_seconds
+
+    def get_eta_seconds(self) -> float | None:
+        """
+        Estimate the time left, assuming the remaining subtrees take as long
+        on average as those searched so far in this run.
+        :returns: the estimate in seconds, or None before any subtree has
+            been searched.
+        """
+        searched = self.subtrees_done - self.subtrees_cached
+        if searched == 0:
+            return None
+        remaining = self.subtrees_total - self.subtrees_done
+        return self.elapsed_seconds / searched * remaining
+
+    def summary(self) -> str:
+        """
+        Describe the progress in one line.
+        :returns: the description.
+        """
+        eta_seconds = self.get_eta_seconds()
+        eta = "unknown" if eta_seconds is None else f"{eta_seconds:.0f}s"
+        return (f"Subtrees: {self.subtrees_done}/{self.subtrees_total} "
+                f"({self.subtrees_cached} cached), nodes: {self.nodes}, "
+                f"nodes/s: {self.get_nodes_per_second():.0f}, "
+                f"elapsed: {self.elapsed_seconds:.0f}s, ETA: {eta}")
+
+
+class SolverResult:
+    """The value of the empty board and of each opening move."""
+
+    def __init__(self, size: int, win_length: int, value: int,
+                 move_values: dict[int, int],
+                 progress: SolverProgress) -> None:
+        """
+        Initialise the result.
+        :param size: the size of the game board on each side.
+        :param win_length: the number of pieces in a row needed to win.
+        :param value: the value of the empty board for player 1.
+        :param move_values: the value of each opening move for player 1.
+        :param progress: the final progress of the solve.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.value = value
+        self.move_values = move_values
+        self.progress = progress
+
+    def get_best_moves(self) -> list[int]:
+        """
+        List the opening moves which achieve the board's value.
+        :returns: the best moves, in ascending order.
+        """
+        return sorted(move for move, value in self.move_values.items()
+                      if value == self.value)
+
+    def summary(self) -> str:
+        """
+        Describe the result in a few lines.
+        :returns: the description.
+        """
+        return (f"{self.size}x{self.size} board, win length "
+                f"{self.win_length}: {VALUE_NAMES[self.value]} for player 1\n"
+                f"Best opening moves: {self.get_best_moves()}\n"
+                f"{self.progress.summary()}")
+
+
+def find_subtrees(size: int, win_length: int,
+                  split_depth: int) -> dict[int, tuple[int, ...]]:
+    """
+    Find the distinct unfinished positions after split_depth moves.
+    :param size: the size of the game board on each side.
+    :param win_length: the number of pieces in a row needed to win.
+    :param split_depth: the number of moves before the split.
+    :returns: a dictionary mapping each position's rank to the moves which
+        reach it.
+    """
+    subtrees = {}
+    visited = set()
+    board = Board(size, win_length, 2)
+
+    def visit(moves: list[int]) -> None:
+        rank = get_position_rank(board)
+        if rank in visited:
+            return
+        visited.add(rank)
+        player = get_player_to_move(board)
+        for move in board.get_empty_moves():
+            board.add_player_move(player, move)
+            moves.append(move)
+            if not board.find_winner() and not board.is_board_full():
+                if len(moves) == split_depth:
+                    subtrees.setdefault(get_position_rank(board),
+                                        tuple(moves))
+                else:
+                    visit(moves)
+            moves.pop()
+            board.undo_move()
+
+    visit([])
+    return subtrees
+
+
+# The searcher for each worker process, kept between subtrees so that its
+# transposition table is shared by all the subtrees the worker searches.
+_worker_searchers = {}
+
+
+def solve_subtree(task: tuple) -> tuple[int, int, int]:
+    """
+    Search one subtree to the end of the game. This is run in the worker
+    processes.
+    :param task: a tuple (size, win_length, moves, rank, max_table_entries)
+        giving the board, the moves from the empty board to the subtree's
+        root and the root's rank.
+    :returns: a tuple (rank, value, nodes) with the root's value for the
+        player to move and the number of nodes searched.
+    """
+    size, win_length, moves, rank, max_table_entries = task
+    searcher = _worker_searchers.get((size, win_length))
+    if searcher is None:
+        # Zobrist hashes do not include the win length, so each board keeps
+        # a table of its own.
+        searcher = ExactSearcher(max_table_entries)
+        _worker_searchers[size, win_length] = searcher
+    board = Board(size, win_length, 2)
+    player = 1
+    for move in moves:
+        board.add_player_move(player, move)
+        player = 3 - player
+    nodes_before = searcher.nodes
+    value = searcher.solve(board)
+    return rank, value, searcher.nodes - nodes_before
+
+
+def combine_values(size: int, win_length: int, split_depth: int,
+                   cache: SolverCache) -> tuple[int, dict[int, int]]:
+    """
+    Find the values of the empty board and each opening move by minimax
+    over the positions before the split, using the subtree values.
+    :param size: the size of the game board on each side.
+    :param win_length: the number of pieces in a row needed to win.
+    :param split_depth: the number of moves before the split.
+    :param cache: the values of every subtree.
+    :returns: a tuple (value, move_values) for player 1.
+    """
+    board = Board(size, win_length, 2)
+    values = {}
+
+    def get_move_value(player: int, move: int, depth: int) -> int:
+        board.add_player_move(player, move)
+        if board.find_winner():
+            value = WIN
+        elif board.is_board_full():
+            value = DRAW
+        elif depth + 1 == split_depth:
+            value = -cache.get(get_position_rank(board))
+        else:
+            value = -get_value(3 - player, depth + 1)
+        board.undo_move()
+        return value
+
+    def get_value(player: int, depth: int) -> int:
+        rank = get_position_rank(board)
+        if rank not in values:
+            values[rank] = max(get_move_value(player, move, depth)
+                               for move in board.get_empty_moves())
+        return values[rank]
+
+    move_values = {move: get_move_value(1, move, 0)
+                   for move in board.get_empty_moves()}
+    return max(move_values.values()), move_values
+
+
+def solve(size: int = 4, win_length: int | None = None,
+          split_depth: int = 2, workers: int | None = None,
+          cache_path: str | None = None,
+          progress: Callable[[SolverProgress], None] | None = None,
+          max_table_entries: int = DEFAULT_TABLE_ENTRIES) -> SolverResult:
+    """
+    Solve a board exactly, searching subtrees in a pool of worker processes.
+    :param size: the size of the game board on each side.
+    :param win_length: the number of pieces in a row needed to win. Defaults
+        to the board size.
+    :param split_depth: the number of moves before the tree is split into
+        subtrees. Deeper splits give more, smaller subtrees, which balance
+        better between workers and lose less work when interrupted, but
+        prune less between subtrees.
+    :param workers: the number of worker processes. Defaults to the number
+        of CPU cores. With 1 worker the subtrees are searched in this
+        process.
+    :param cache_path: the cache file to load proven values from and add new
+        ones to. Defaults to no cache file.
+    :param progress: a function to call with the progress after each subtree
+        is searched, and once before the first.
+    :param max_table_entries: the size of each worker's transposition table.
+    :returns: the result.
+    :except ValueError: indicates that the board is larger than MAXIMUM_SIZE
+        or split_depth is less than 1.
+    :except SolverException: indicates that the cache file is invalid.
+    """
+    if size > MAXIMUM_SIZE:
+        raise ValueError(f"size must be at most {MAXIMUM_SIZE}")
+    if split_depth < 1:
+        raise ValueError("split_depth must be at least 1")
+    if win_length is None:
+        win_length = size
+    split_depth = min(split_depth, size * size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    subtrees = find_subtrees(size, win_length, split_depth)
+    with SolverCache(cache_path, size, win_length) as cache:
+        tasks = [(size, win_length, moves, rank, max_table_entries)
+                 for rank, moves in subtrees.items()
+                 if cache.get(rank) is None]
+        solve_progress = SolverProgress(len(subtrees),
+                                        len(subtrees) - len(tasks))
+
+        def record(subtree_result: tuple[int, int, int]) -> None:
+            rank, value, nodes = subtree_result
+            cache.add(rank, value)
+            solve_progress.subtrees_done += 1
+            solve_progress.nodes += nodes
+            solve_progress.elapsed_seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(solve_progress)
+
+        solve_progress.elapsed_seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(solve_progress)
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                record(solve_subtree(task))
+        else:
+            with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+                for subtree_result in pool.imap_unordered(solve_subtree,
+                                                          tasks):
+                    record(subtree_result)
+        value, move_values = combine_values(size, win_length, split_depth,
+                                            cache)
+    solve_progress.elapsed_seconds = time.perf_counter() - start
+    return SolverResult(size, win_length, value, move_values, solve_progress)
+
+
+def main(arguments: list[str]) -> int:
+    """
+    Solve a board and print the result, reporting progress as it goes.
+    :param arguments: the command line arguments.
+    :returns: the exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("size", type=int, help="the board size")
+    parser.add_argument("--win-length", type=int,
+                        help="the pieces in a row needed to win")
+    parser.add_argument("--split-depth", type=int, default=2,
+                        help="the number of moves before the split")
+    parser.add_argument("--cache", help="the cache file to resume from")
+    parser.add_argument("--workers", type=int,
+                        help="the number of worker processes")
+    parser.add_argument("--interval", type=float, default=10.0,
+                        help="the seconds between progress reports")
+    options = parser.parse_args(arguments)
+
+    last_report = 0.0
+
+    def report(solve_progress: SolverProgress) -> None:
+        nonlocal last_report
+        if (solve_progress.elapsed_seconds - last_report >= options.interval
+                or solve_progress.subtrees_done ==
+                solve_progress.subtrees_total):
+            last_report = solve_progress.elapsed_seconds
+            print(solve_progress.summary(), file=sys.stderr)
+
+    result = solve(options.size, options.win_length, options.split_depth,
+                   options.workers, options.cache, report)
+    print(result.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
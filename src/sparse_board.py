@@ -0,0 +1,372 @@
+"""
+Provides a sparse Tic-Tac-Toe game board for very large grids. Only the
+occupied cells are stored, so memory grows with the number of moves played
+rather than the area of the board.
+Author: Emily Boegheim
+"""
+
+import random
+
+from board import MoveOutOfBoundsException, PositionAlreadyFilledException
+from board import NoMoveToUndoException
+
+
+class SparseRowView:
+    """A read-only, lazily evaluated view of one row of a SparseBoard."""
+
+    def __init__(self, board: "SparseBoard", row: int) -> None:
+        """
+        Initialise the view.
+        :param board: the board to view.
+        :param row: the row number.
+        """
+        self._board = board
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __getitem__(self, column: int) -> int:
+        if column < 0 or column >= self._board.size:
+            raise IndexError("column out of range")
+        return self._board.get_cell(self._row, column)
+
+    def __iter__(self):
+        for column in range(0, self._board.size):
+            yield self._board.get_cell(self._row, column)
+
+
+class SparseBoardView:
+    """
+    A read-only, lazily evaluated view of a SparseBoard's cells, indexed
+    like the list of lists returned by Board.get_board_data. Rows are only
+    created as they are accessed.
+    """
+
+    def __init__(self, board: "SparseBoard") -> None:
+        """
+        Initialise the view.
+        :param board: the board to view.
+        """
+        self._board = board
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __getitem__(self, row: int) -> SparseRowView:
+        if row < 0 or row >= self._board.size:
+            raise IndexError("row out of range")
+        return SparseRowView(self._board, row)
+
+    def __iter__(self):
+        for row in range(0, self._board.size):
+            yield SparseRowView(self._board, row)
+
+    def get_occupied_bounds(self) -> tuple[int, int, int, int] | None:
+        """
+        Find the smallest rectangle containing every occupied cell, as
+        SparseBoard.get_occupied_bounds.
+        :returns: a tuple (top, left, bottom, right) of inclusive bounds, or
+            None if the board is empty.
+        """
+        return self._board.get_occupied_bounds()
+
+    def get_window(self, top: int, left: int, height: int,
+                   width: int) -> list[list]:
+        """
+        Build a 2D data structure for part of the board, as
+        SparseBoard.get_board_window.
+        :param top: the first row of the window.
+        :param left: the first column of the window.
+        :param height: the number of rows in the window.
+        :param width: the number of columns in the window.
+        :returns: a list of rows, each a list of player numbers.
+        """
+        return self._board.get_board_window(top, left, height, width)
+
+
+class SparseBoard:
+    """
+    A Tic-Tac-Toe game board which stores only its occupied cells. This
+    provides the same public interface as Board, so it can be used in its
+    place on boards too large to allocate in full.
+    """
+
+    def __init__(self, size: int = 3, win_length: int | None = None) -> None:
+        """
+        Initialise the game board with the given size (defaults to 3).
+        :param size: The size of the game board on each side (the board is
+            always square)
+        :param win_length: The number of pieces in a row needed to win.
+            Defaults to the size of the board.
+        :except ValueError: indicates that win_length is less than 1 or
+            greater than the size of the board.
+        """
+        if win_length is None:
+            win_length = size
+        if win_length < 1 or win_length > size:
+            raise ValueError("win_length must be between 1 and the board size")
+        self.size = size
+        self.win_length = win_length
+        self.empty = 0
+        self._minimum_move = 0
+        self._maximum_move = self.size*self.size - 1
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the board so that a new game can be played."""
+        # Occupied cells, keyed by move number.
+        self._cells = {}
+        self._move_stack = []
+        # For full-line wins, the number of pieces each player has in each
+        # line, keyed by (line, player) and numbered as in Board. Only lines
+        # with pieces in them have entries.
+        self._line_player_counts = {}
+        self._completed_lines = []
+        self._winner = 0
+
+    def get_cell(self, row: int, column: int) -> int:
+        """
+        Return the contents of a cell.
+        :param row: the row number of the cell.
+        :param column: the column number of the cell.
+        :returns: the player in the cell, or the empty value.
+        """
+        return self._cells.get(row * self.size + column, self.empty)
+
+    def get_board_data(self) -> SparseBoardView:
+        """
+        Return a lazy view of the board state, which can be indexed like a
+        list of lists without creating the whole grid.
+        :returns: a view of the board's cells.
+        """
+        return SparseBoardView(self)
+
+    def get_board_window(self, top: int, left: int, height: int,
+                         width: int) -> list[list]:
+        """
+        Build a 2D data structure for part of the board, for display. Cells
+        outside the board are left out.
+        :param top: the first row of the window.
+        :param left: the first column of the window.
+        :param height: the number of rows in the window.
+        :param width: the number of columns in the window.
+        :returns: a list of rows, each a list of player numbers.
+        """
+        rows = range(max(top, 0), min(top + height, self.size))
+        columns = range(max(left, 0), min(left + width, self.size))
+        return [[self.get_cell(row, column) for column in columns]
+                for row in rows]
+
+    def get_occupied_bounds(self) -> tuple[int, int, int, int] | None:
+        """
+        Find the smallest rectangle containing every occupied cell.
+        :returns: a tuple (top, left, bottom, right) of inclusive bounds, or
+            None if the board is empty.
+        """
+        if not self._cells:
+            return None
+        rows = [move // self.size for move in self._cells]
+        columns = [move % self.size for move in self._cells]
+        return min(rows), min(columns), max(rows), max(columns)
+
+    def add_player_move(self, player: int, move: int) -> bool:
+        """
+        Add the given player's chosen move to the board.
+        :param player: the player making their move, represented as an integer.
+        :param move: the player's chosen move, represented as an integer
+            between 0 and the number of cells on the board minus 1.
+        :returns: True if the move was successful.
+        :except MoveOutOfBoundsException: indicates that the player's move is
+            outside the bounds of the game board.
+        :except PositionAlreadyFilledException: indicates that the player's
+            move is invalid as the space is already filled.
+        """
+        if move < self._minimum_move or move > self._maximum_move:
+            raise MoveOutOfBoundsException
+        return self.add_move_by_coordinates(player, move // self.size,
+                                            move % self.size)
+
+    def add_move_by_coordinates(self, player: int, row: int,
+                                column: int) -> bool:
+        """
+        Add the given player's chosen move to the board, using coordinates
+        to identify the move on the board.
+        :param player: the player making their move, represented as an integer.
+        :param row: the row number of the player's chosen move.
+        :param column: the column number of the player's chosen move.
+        :returns: True if the move was successful.
+        :except MoveOutOfBoundsException: indicates that the player's move is
+            outside the bounds of the game board.
+        :except PositionAlreadyFilledException: indicates that the player's
+            move is invalid as the space is already filled.
+        """
+        if row < 0 or column < 0:
+            raise MoveOutOfBoundsException
+        if row >= self.size or column >= self.size:
+            raise MoveOutOfBoundsException
+        move = row * self.size + column
+        if move in self._cells:
+            raise PositionAlreadyFilledException
+
+        self._cells[move] = player
+        self._move_stack.append(move)
+        if self.win_length < self.size:
+            self._check_runs_through_cell(player, row, column)
+        else:
+            counts = self._line_player_counts
+            for line in self._get_lines_through_cell(row, column):
+                key = (line, player)
+                counts[key] = counts.get(key, 0) + 1
+                if counts[key] == self.size:
+                    self._completed_lines.append(key)
+                    self._winner = min(self._completed_lines)[1]
+        return True
+
+    def undo_move(self) -> int:
+        """
+        Undo the most recent move.
+        :returns: the move that was undone.
+        :except NoMoveToUndoException: indicates that no moves have been made.
+        """
+        if not self._move_stack:
+            raise NoMoveToUndoException
+        move = self._move_stack.pop()
+        player = self._cells.pop(move)
+        completed_lines = self._completed_lines
+        if self.win_length < self.size:
+            if (completed_lines and
+                    completed_lines[-1][0] == len(self._cells) + 1):
+                completed_lines.pop()
+        else:
+            counts = self._line_player_counts
+            for line in self._get_lines_through_cell(move // self.size,
+                                                     move % self.size):
+                key = (line, player)
+                if counts[key] == self.size:
+                    completed_lines.remove(key)
+                if counts[key] == 1:
+                    del counts[key]
+                else:
+                    counts[key] -= 1
+        self._winner = min(completed_lines)[1] if completed_lines else 0
+        return move
+
+    def _get_lines_through_cell(self, row: int, column: int) -> tuple:
+        """
+        List the full-length lines passing through a cell.
+        :param row: the row number of the cell.
+        :param column: the column number of the cell.
+        :returns: a tuple of line numbers, numbered as in Board.
+        """
+        size = self.size
+        lines = (row, size + column)
+        if row == column:
+            lines += (2 * size,)
+        if row + column == size - 1:
+            lines += (2 * size + 1,)
+        return lines
+
+    def _check_runs_through_cell(self, player: int, row: int,
+                                 column: int) -> None:
+        """
+        Check whether the move at the given cell completes a run of
+        win_length pieces in any direction.
+        :param player: the player who made the move.
+        :param row: the row number of the move.
+        :param column: the column number of the move.
+        """
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            run_length = (1 +
+                          self._count_run(player, row, column,
+                                          row_step, column_step) +
+                          self._count_run(player, row, column,
+                                          -row_step, -column_step))
+            if run_length >= self.win_length:
+                self._completed_lines.append((len(self._cells), player))
+                self._winner = min(self._completed_lines)[1]
+                return
+
+    def _count_run(self, player: int, row: int, column: int, row_step: int,
+                   column_step: int) -> int:
+        """
+        Count the player's pieces in a line leading away from the given cell.
+        :param player: the player whose pieces to count.
+        :param row: the row number of the starting cell (not counted).
+        :param column: the column number of the starting cell (not counted).
+        :param row_step: the change in row number for each step.
+        :param column_step: the change in column number for each step.
+        :returns: the number of consecutive pieces found.
+        """
+        count = 0
+        row += row_step
+        column += column_step
+        while (count < self.win_length - 1 and 0 <= row < self.size and
+               0 <= column < self.size and
+               self._cells.get(row * self.size + column) == player):
+            count += 1
+            row += row_step
+            column += column_step
+        return count
+
+    def find_winner(self) -> int:
+        """
+        Check for all possible win conditions.
+        :returns: the number of the winning player as an integer, or 0 if there
+            is no winner.
+        """
+        return self._winner
+
+    def is_board_full(self) -> bool:
+        """
+        Check whether the board is full (so that no more moves can be made).
+        :returns: True if the board is full, False if not.
+        """
+        return len(self._cells) == self.size * self.size
+
+    def get_filled_cell_count(self) -> int:
+        """
+        Return the number of cells that have been filled.
+        :returns: the number of moves made on the board.
+        """
+        return len(self._cells)
+
+    def get_empty_move_count(self) -> int:
+        """
+        Return the number of empty cells.
+        :returns: the number of moves still available.
+        """
+        return self.size * self.size - len(self._cells)
+
+    def get_random_empty_move(self, generator: random.Random) -> int:
+        """
+        Choose an empty cell uniformly at random. Cells are drawn until an
+        empty one is found, which takes constant expected time while at most
+        half the board is filled. Fuller boards are scanned instead.
+        :param generator: the random number generator to use.
+        :returns: a random available move.
+        :except IndexError: indicates that the board is full.
+        """
+        number_of_cells = self.size * self.size
+        if len(self._cells) * 2 <= number_of_cells:
+            while True:
+                move = int(generator.random() * number_of_cells)
+                if move not in self._cells:
+                    return move
+        empty_moves = [move for move in range(0, number_of_cells)
+                       if move not in self._cells]
+        return empty_moves[int(generator.random() * len(empty_moves))]
+
+    def get_maximum_move(self) -> int:
+        """
+        Returns the highest move allowable on this board.
+        :returns: The maximum move allowable on the board.
+        """
+        return self._maximum_move
+
+    def get_minimum_move(self) -> int:
+        """
+        Return the lowest-numbered move allowable on this board.
+        :returns: the minimum move allowable on this board.
+        """
+        return self._minimum_move
@@ -0,0 +1,83 @@
+"""
+Player strategies for computer-controlled Tic-Tac-Toe players. A strategy
+chooses a move for a player given the current board, and can be used by
+GameManager in place of prompting through the UI.
+Author: Emily Boegheim
+"""
+
+import random
+
+from board import Board
+
+
+class PlayerStrategy:
+    """
+    Base class for player strategies. Subclasses must override choose_move.
+    """
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Choose the next move for the given player.
+        :param board: the current game board. Strategies must not change it.
+        :param player: the player whose move it is, represented as an integer.
+        :returns: the chosen move, as an integer between the board's minimum
+            and maximum moves.
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """
+        Prepare the strategy for a new game. By default there is nothing to
+        reset.
+        """
+        pass
+
+
+class RandomStrategy(PlayerStrategy):
+    """A strategy that chooses uniformly at random from the empty cells."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        Initialise the strategy with its own random number generator.
+        :param seed: the seed for the random number generator, to make games
+            reproducible. Defaults to an unpredictable seed.
+        """
+        self.random = random.Random(seed)
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Choose a random empty cell.
+        :param board: the current game board.
+        :param player: the player whose move it is, represented as an integer.
+        :returns: the chosen move.
+        """
+        return board.get_random_empty_move(self.random)
+
+
+class ScriptedStrategy(PlayerStrategy):
+    """A strategy that plays a fixed sequence of moves."""
+
+    def __init__(self, moves: list[int]) -> None:
+        """
+        Initialise the strategy with the moves to play.
+        :param moves: the moves to play, in order. The same sequence is
+            replayed from the start in each new game.
+        """
+        self.moves = moves
+        self._next_move_index = 0
+
+    def choose_move(self, board: Board, player: int) -> int:
+        """
+        Return the next move in the script.
+        :param board: the current game board.
+        :param player: the player whose move it is, represented as an integer.
+        :returns: the next scripted move.
+        :except IndexError: indicates that the script has run out of moves.
+        """
+        move = self.moves[self._next_move_index]
+        self._next_move_index += 1
+        return move
+
+    def reset(self) -> None:
+        """Start the script again from the first move."""
+        self._next_move_index = 0
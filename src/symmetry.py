@@ -0,0 +1,136 @@
+"""
+Symmetry reduction for square Tic-Tac-Toe boards. A square board has eight
+symmetries (four rotations, each with or without a reflection), so up to
+eight positions are really the same position. This module maps positions to
+a single canonical form, using a permutation table precomputed once per
+board size.
+Author: Emily Boegheim
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+
+# The number of symmetries of a square.
+NUMBER_OF_SYMMETRIES = 8
+
+
+@lru_cache(maxsize=None)
+def get_symmetry_permutations(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Calculate the cell permutation for each symmetry of a board of the given
+    size. Applying permutation p to a flat list of cells gives the
+    transformed cells [cells[p[0]], cells[p[1]], ...]. The first permutation
+    is the identity.
+    :param size: the size of the game board on each side.
+    :returns: a tuple of NUMBER_OF_SYMMETRIES permutations, each a tuple of
+        move numbers.
+    """
+    last = size - 1
+    transforms = (
+        lambda row, column: (row, column),
+        lambda row, column: (last - column, row),
+        lambda row, column: (last - row, last - column),
+        lambda row, column: (column, last - row),
+        lambda row, column: (row, last - column),
+        lambda row, column: (last - row, column),
+        lambda row, column: (column, row),
+        lambda row, column: (last - column, last - row),
+    )
+    permutations = []
+    for transform in transforms:
+        permutation = []
+        for move in range(0, size * size):
+            source_row, source_column = transform(move // size, move % size)
+            permutation.append(source_row * size + source_column)
+        permutations.append(tuple(permutation))
+    return tuple(permutations)
+
+
+@lru_cache(maxsize=None)
+def get_inverse_permutations(size: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Calculate the inverse of each symmetry permutation, for mapping moves
+    from the original board into a transformed one.
+    :param size: the size of the game board on each side.
+    :returns: a tuple of permutations, where inverse[s][move] is the
+        position of the original cell move after applying symmetry s.
+    """
+    inverses = []
+    for permutation in get_symmetry_permutations(size):
+        inverse = [0] * len(permutation)
+        for transformed_move, original_move in enumerate(permutation):
+            inverse[original_move] = transformed_move
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+@lru_cache(maxsize=None)
+def _get_permutation_getters(size: int) -> tuple:
+    """
+    Build a fast function for applying each symmetry permutation to a flat
+    sequence of cells.
+    :param size: the size of the game board on each side.
+    :returns: a tuple of functions, each returning the transformed cells as a
+        tuple.
+    """
+    if size == 1:
+        return (tuple,) * NUMBER_OF_SYMMETRIES
+    return tuple(itemgetter(*permutation)
+                 for permutation in get_symmetry_permutations(size))
+
+
+def get_canonical_form(cells, size: int) -> tuple[tuple, int]:
+    """
+    Find the canonical form of a position: the smallest of its eight
+    symmetric variants.
+    :param cells: the board's cells as a flat sequence of player numbers, in
+        move-number order.
+    :param size: the size of the game board on each side.
+    :returns: a tuple (canonical_cells, symmetry), where canonical_cells is a
+        tuple of player numbers and symmetry is the index of the permutation
+        that produced it.
+    """
+    best_cells = None
+    best_symmetry = 0
+    for symmetry, getter in enumerate(_get_permutation_getters(size)):
+        transformed = getter(cells)
+        if best_cells is None or transformed < best_cells:
+            best_cells = transformed
+            best_symmetry = symmetry
+    return best_cells, best_symmetry
+
+
+def get_canonical_hash(cells, size: int) -> int:
+    """
+    Calculate a hash of a position that is the same for all its symmetric
+    variants. The hash is stable between processes and runs, and distinct
+    positions always have distinct hashes.
+    :param cells: the board's cells as a flat sequence of player numbers
+        between 0 and 255, in move-number order.
+    :param size: the size of the game board on each side.
+    :returns: the hash as a non-negative integer.
+    """
+    canonical_cells, _ = get_canonical_form(cells, size)
+    return int.from_bytes(bytes(canonical_cells), "big")
+
+
+def to_canonical_move(move: int, symmetry: int, size: int) -> int:
+    """
+    Map a move on the original board to the same cell on the canonical board.
+    :param move: the move number on the original board.
+    :param symmetry: the symmetry returned by get_canonical_form.
+    :param size: the size of the game board on each side.
+    :returns: the move number on the canonical board.
+    """
+    return get_inverse_permutations(size)[symmetry][move]
+
+
+def from_canonical_move(move: int, symmetry: int, size: int) -> int:
+    """
+    Map a move on the canonical board back to the original board.
+    :param move: the move number on the canonical board.
+    :param symmetry: the symmetry returned by get_canonical_form.
+    :param size: the size of the game board on each side.
+    :returns: the move number on the original board.
+    """
+    return get_symmetry_permutations(size)[symmetry][move]
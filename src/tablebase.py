@@ -0,0 +1,383 @@
+"""
+A retrograde-analysis tablebase for two-player Tic-Tac-Toe, giving the value
+of every position on a board for the player to move. It is meant for 4x4
+boards, where the table covers all 3 ** 16 = 43,046,721 cell contents in
+10.8 MB. Smaller boards work too, for testing.
+
+Positions are indexed by the base-3 rank of their cells (see
+perfect_play.rank_cells), so no hash table is needed. Adding a piece always
+raises the rank, so every position reachable from another has a higher rank.
+The table is therefore built from the highest rank down, in chunks, so that
+each position's successors are solved before it. Values flow back from the
+terminal positions to the empty board, and only one chunk is held in memory
+at a time. The successors are read back from the memory-mapped file as it is
+written.
+
+File format: the header TABLEBASE_MAGIC, one byte for the board size, then
+the values packed four to a byte: position n is in bits 2 * (n % 4) and up
+of byte n // 4. Each value is VALUE_WIN, VALUE_DRAW or VALUE_LOSS (as in
+perfect_play) for the player to move, or VALUE_INVALID for cells which
+cannot arise with player 1 moving first. Player 1 is to move when both
+players have the same number of pieces, and player 2 when player 1 has one
+more. Games are won by filling a whole row, column or long diagonal.
+
+Build the 4x4 table from the project root with:
+PYTHONPATH=src python src/tablebase.py tablebase_4x4.bin
+Author: Emily Boegheim
+"""
+
+import mmap
+import os
+import sys
+
+from bitboard import get_win_masks
+from board import Board
+from perfect_play import VALUE_DRAW, VALUE_LOSS, VALUE_WIN
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The largest board with a tablebase. A 5x5 table would take 212 GB.
+MAXIMUM_SIZE = 4
+
+TABLEBASE_MAGIC = b"TTTB\x01"
+HEADER_LENGTH = len(TABLEBASE_MAGIC) + 1
+VALUE_INVALID = 0
+
+# The number of positions solved at once while building. This must be a
+# multiple of 4, so that each chunk fills whole bytes.
+DEFAULT_CHUNK_POSITIONS = 1 << 16
+
+
+class TablebaseException(Exception):
+    """An exception indicating that a tablebase file is invalid."""
+    pass
+
+
+def get_table_length(size: int) -> int:
+    """
+    Calculate the number of bytes of values in a table.
+    :param size: the size of the game board on each side.
+    :returns: the length of the table after the header.
+    """
+    return (3 ** (size * size) + 3) // 4
+
+
+def build_tablebase(path: str, size: int = 4,
+                    chunk_positions: int = DEFAULT_CHUNK_POSITIONS,
+                    use_numpy: bool | None = None) -> None:
+    """
+    Solve every position on the board and write the tablebase to a file.
+    :param path: the path of the file to write. An existing file is replaced
+        once the new one is complete.
+    :param size: the size of the game board on each side.
+    :param chunk_positions: the number of positions to solve at once. Peak
+        memory use grows with this, but not with the size of the table.
+    :param use_numpy: whether to use NumPy. Defaults to using NumPy if it is
+        installed. Without NumPy, a 4x4 table takes several minutes.
+    :except ValueError: indicates that size is greater than MAXIMUM_SIZE,
+        or chunk_positions is not a positive multiple of 4.
+    :except ImportError: indicates that use_numpy is True but NumPy is not
+        installed.
+    """
+    if size > MAXIMUM_SIZE:
+        raise ValueError(f"size must be at most {MAXIMUM_SIZE}")
+    if chunk_positions <= 0 or chunk_positions % 4:
+        raise ValueError("chunk_positions must be a positive multiple of 4")
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is required when use_numpy is True")
+
+    table_length = get_table_length(size)
+    temporary_path = path + ".tmp"
+    try:
+        with open(temporary_path, "w+b") as table_file:
+            table_file.write(TABLEBASE_MAGIC + bytes([size]))
+            table_file.truncate(HEADER_LENGTH + table_length)
+            table_map = mmap.mmap(table_file.fileno(), 0)
+        try:
+            solve_chunk = (_solve_chunk_numpy if use_numpy
+                           else _solve_chunk_python)
+            for end in range(4 * table_length, 0, -chunk_positions):
+                start = max(0, end - chunk_positions)
+                packed = solve_chunk(table_map, size, start, end)
+                table_map[HEADER_LENGTH + start // 4:
+                          HEADER_LENGTH + end // 4] = packed
+            table_map.flush()
+        finally:
+            table_map.close()
+    except BaseException:
+        # Do not leave a partly built table behind, including when the build
+        # is interrupted.
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    os.replace(temporary_path, path)
+
+
+def _solve_chunk_python(table_map: mmap.mmap, size: int, start: int,
+                        end: int) -> bytes:
+    """
+    Solve the positions with ranks from start up to end, one at a time in
+    plain Python. Every higher rank must already be in the table.
+    :param table_map: the table file, header included.
+    :param size: the size of the game board on each side.
+    :param start: the lowest rank to solve, a multiple of 4.
+    :param end: one more than the highest rank to solve, a multiple of 4.
+    :returns: the packed values of the chunk.
+    """
+    cell_count = size * size
+    position_count = 3 ** cell_count
+    powers = [3 ** cell for cell in range(0, cell_count)]
+    win_masks = get_win_masks(size)
+    values = bytearray(end - start)
+    # Higher ranks first, so that successors in this chunk are solved first.
+    for rank in range(min(end, position_count) - 1, start - 1, -1):
+        player_masks = [0, 0, 0]
+        counts = [0, 0, 0]
+        remaining = rank
+        for cell in range(0, cell_count):
+            remaining, cell_value = divmod(remaining, 3)
+            player_masks[cell_value] |= 1 << cell
+            counts[cell_value] += 1
+        if counts[1] == counts[2]:
+            player = 1
+        elif counts[1] == counts[2] + 1:
+            player = 2
+        else:
+            continue
+        won = [False, False, False]
+        for win_mask in win_masks:
+            for line_player in (1, 2):
+                if player_masks[line_player] & win_mask == win_mask:
+                    won[line_player] = True
+        if won[player]:
+            continue
+        if won[3 - player]:
+            values[rank - start] = VALUE_LOSS
+            continue
+        if counts[0] == 0:
+            values[rank - start] = VALUE_DRAW
+            continue
+        value = VALUE_LOSS
+        for cell in range(0, cell_count):
+            if player_masks[0] >> cell & 1:
+                child = rank + player * powers[cell]
+                if child < end:
+                    child_value = values[child - start]
+                else:
+                    child_value = (table_map[HEADER_LENGTH + child // 4] >>
+                                   2 * (child % 4)) & 3
+                if child_value == VALUE_LOSS:
+                    value = VALUE_WIN
+                    break
+                if child_value == VALUE_DRAW:
+                    value = VALUE_DRAW
+        values[rank - start] = value
+    return bytes(values[index] | values[index + 1] << 2 |
+                 values[index + 2] << 4 | values[index + 3] << 6
+                 for index in range(0, len(values), 4))
+
+
+def _solve_chunk_numpy(table_map: mmap.mmap, size: int, start: int,
+                       end: int) -> bytes:
+    """
+    Solve the positions with ranks from start up to end using vectorised
+    NumPy operations. Every higher rank must already be in the table.
+    :param table_map: the table file, header included.
+    :param size: the size of the game board on each side.
+    :param start: the lowest rank to solve, a multiple of 4.
+    :param end: one more than the highest rank to solve, a multiple of 4.
+    :returns: the packed values of the chunk.
+    """
+    cell_count = size * size
+    ranks = numpy.arange(start, end, dtype=numpy.int64)
+    player_1_masks = numpy.zeros(len(ranks), dtype=numpy.int64)
+    player_2_masks = numpy.zeros(len(ranks), dtype=numpy.int64)
+    player_1_counts = numpy.zeros(len(ranks), dtype=numpy.int8)
+    player_2_counts = numpy.zeros(len(ranks), dtype=numpy.int8)
+    remaining = ranks.copy()
+    for cell in range(0, cell_count):
+        cell_values = remaining % 3
+        remaining //= 3
+        player_1_cells = cell_values == 1
+        player_2_cells = cell_values == 2
+        player_1_masks |= player_1_cells.astype(numpy.int64) << cell
+        player_2_masks |= player_2_cells.astype(numpy.int64) << cell
+        player_1_counts += player_1_cells
+        player_2_counts += player_2_cells
+    # Ranks past the last position are padding in the final byte.
+    valid = remaining == 0
+    del remaining, cell_values, player_1_cells, player_2_cells
+    filled_counts = player_1_counts + player_2_counts
+    player_1_to_move = player_1_counts == player_2_counts
+    valid &= player_1_to_move | (player_1_counts == player_2_counts + 1)
+
+    player_1_won = numpy.zeros(len(ranks), dtype=bool)
+    player_2_won = numpy.zeros(len(ranks), dtype=bool)
+    for win_mask in get_win_masks(size):
+        player_1_won |= player_1_masks & win_mask == win_mask
+        player_2_won |= player_2_masks & win_mask == win_mask
+    mover_won = numpy.where(player_1_to_move, player_1_won, player_2_won)
+    previous_player_won = numpy.where(player_1_to_move, player_2_won,
+                                      player_1_won)
+    valid &= ~mover_won
+
+    values = numpy.zeros(len(ranks), dtype=numpy.uint8)
+    values[valid & previous_player_won] = VALUE_LOSS
+    open_positions = valid & ~previous_player_won
+    values[open_positions & (filled_counts == cell_count)] = VALUE_DRAW
+    open_positions &= filled_counts < cell_count
+
+    table = numpy.frombuffer(table_map, dtype=numpy.uint8,
+                             offset=HEADER_LENGTH)
+    try:
+        # A successor in this chunk has one more piece, so solve the chunk
+        # in order of decreasing piece count.
+        for filled_count in range(cell_count - 1, -1, -1):
+            indices = numpy.flatnonzero(open_positions &
+                                        (filled_counts == filled_count))
+            if len(indices) == 0:
+                continue
+            layer_ranks = ranks[indices]
+            movers = numpy.where(player_1_to_move[indices], 1, 2)
+            empty_masks = ~(player_1_masks[indices] | player_2_masks[indices])
+            any_loss = numpy.zeros(len(indices), dtype=bool)
+            any_draw = numpy.zeros(len(indices), dtype=bool)
+            for cell in range(0, cell_count):
+                empty = (empty_masks >> cell & 1).astype(bool)
+                children = layer_ranks + movers * 3 ** cell
+                in_chunk = children < end
+                local_values = values[numpy.where(in_chunk & empty,
+                                                  children - start, 0)]
+                table_children = numpy.where(in_chunk | ~empty, 0, children)
+                table_values = (table[table_children >> 2] >>
+                                (2 * (table_children & 3)).astype(
+                                    numpy.uint8)) & 3
+                child_values = numpy.where(in_chunk, local_values,
+                                           table_values)
+                any_loss |= empty & (child_values == VALUE_LOSS)
+                any_draw |= empty & (child_values == VALUE_DRAW)
+            values[indices] = numpy.where(
+                any_loss, VALUE_WIN,
+                numpy.where(any_draw, VALUE_DRAW, VALUE_LOSS))
+    finally:
+        # Release the view, so that the memory map can be closed.
+        del table
+    values = values.reshape(-1, 4)
+    return (values[:, 0] | values[:, 1] << 2 | values[:, 2] << 4 |
+            values[:, 3] << 6).tobytes()
+
+
+class Tablebase:
+    """A read-only tablebase, memory-mapped from a file."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a tablebase file.
+        :param path: the path of a file written by build_tablebase.
+        :except TablebaseException: indicates that the file is not a valid
+            tablebase.
+        """
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        valid = (len(self._map) >= HEADER_LENGTH and
+                 self._map[:len(TABLEBASE_MAGIC)] == TABLEBASE_MAGIC)
+        if valid:
+            self.size = self._map[len(TABLEBASE_MAGIC)]
+            valid = (self.size <= MAXIMUM_SIZE and
+                     len(self._map) == (HEADER_LENGTH +
+                                        get_table_length(self.size)))
+        if not valid:
+            self._map.close()
+            raise TablebaseException(f"Invalid tablebase file: {path}")
+        # The rank of every set of cells with a 1 in them, indexed by the
+        # cells' bitset. A board's rank is then found from its two players'
+        # bitsets with two list lookups, rather than cell by cell.
+        bit_ranks = [0] * (1 << (self.size * self.size))
+        for bits in range(1, len(bit_ranks)):
+            lowest_bit = bits & -bits
+            bit_ranks[bits] = (bit_ranks[bits ^ lowest_bit] +
+                               3 ** (lowest_bit.bit_length() - 1))
+        self._bit_ranks = bit_ranks
+
+    @classmethod
+    def open_or_build(cls, path: str, size: int = 4) -> "Tablebase":
+        """
+        Open a tablebase file, building it first if it does not exist.
+        :param path: the path of the tablebase file.
+        :param size: the board size to build the tablebase for.
+        :returns: the opened tablebase.
+        """
+        if not os.path.exists(path):
+            build_tablebase(path, size)
+        return cls(path)
+
+    def get_rank(self, board: Board) -> int:
+        """
+        Calculate the index of a position in the tablebase.
+        :param board: a two-player game board of the tablebase's size, with
+            get_player_bitset, such as Board or BitBoard.
+        :returns: the base-3 rank of the board's cells.
+        :except ValueError: indicates that the board is not the tablebase's
+            size.
+        """
+        if board.size != self.size:
+            raise ValueError(f"board size must be {self.size}")
+        bit_ranks = self._bit_ranks
+        return (bit_ranks[board.get_player_bitset(1)] +
+                2 * bit_ranks[board.get_player_bitset(2)])
+
+    def lookup_rank(self, rank: int) -> int:
+        """
+        Look up a position by its rank. Search code can keep the rank up to
+        date as moves are made, by adding player * 3 ** move for each move,
+        and avoid calculating it again. This is the fast path, so the rank is
+        not checked: a rank outside the table gives a meaningless value or
+        an IndexError.
+        :param rank: the position's rank, as from get_rank.
+        :returns: VALUE_WIN, VALUE_DRAW or VALUE_LOSS for the player to move,
+            or VALUE_INVALID.
+        """
+        return (self._map[HEADER_LENGTH + (rank >> 2)] >>
+                ((rank & 3) << 1)) & 3
+
+    def lookup(self, board: Board) -> int:
+        """
+        Look up a position.
+        :param board: a two-player game board of the tablebase's size, with
+            get_player_bitset and the default (full-line) win length.
+        :returns: VALUE_WIN, VALUE_DRAW or VALUE_LOSS for the player to move,
+            or VALUE_INVALID if the position cannot arise with player 1
+            moving first.
+        :except ValueError: indicates that the board is not the tablebase's
+            size.
+        """
+        # This repeats get_rank and lookup_rank, to save two method calls.
+        if board.size != self.size:
+            raise ValueError(f"board size must be {self.size}")
+        bit_ranks = self._bit_ranks
+        rank = (bit_ranks[board.get_player_bitset(1)] +
+                2 * bit_ranks[board.get_player_bitset(2)])
+        return (self._map[HEADER_LENGTH + (rank >> 2)] >>
+                ((rank & 3) << 1)) & 3
+
+    def close(self) -> None:
+        """Close the memory map."""
+        self._map.close()
+
+    def __enter__(self) -> "Tablebase":
+        return self
+
+    def __exit__(self, *exception_details) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else "tablebase_4x4.bin"
+    build_tablebase(output_path)
+    print(f"Wrote {output_path}")
@@ -0,0 +1,105 @@
+"""
+Multi-core Tic-Tac-Toe tournaments. Games are split into fixed-size chunks
+which are played by headless Simulators in a pool of worker processes. Each
+worker returns only aggregate counts, and every chunk is seeded from the
+tournament seed and its chunk number, so results are the same whatever the
+number of workers.
+Run from the project root with: PYTHONPATH=src python src/tournament.py
+Author: Emily Boegheim
+"""
+
+import multiprocessing
+import os
+import time
+
+from alpha_beta import AlphaBetaStrategy
+from board import Board
+from simulation import SimulationResults, Simulator
+from strategies import RandomStrategy
+
+# Strategies available to tournaments, by name. Each factory takes a seed
+# and returns a new strategy. Names are used rather than strategy objects
+# so that only small, picklable values are sent to the workers.
+STRATEGY_FACTORIES = {
+    'random': RandomStrategy,
+    'alpha_beta': AlphaBetaStrategy,
+}
+
+
+def get_chunk_seed(seed: int, chunk_number: int, player: int) -> int:
+    """
+    Derive the seed for one player's strategy in one chunk of games.
+    :param seed: the tournament seed.
+    :param chunk_number: the number of the chunk of games.
+    :param player: the player number.
+    :returns: a seed unique to this tournament, chunk and player.
+    """
+    return (seed << 40) | (chunk_number << 8) | player
+
+
+def play_chunk(chunk: tuple) -> tuple[list[int], int, int]:
+    """
+    Play one chunk of games. This is run in the worker processes.
+    :param chunk: a tuple (chunk_number, games, size, win_length,
+        strategy_names, seed) describing the games to play.
+    :returns: a tuple (wins, ties, games) of aggregate counts, where wins is
+        indexed by player number.
+    """
+    chunk_number, games, size, win_length, strategy_names, seed = chunk
+    strategies = {}
+    for player, name in enumerate(strategy_names, start=1):
+        player_seed = get_chunk_seed(seed, chunk_number, player)
+        strategies[player] = STRATEGY_FACTORIES[name](player_seed)
+    board = Board(size, win_length, len(strategies))
+    results = Simulator(strategies, board).run(games)
+    return results.wins, results.ties, results.games
+
+
+def run_tournament(games: int, workers: int | None = None, size: int = 3,
+                   win_length: int | None = None,
+                   strategy_names: tuple[str, ...] = ('random', 'random'),
+                   seed: int = 0,
+                   chunk_size: int = 10000) -> SimulationResults:
+    """
+    Play a tournament of games spread across a pool of worker processes.
+    :param games: the total number of games to play.
+    :param workers: the number of worker processes. Defaults to the number
+        of CPU cores. With 1 worker the games are played in this process.
+    :param size: the size of the game board on each side.
+    :param win_length: the number of pieces in a row needed to win. Defaults
+        to the board size.
+    :param strategy_names: the names of each player's strategy, in player
+        order, from STRATEGY_FACTORIES.
+    :param seed: the tournament seed. The same seed and chunk size always
+        give the same results.
+    :param chunk_size: the number of games played per chunk.
+    :returns: the combined results of all games.
+    :except KeyError: indicates an unknown strategy name.
+    """
+    for name in strategy_names:
+        if name not in STRATEGY_FACTORIES:
+            raise KeyError(f"Unknown strategy: {name}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    chunks = []
+    for chunk_number, first_game in enumerate(range(0, games, chunk_size)):
+        chunk_games = min(chunk_size, games - first_game)
+        chunks.append((chunk_number, chunk_games, size, win_length,
+                       tuple(strategy_names), seed))
+
+    results = SimulationResults(len(strategy_names))
+    start = time.perf_counter()
+    if workers == 1:
+        for chunk in chunks:
+            results.add_counts(*play_chunk(chunk))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for chunk_results in pool.imap_unordered(play_chunk, chunks):
+                results.add_counts(*chunk_results)
+    results.elapsed_seconds = time.perf_counter() - start
+    return results
+
+
+if __name__ == "__main__":
+    print(run_tournament(1000000).summary())
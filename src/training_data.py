@@ -0,0 +1,267 @@
+"""
+Writes self-play training data as fixed-size, memory-mapped shards in the
+NumPy .npy format, so that very large datasets can be produced with the
+standard library alone and later read with numpy.load(path, mmap_mode="r")
+without creating a Python object per sample.
+
+Each shard holds up to shard_samples samples of a structured dtype with the
+fields position (one unsigned byte per cell, in move-number order), player
+(the player to move), move (the move they made) and outcome (1 if that player
+went on to win, 0 for a tie and -1 for a loss). A shard's file is created at
+its full size and filled through a memory map. When the writer is closed the
+last shard is shrunk to the samples written. Shards of a writer which was not
+closed keep their full size, with empty samples at the end.
+Generate data from the project root with:
+PYTHONPATH=src python src/training_data.py DIRECTORY [games]
+Author: Emily Boegheim
+"""
+
+import mmap
+import os
+import random
+import struct
+import sys
+
+from board import Board
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# The total length of each shard's header, including the magic. This is
+# fixed, so that the header can be rewritten with a new sample count in
+# place. It is a multiple of 64, as the .npy format requires.
+HEADER_LENGTH = 256
+
+SHARD_NAME_FORMAT = "shard_{:05d}.npy"
+
+# The fields following the position in each sample: player, move, outcome.
+_SAMPLE_TAIL = struct.Struct("<BHb")
+
+# The largest board size whose moves fit in a sample's 16-bit move field.
+MAXIMUM_SIZE = 256
+
+
+def get_sample_size(size: int) -> int:
+    """
+    Calculate the number of bytes in one sample.
+    :param size: the size of the game board on each side.
+    :returns: the sample size in bytes.
+    """
+    return size * size + _SAMPLE_TAIL.size
+
+
+def build_header(size: int, samples: int) -> bytes:
+    """
+    Build a .npy header for a shard.
+    :param size: the size of the game board on each side.
+    :param samples: the number of samples in the shard.
+    :returns: the header, HEADER_LENGTH bytes long.
+    """
+    descr = (f"[('position', '|u1', ({size * size},)), ('player', '|u1'), "
+             f"('move', '<u2'), ('outcome', '|i1')]")
+    header = (f"{{'descr': {descr}, 'fortran_order': False, "
+              f"'shape': ({samples},), }}")
+    padding = HEADER_LENGTH - len(NPY_MAGIC) - 2 - len(header) - 1
+    return (NPY_MAGIC + struct.pack("<H", HEADER_LENGTH - len(NPY_MAGIC) - 2) +
+            header.encode("latin1") + b" " * padding + b"\n")
+
+
+class TrainingDataWriter:
+    """Appends training samples to a directory of memory-mapped shards."""
+
+    def __init__(self, directory: str, size: int = 3,
+                 shard_samples: int = 1 << 20) -> None:
+        """
+        Initialise the writer. New shards are numbered after any already in
+        the directory.
+        :param directory: the directory to write shards to. It is created if
+            it does not exist.
+        :param size: the size of the game board on each side.
+        :param shard_samples: the number of samples in each full shard.
+        :except ValueError: indicates that size is greater than MAXIMUM_SIZE.
+        """
+        if size > MAXIMUM_SIZE:
+            raise ValueError(f"size must be at most {MAXIMUM_SIZE}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.shard_samples = shard_samples
+        self.sample_size = get_sample_size(size)
+        self.shard_paths = []
+        self.samples_written = 0
+        self._next_shard_number = 0
+        while os.path.exists(self._get_shard_path(self._next_shard_number)):
+            self._next_shard_number += 1
+        self._map = None
+        self._shard_path = None
+        self._samples_in_shard = 0
+        self._board = Board(size)
+
+    def write_sample(self, position, player: int, move: int,
+                     outcome: int) -> None:
+        """
+        Append one sample.
+        :param position: the board's cells before the move, as a bytes-like
+            object with one byte per cell, such as Board.get_cell_buffer().
+        :param player: the player to move.
+        :param move: the move the player made.
+        :param outcome: 1 if the player went on to win, 0 for a tie and -1
+            for a loss.
+        :except ValueError: indicates that the move is not a cell on the
+            board.
+        """
+        cell_count = self.size * self.size
+        if move < 0 or move >= cell_count:
+            raise ValueError(f"move must be between 0 and {cell_count - 1}")
+        if self._map is None or self._samples_in_shard == self.shard_samples:
+            self._open_next_shard()
+        offset = HEADER_LENGTH + self._samples_in_shard * self.sample_size
+        self._map[offset:offset + cell_count] = position
+        _SAMPLE_TAIL.pack_into(self._map, offset + cell_count, player, move,
+                               outcome)
+        self._samples_in_shard += 1
+        self.samples_written += 1
+
+    def write_game(self, moves: list[int], winner: int,
+                   number_of_players: int = 2) -> None:
+        """
+        Replay a game and append a sample for every move in it.
+        :param moves: the moves made, in order, starting with player 1.
+        :param winner: the winning player, or 0 for a tie.
+        :param number_of_players: the number of players taking turns.
+        :except ValueError: indicates that a move is not a cell on the board,
+            or is made after the game was won.
+        :except PositionAlreadyFilledException: indicates that a move is made
+            on a filled cell.
+        """
+        board = self._board
+        if number_of_players > board.number_of_players:
+            board = self._board = Board(self.size,
+                                        number_of_players=number_of_players)
+        # Play the whole game before writing anything, so that an invalid
+        # game leaves no samples behind.
+        board.reset()
+        cell_count = self.size * self.size
+        player = 1
+        for move in moves:
+            if move < 0 or move >= cell_count:
+                raise ValueError(
+                    f"move must be between 0 and {cell_count - 1}")
+            if board.find_winner():
+                raise ValueError("moves continue after the game was won")
+            board.add_player_move(player, move)
+            if player == number_of_players:
+                player = 1
+            else:
+                player += 1
+
+        board.reset()
+        cells = board.get_cell_buffer()
+        player = 1
+        for move in moves:
+            if winner == 0:
+                outcome = 0
+            else:
+                outcome = 1 if player == winner else -1
+            self.write_sample(cells, player, move, outcome)
+            board.add_player_move(player, move)
+            if player == number_of_players:
+                player = 1
+            else:
+                player += 1
+
+    def close(self) -> None:
+        """Finish the current shard, shrinking it to the samples written."""
+        if self._map is None:
+            return
+        self._map[:HEADER_LENGTH] = build_header(self.size,
+                                                 self._samples_in_shard)
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        os.truncate(self._shard_path, HEADER_LENGTH +
+                    self._samples_in_shard * self.sample_size)
+
+    def __enter__(self) -> "TrainingDataWriter":
+        return self
+
+    def __exit__(self, *exception_details) -> None:
+        self.close()
+
+    def _get_shard_path(self, shard_number: int) -> str:
+        """
+        Build the path of a shard.
+        :param shard_number: the number of the shard.
+        :returns: the path of the shard's file.
+        """
+        return os.path.join(self.directory,
+                            SHARD_NAME_FORMAT.format(shard_number))
+
+    def _open_next_shard(self) -> None:
+        """Finish the current shard, if any, and start a new one."""
+        self.close()
+        self._shard_path = self._get_shard_path(self._next_shard_number)
+        self._next_shard_number += 1
+        shard_length = HEADER_LENGTH + self.shard_samples * self.sample_size
+        with open(self._shard_path, "w+b") as shard_file:
+            shard_file.truncate(shard_length)
+            self._map = mmap.mmap(shard_file.fileno(), shard_length)
+        self._map[:HEADER_LENGTH] = build_header(self.size,
+                                                 self.shard_samples)
+        self._samples_in_shard = 0
+        self.shard_paths.append(self._shard_path)
+
+
+def load_shard(path: str):
+    """
+    Open a shard as a read-only, memory-mapped NumPy array, without reading
+    it into memory.
+    :param path: the path of the shard.
+    :returns: a structured array with one element per sample.
+    :except ImportError: indicates that NumPy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("NumPy is required to load shards")
+    return numpy.load(path, mmap_mode="r")
+
+
+def generate_self_play_data(directory: str, games: int, size: int = 3,
+                            seed: int = 0,
+                            shard_samples: int = 1 << 20) -> int:
+    """
+    Play games between two random players and write a sample for every move.
+    :param directory: the directory to write shards to.
+    :param games: the number of games to play.
+    :param size: the size of the game board on each side.
+    :param seed: the seed for the random number generator.
+    :param shard_samples: the number of samples in each full shard.
+    :returns: the number of samples written.
+    """
+    generator = random.Random(seed)
+    board = Board(size)
+    with TrainingDataWriter(directory, size, shard_samples) as writer:
+        for _ in range(0, games):
+            board.reset()
+            moves = []
+            player = 1
+            winner = 0
+            while not board.is_board_full():
+                move = board.get_random_empty_move(generator)
+                board.add_player_move(player, move)
+                moves.append(move)
+                winner = board.find_winner()
+                if winner:
+                    break
+                player = 3 - player
+            writer.write_game(moves, winner)
+        return writer.samples_written
+
+
+if __name__ == "__main__":
+    output_directory = sys.argv[1]
+    game_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    sample_count = generate_self_play_data(output_directory, game_count)
+    print(f"Wrote {sample_count} samples to {output_directory}")
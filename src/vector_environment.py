@@ -0,0 +1,245 @@
+"""
+A batched Tic-Tac-Toe environment which plays many independent two-player
+games in lockstep, for reinforcement learning style workloads. The games are
+stored as structures of arrays (one array of cells for every game, one of
+current players and one of filled cell counts) rather than as Board objects,
+and a single call to step makes one move in every game. Games follow Board's
+rules with the default (full-line) win length. NumPy is used if it is
+installed, and plain Python if not.
+Author: Emily Boegheim
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Per-game results of a move, matching the exceptions raised by
+# Board.add_player_move.
+STEP_OK = 0
+STEP_OUT_OF_BOUNDS = 1
+STEP_ALREADY_FILLED = 2
+
+
+def get_cell_lines(size: int) -> list[list[int]]:
+    """
+    List the full-length lines through each cell, numbered as in Board:
+    rows, then columns, then the south-east and south-west diagonals.
+    :param size: the size of the game board on each side.
+    :returns: a list with the line numbers for each cell, by move number.
+    """
+    cell_lines = []
+    for move in range(0, size * size):
+        row, column = divmod(move, size)
+        lines = [row, size + column]
+        if row == column:
+            lines.append(2 * size)
+        if row + column == size - 1:
+            lines.append(2 * size + 1)
+        cell_lines.append(lines)
+    return cell_lines
+
+
+class VectorEnvironment:
+    """
+    Many games of Tic-Tac-Toe played in lockstep. Player 1 moves first in
+    every game. When a game ends it is reset straight away, so every game is
+    always ready for its next move.
+    """
+
+    def __init__(self, number_of_games: int, size: int = 3,
+                 use_numpy: bool | None = None) -> None:
+        """
+        Initialise the environment with every game at its start.
+        :param number_of_games: the number of games to play at once.
+        :param size: the size of each game board on each side.
+        :param use_numpy: whether to use NumPy. Defaults to using NumPy if it
+            is installed.
+        :except ImportError: indicates that use_numpy is True but NumPy is
+            not installed.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is required when use_numpy is True")
+        self.number_of_games = number_of_games
+        self.size = size
+        self.use_numpy = use_numpy
+        self._cells_per_game = size * size
+        self._lines_per_game = 2 * size + 2
+        self._cell_lines = get_cell_lines(size)
+        if use_numpy:
+            # Pad each cell's lines to 4 with an unused extra line, so they
+            # fit in one array.
+            padded_lines = [lines + [self._lines_per_game] * (4 - len(lines))
+                            for lines in self._cell_lines]
+            self._cell_lines_array = numpy.array(padded_lines,
+                                                 dtype=numpy.intp)
+            self._game_indices = numpy.arange(number_of_games)
+        self.reset()
+
+    def reset(self) -> None:
+        """Return every game to its start."""
+        games = self.number_of_games
+        if self.use_numpy:
+            self.cells = numpy.zeros((games, self._cells_per_game),
+                                     dtype=numpy.int8)
+            self.current_players = numpy.ones(games, dtype=numpy.int8)
+            self.filled_counts = numpy.zeros(games, dtype=numpy.int32)
+            # Counts of each player's pieces in each line, including the
+            # padding line, indexed [game, line, player].
+            self._line_player_counts = numpy.zeros(
+                (games, self._lines_per_game + 1, 3), dtype=numpy.int32)
+        else:
+            # Cells of every game in one flat array, game by game.
+            self.cells = bytearray(games * self._cells_per_game)
+            self.current_players = bytearray([1]) * games
+            self.filled_counts = [0] * games
+            # Counts of each player's pieces in each line, flattened with
+            # index (game * lines_per_game + line) * 3 + player.
+            self._line_player_counts = [0] * (games * self._lines_per_game * 3)
+
+    def step(self, moves) -> tuple:
+        """
+        Make one move in every game, for the player whose turn it is. An
+        invalid move leaves its game unchanged, with the same player to move.
+        Games which end are reset before returning.
+        :param moves: one move per game, numbered as in
+            Board.add_player_move.
+        :returns: a tuple (errors, winners, done). With NumPy these are
+            arrays with one entry per game; otherwise they are lists. errors
+            holds STEP_OK, STEP_OUT_OF_BOUNDS or STEP_ALREADY_FILLED; winners
+            holds the player who won with this move, or 0; done is True
+            where the game ended with this move, by a win or a tie.
+        :except ValueError: indicates that the number of moves does not
+            match the number of games.
+        """
+        if len(moves) != self.number_of_games:
+            raise ValueError("step needs exactly one move per game")
+        if self.use_numpy:
+            return self._step_numpy(moves)
+        return self._step_python(moves)
+
+    def get_board_data(self, game: int) -> list[list]:
+        """
+        Build a 2D data structure of one game's board, like
+        Board.get_board_data.
+        :param game: the index of the game.
+        :returns: a new list of rows of player numbers.
+        """
+        start = game * self._cells_per_game
+        cells = [int(cell) for cell in
+                 (self.cells[game] if self.use_numpy else
+                  self.cells[start:start + self._cells_per_game])]
+        return [cells[row * self.size:(row + 1) * self.size]
+                for row in range(0, self.size)]
+
+    def _step_python(self, moves) -> tuple:
+        """
+        Make one move in every game, one game at a time in plain Python.
+        :param moves: one move per game.
+        :returns: a tuple of lists (errors, winners, done).
+        """
+        games = self.number_of_games
+        size = self.size
+        cells_per_game = self._cells_per_game
+        lines_per_game = self._lines_per_game
+        cell_lines = self._cell_lines
+        cells = self.cells
+        current_players = self.current_players
+        filled_counts = self.filled_counts
+        counts = self._line_player_counts
+        errors = [STEP_OK] * games
+        winners = [0] * games
+        done = [False] * games
+        for game in range(0, games):
+            move = moves[game]
+            if move < 0 or move >= cells_per_game:
+                errors[game] = STEP_OUT_OF_BOUNDS
+                continue
+            cell = game * cells_per_game + move
+            if cells[cell]:
+                errors[game] = STEP_ALREADY_FILLED
+                continue
+            player = current_players[game]
+            cells[cell] = player
+            filled_counts[game] += 1
+            won = False
+            first_line = game * lines_per_game
+            for line in cell_lines[move]:
+                index = (first_line + line) * 3 + player
+                counts[index] += 1
+                if counts[index] == size:
+                    won = True
+            if won or filled_counts[game] == cells_per_game:
+                winners[game] = player if won else 0
+                done[game] = True
+                self._reset_game_python(game)
+            else:
+                current_players[game] = 3 - player
+        return errors, winners, done
+
+    def _reset_game_python(self, game: int) -> None:
+        """
+        Return one game to its start, in the plain Python arrays.
+        :param game: the index of the game.
+        """
+        start = game * self._cells_per_game
+        self.cells[start:start + self._cells_per_game] = bytes(
+            self._cells_per_game)
+        self.current_players[game] = 1
+        self.filled_counts[game] = 0
+        counts_start = game * self._lines_per_game * 3
+        counts_end = counts_start + self._lines_per_game * 3
+        self._line_player_counts[counts_start:counts_end] = [0] * (
+            counts_end - counts_start)
+
+    def _step_numpy(self, moves) -> tuple:
+        """
+        Make one move in every game using vectorised NumPy operations.
+        :param moves: one move per game.
+        :returns: a tuple of arrays (errors, winners, done).
+        """
+        moves = numpy.asarray(moves, dtype=numpy.intp)
+        games = self.number_of_games
+        errors = numpy.zeros(games, dtype=numpy.int8)
+        winners = numpy.zeros(games, dtype=numpy.int8)
+        done = numpy.zeros(games, dtype=bool)
+
+        out_of_bounds = (moves < 0) | (moves >= self._cells_per_game)
+        errors[out_of_bounds] = STEP_OUT_OF_BOUNDS
+        safe_moves = numpy.where(out_of_bounds, 0, moves)
+        already_filled = ~out_of_bounds & (
+            self.cells[self._game_indices, safe_moves] != 0)
+        errors[already_filled] = STEP_ALREADY_FILLED
+
+        valid_games = numpy.flatnonzero(errors == STEP_OK)
+        valid_moves = moves[valid_games]
+        players = self.current_players[valid_games]
+        self.cells[valid_games, valid_moves] = players
+        self.filled_counts[valid_games] += 1
+
+        # Each cell is on at most 4 lines, each listed once, so the counts
+        # can be updated with a single fancy-indexed addition.
+        lines = self._cell_lines_array[valid_moves]
+        count_index = (valid_games[:, numpy.newaxis], lines,
+                       players.astype(numpy.intp)[:, numpy.newaxis])
+        self._line_player_counts[count_index] += 1
+        completed = ((self._line_player_counts[count_index] == self.size) &
+                     (lines != self._lines_per_game))
+        won = completed.any(axis=1)
+        tied = ~won & (self.filled_counts[valid_games] ==
+                       self._cells_per_game)
+
+        winners[valid_games[won]] = players[won]
+        finished_games = valid_games[won | tied]
+        done[finished_games] = True
+        continuing_games = valid_games[~(won | tied)]
+        self.current_players[continuing_games] = (
+            3 - self.current_players[continuing_games])
+
+        self.cells[finished_games] = 0
+        self.current_players[finished_games] = 1
+        self.filled_counts[finished_games] = 0
+        self._line_player_counts[finished_games] = 0
+        return errors, winners, done
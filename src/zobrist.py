@@ -0,0 +1,61 @@
+"""
+Zobrist hashing for Tic-Tac-Toe boards. Each (cell, player) pair is given a
+random 64-bit key, and a position's hash is the XOR of the keys for its
+filled cells, so it can be updated incrementally as moves are made.
+Author: Emily Boegheim
+"""
+
+import random
+from functools import lru_cache
+
+# The number of players whose keys come from each board's main sequence of
+# keys. Keys for higher-numbered players are generated separately, so that
+# these keys are the same whatever the number of players.
+MAXIMUM_PLAYER = 8
+
+# Keys are generated from a fixed seed so that hashes are the same in every
+# process and every run.
+_ZOBRIST_SEED = 0x5EED
+
+# The number of board sizes whose keys are kept. Each board holds on to its
+# own keys, so this only saves regenerating them for new boards.
+_CACHED_KEY_TABLES = 8
+
+
+@lru_cache(maxsize=_CACHED_KEY_TABLES)
+def get_zobrist_keys(number_of_cells: int,
+                     number_of_players: int = MAXIMUM_PLAYER
+                     ) -> tuple[tuple[int, ...], ...]:
+    """
+    Generate the Zobrist keys for a board with the given number of cells.
+    :param number_of_cells: the number of cells on the board.
+    :param number_of_players: the highest player number to generate keys
+        for. Keys are always generated for at least MAXIMUM_PLAYER players.
+    :returns: a tuple indexed by move number, each entry a tuple of keys
+        indexed by player number. The key for player 0 (an empty cell) is 0.
+    """
+    generator = random.Random(_ZOBRIST_SEED + number_of_cells)
+    keys = [[0] + [generator.getrandbits(64)
+                   for _ in range(0, MAXIMUM_PLAYER)]
+            for _ in range(0, number_of_cells)]
+    for player in range(MAXIMUM_PLAYER + 1, number_of_players + 1):
+        # Each extra player has a generator of its own, so its keys do not
+        # depend on how many players there are.
+        player_generator = random.Random(
+            f"{_ZOBRIST_SEED}:{number_of_cells}:{player}")
+        for cell_keys in keys:
+            cell_keys.append(player_generator.getrandbits(64))
+    return tuple(tuple(cell_keys) for cell_keys in keys)
+
+
+@lru_cache(maxsize=None)
+def get_player_to_move_keys() -> tuple[int, ...]:
+    """
+    Generate keys representing the player whose turn it is, to combine with
+    a board's hash when the same position can arise with different players
+    to move.
+    :returns: a tuple of keys indexed by player number.
+    """
+    generator = random.Random(_ZOBRIST_SEED - 1)
+    return (0,) + tuple(generator.getrandbits(64)
+                        for _ in range(0, MAXIMUM_PLAYER))
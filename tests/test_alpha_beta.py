@@ -0,0 +1,104 @@
+from alpha_beta import AlphaBetaStrategy, TranspositionTable, EXACT
+from alpha_beta import get_static_move_order
+from board import Board
+from game_manager import GameManager
+from simulation import HeadlessUI, Simulator
+from strategies import RandomStrategy
+import unittest
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(4)
+
+    def test_stored_entry_is_found(self):
+        self.table.store(12345, 3, 1, EXACT, 4)
+        self.assertEqual((3, 1, EXACT, 4), self.table.probe(12345))
+
+    def test_missing_entry_is_not_found(self):
+        self.assertIsNone(self.table.probe(12345))
+
+    def test_shallower_entry_does_not_replace_deeper_entry(self):
+        self.table.store(1, 5, 1, EXACT, 0)
+        self.table.store(1 + 16, 2, 0, EXACT, 0)
+        self.assertIsNotNone(self.table.probe(1))
+
+    def test_entry_from_earlier_search_is_replaced(self):
+        self.table.store(1, 5, 1, EXACT, 0)
+        self.table.new_search()
+        self.table.store(1 + 16, 2, 0, EXACT, 0)
+        self.assertIsNone(self.table.probe(1))
+
+    def test_table_size_is_fixed(self):
+        for key in range(0, 1000):
+            self.table.store(key, 1, 0, EXACT, 0)
+        self.assertEqual(16, len(self.table._entries))
+
+    def test_hit_rate_counts_probes(self):
+        self.table.store(7, 1, 0, EXACT, 0)
+        self.table.probe(7)
+        self.table.probe(8)
+        self.assertEqual(0.5, self.table.get_hit_rate())
+
+
+class TestAlphaBetaStrategy(unittest.TestCase):
+    def setUp(self):
+        self.strategy = AlphaBetaStrategy(table_size_bits=12)
+        self.board = Board()
+
+    def test_empty_board_is_a_draw(self):
+        self.assertEqual(0, self.strategy.evaluate_position(self.board, 1))
+
+    def test_takes_winning_move(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 3)
+        self.board.add_player_move(1, 1)
+        self.board.add_player_move(2, 4)
+        self.assertEqual(2, self.strategy.choose_move(self.board, 1))
+
+    def test_blocks_opponent_win(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 4)
+        self.board.add_player_move(1, 8)
+        self.board.add_player_move(2, 1)
+        self.assertEqual(7, self.strategy.choose_move(self.board, 1))
+
+    def test_does_not_change_board(self):
+        self.board.add_player_move(1, 4)
+        self.strategy.choose_move(self.board, 2)
+        self.assertEqual(1, self.board.get_filled_cell_count())
+
+    def test_never_loses_to_random_player(self):
+        results = Simulator({1: RandomStrategy(3),
+                             2: AlphaBetaStrategy(table_size_bits=12)}).run(30)
+        self.assertEqual(0, results.wins[1])
+
+    def test_statistics_are_recorded(self):
+        self.strategy.choose_move(self.board, 1)
+        self.assertGreater(self.strategy.nodes_searched, 0)
+        self.assertGreater(self.strategy.get_nodes_per_second(), 0)
+        self.assertGreater(self.strategy.table.get_hit_rate(), 0)
+
+    def test_depth_limited_search_finds_immediate_win(self):
+        strategy = AlphaBetaStrategy(max_depth=2)
+        board = Board(6)
+        for column in range(0, 5):
+            board.add_move_by_coordinates(2, 0, column)
+        self.assertEqual(5, strategy.choose_move(board, 2))
+
+    def test_moves_ordered_by_static_order_after_first_move(self):
+        board = Board(5, 4)
+        for player, move in [(1, 12), (2, 0), (1, 6)]:
+            board.add_player_move(player, move)
+        expected = [move for move in get_static_move_order(5)
+                    if move not in (12, 0, 6, 3)]
+        self.assertEqual([3] + expected,
+                         self.strategy._get_ordered_moves(board, 3))
+
+    def test_plugs_into_game_manager(self):
+        game_manager = GameManager(ui=HeadlessUI({}),
+                                   strategies={1: AlphaBetaStrategy(),
+                                               2: AlphaBetaStrategy()})
+        game_manager.main()
+        self.assertEqual(0, game_manager.board.find_winner())
+        self.assertTrue(game_manager.board.is_board_full())
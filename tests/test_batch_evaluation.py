@@ -0,0 +1,78 @@
+from batch_evaluation import evaluate_boards
+from board import Board
+import batch_evaluation
+import random
+import unittest
+
+
+def make_random_boards(generator: random.Random, count: int,
+                       size: int) -> list:
+    """Build random board states, including some with several full lines."""
+    boards = []
+    for _ in range(0, count):
+        fill_chance = generator.random()
+        boards.append([[generator.randrange(1, 3)
+                        if generator.random() < fill_chance else 0
+                        for _ in range(0, size)] for _ in range(0, size)])
+    return boards
+
+
+def evaluate_with_board(board_data: list[list]) -> tuple:
+    """Evaluate a board state using Board itself."""
+    size = len(board_data)
+    board = Board(size)
+    for row in range(0, size):
+        for column in range(0, size):
+            if board_data[row][column]:
+                board.add_move_by_coordinates(board_data[row][column], row,
+                                              column)
+    winner = board.find_winner()
+    full = board.is_board_full()
+    return winner, full, full and winner == 0
+
+
+class TestEvaluateBoardsPython(unittest.TestCase):
+    use_numpy = False
+
+    def check_matches_board(self, boards: list) -> None:
+        winners, full, tied = evaluate_boards(boards, self.use_numpy)
+        for index, board_data in enumerate(boards):
+            self.assertEqual(evaluate_with_board(board_data),
+                             (int(winners[index]), bool(full[index]),
+                              bool(tied[index])))
+
+    def test_empty_board_has_no_winner(self):
+        winners, full, tied = evaluate_boards([[[0] * 3] * 3], self.use_numpy)
+        self.assertEqual(0, winners[0])
+        self.assertFalse(full[0])
+        self.assertFalse(tied[0])
+
+    def test_drawn_board_is_tied(self):
+        board_data = [[2, 1, 1], [1, 2, 2], [2, 1, 1]]
+        winners, full, tied = evaluate_boards([board_data], self.use_numpy)
+        self.assertEqual(0, winners[0])
+        self.assertTrue(tied[0])
+
+    def test_full_board_with_winner_is_not_tied(self):
+        board_data = [[1, 1, 1], [2, 2, 1], [1, 2, 2]]
+        winners, full, tied = evaluate_boards([board_data], self.use_numpy)
+        self.assertEqual(1, winners[0])
+        self.assertTrue(full[0])
+        self.assertFalse(tied[0])
+
+    def test_results_match_board_on_random_boards(self):
+        generator = random.Random(2024)
+        for size in range(1, 7):
+            self.check_matches_board(make_random_boards(generator, 300, size))
+
+
+@unittest.skipIf(batch_evaluation.numpy is None, "NumPy is not installed")
+class TestEvaluateBoardsNumpy(TestEvaluateBoardsPython):
+    use_numpy = True
+
+    def test_accepts_contiguous_array(self):
+        numpy = batch_evaluation.numpy
+        boards = numpy.zeros((4, 3, 3), dtype=numpy.int8)
+        boards[2, :, 1] = 2
+        winners, full, tied = evaluate_boards(boards)
+        self.assertEqual([0, 0, 2, 0], winners.tolist())
@@ -0,0 +1,32 @@
+import os
+import sys
+import unittest
+
+# The benchmarks are scripts rather than part of the package.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir,
+                                "benchmarks"))
+from benchmark_suite import find_regressions  # noqa: E402
+
+
+class TestFindRegressions(unittest.TestCase):
+    def test_slowdown_over_threshold_is_a_regression(self):
+        self.assertEqual([("find_winner", 100.0, 126.0)],
+                         find_regressions({"find_winner": 100.0},
+                                          {"find_winner": 126.0}, 0.25))
+
+    def test_slowdown_up_to_threshold_is_allowed(self):
+        self.assertEqual([], find_regressions({"find_winner": 100.0},
+                                              {"find_winner": 125.0}, 0.25))
+
+    def test_speedup_is_not_a_regression(self):
+        self.assertEqual([], find_regressions({"find_winner": 100.0},
+                                              {"find_winner": 50.0}, 0.0))
+
+    def test_benchmarks_missing_from_either_side_are_ignored(self):
+        baseline = {"find_winner": 100.0, "is_board_full": 10.0}
+        results = {"find_winner": 200.0, "display_2d_board": 500.0}
+        self.assertEqual([("find_winner", 100.0, 200.0)],
+                         find_regressions(baseline, results, 0.25))
+
+    def test_empty_baseline_has_no_regressions(self):
+        self.assertEqual([], find_regressions({}, {"find_winner": 1.0}, 0.25))
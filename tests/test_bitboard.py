@@ -0,0 +1,98 @@
+from bitboard import BitBoard, get_win_masks
+from board import Board
+from board import MoveOutOfBoundsException, PositionAlreadyFilledException
+import random
+import unittest
+
+
+class TestBitBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = BitBoard()
+
+    def test_win_masks_cover_rows_columns_and_diagonals(self):
+        self.assertEqual(8, len(get_win_masks(3)))
+
+    def test_first_win_mask_is_first_row(self):
+        self.assertEqual(0b111, get_win_masks(3)[0])
+
+    def test_move_added_to_correct_cell(self):
+        self.board.add_player_move(1, 7)
+        self.assertEqual(1, self.board.get_board_data()[2][1])
+
+    def test_move_with_coordinates_added_to_correct_cell(self):
+        self.board.add_move_by_coordinates(2, 1, 2)
+        self.assertEqual(2, self.board.get_board_data()[1][2])
+
+    def test_move_below_zero_fails(self):
+        self.assertRaises(MoveOutOfBoundsException,
+                          self.board.add_player_move, 1, -1)
+
+    def test_move_higher_than_last_cell_number_fails(self):
+        self.assertRaises(MoveOutOfBoundsException,
+                          self.board.add_player_move, 1, 9)
+
+    def test_move_with_column_higher_than_board_size_fails(self):
+        self.assertRaises(MoveOutOfBoundsException,
+                          self.board.add_move_by_coordinates, 1, 0, 3)
+
+    def test_move_fails_if_cell_already_filled(self):
+        self.board.add_player_move(1, 0)
+        self.assertRaises(PositionAlreadyFilledException,
+                          self.board.add_player_move, 2, 0)
+
+    def test_find_winner_finds_diagonal_winner(self):
+        self.board.add_player_move(1, 2)
+        self.board.add_player_move(2, 0)
+        self.board.add_player_move(1, 4)
+        self.board.add_player_move(2, 1)
+        self.board.add_player_move(1, 6)
+        self.assertEqual(1, self.board.find_winner())
+
+    def test_find_winner_finds_no_winner(self):
+        self.assertEqual(0, self.board.find_winner())
+
+    def test_drawn_board_is_full(self):
+        for player, move in [(1, 8), (2, 5), (1, 7), (2, 6), (1, 2),
+                             (2, 0), (1, 3), (2, 4), (1, 1)]:
+            self.board.add_player_move(player, move)
+        self.assertTrue(self.board.is_board_full())
+        self.assertEqual(0, self.board.find_winner())
+
+    def test_player_bitsets_follow_moves(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 4)
+        self.board.add_player_move(1, 8)
+        self.assertEqual(0b100000001, self.board.get_player_bitset(1))
+        self.assertEqual(0b000010000, self.board.get_player_bitset(2))
+
+    def test_many_players_win_detected(self):
+        board = BitBoard(5, number_of_players=20)
+        for row in range(0, 5):
+            board.add_move_by_coordinates(17, row, 3)
+            if row < 4:
+                board.add_move_by_coordinates(20, row, 0)
+                self.assertEqual(0, board.find_winner())
+        self.assertEqual(17, board.find_winner())
+
+    def test_player_above_number_of_players_rejected(self):
+        board = BitBoard(number_of_players=3)
+        with self.assertRaises(ValueError):
+            board.add_player_move(4, 0)
+        self.assertEqual(0, board.get_player_bitset(3))
+
+    def test_results_match_board_on_random_positions(self):
+        generator = random.Random(1234)
+        for size in range(3, 7):
+            for _ in range(200):
+                board = Board(size)
+                bitboard = BitBoard(size)
+                for move in range(0, size * size):
+                    player = generator.randrange(0, 3)
+                    if player:
+                        board.add_player_move(player, move)
+                        bitboard.add_player_move(player, move)
+                self.assertEqual(board.find_winner(), bitboard.find_winner())
+                self.assertEqual(board.is_board_full(),
+                                 bitboard.is_board_full())
+                self.assertEqual(board.get_board_data(),
+                                 bitboard.get_board_data())
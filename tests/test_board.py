@@ -1,5 +1,9 @@
-from board import Board
+from board import Board, BoardSnapshot
 from board import MoveOutOfBoundsException, PositionAlreadyFilledException
+from board import NoMoveToUndoException
+import copy
+import pickle
+import random
 import unittest
 
 
@@ -214,5 +218,376 @@ class TestBoard(unittest.TestCase):
         self.board.add_player_move(1, 7)
         self.assertFalse(self.board.is_board_full())
 
+    def test_winner_found_once_move_completes_line(self):
+        self.board.add_player_move(1, 2)
+        self.board.add_player_move(1, 5)
+        self.assertEqual(0, self.board.find_winner())
+        self.board.add_player_move(1, 8)
+        self.assertEqual(1, self.board.find_winner())
+
+    def test_find_winner_matches_scanning_on_random_positions(self):
+        generator = random.Random(42)
+        for size in range(1, 7):
+            for _ in range(200):
+                board = Board(size)
+                moves = list(range(0, size * size))
+                generator.shuffle(moves)
+                for move in moves[:generator.randrange(0, size * size + 1)]:
+                    board.add_player_move(generator.randrange(1, 3), move)
+                winner = board.find_horizontal_winner()
+                if winner == 0:
+                    winner = board.find_vertical_winner()
+                if winner == 0:
+                    winner = board.find_diagonal_winner()
+                self.assertEqual(winner, board.find_winner())
+                full = all(board.empty not in row for row in board._board)
+                self.assertEqual(full, board.is_board_full())
+
+    def test_win_length_defaults_to_board_size(self):
+        self.assertEqual(3, self.board.win_length)
+
+    def test_win_length_longer_than_board_fails(self):
+        self.assertRaises(ValueError, Board, 3, 4)
+
+    def test_win_length_below_one_fails(self):
+        self.assertRaises(ValueError, Board, 3, 0)
+
+    def test_short_row_wins_with_win_length(self):
+        board = Board(7, 4)
+        for column in range(2, 5):
+            board.add_move_by_coordinates(1, 3, column)
+        self.assertEqual(0, board.find_winner())
+        board.add_move_by_coordinates(1, 3, 1)
+        self.assertEqual(1, board.find_winner())
+
+    def test_off_centre_diagonal_wins_with_win_length(self):
+        board = Board(6, 3)
+        board.add_move_by_coordinates(2, 0, 3)
+        board.add_move_by_coordinates(2, 2, 1)
+        board.add_move_by_coordinates(2, 1, 2)
+        self.assertEqual(2, board.find_winner())
+
+    def test_broken_run_does_not_win_with_win_length(self):
+        board = Board(6, 3)
+        board.add_move_by_coordinates(1, 0, 0)
+        board.add_move_by_coordinates(2, 0, 1)
+        board.add_move_by_coordinates(1, 0, 2)
+        board.add_move_by_coordinates(1, 0, 3)
+        self.assertEqual(0, board.find_winner())
+
+    def test_win_length_matches_full_scan_on_random_games(self):
+        generator = random.Random(7)
+        for _ in range(100):
+            size = generator.randrange(4, 9)
+            win_length = generator.randrange(2, size)
+            board = Board(size, win_length)
+            moves = list(range(0, size * size))
+            generator.shuffle(moves)
+            player = 1
+            for move in moves:
+                board.add_player_move(player, move)
+                expected = find_run_by_full_scan(board._board, win_length)
+                self.assertEqual(expected != 0, board.find_winner() != 0)
+                if expected:
+                    self.assertEqual(player, board.find_winner())
+                    break
+                player = 3 - player
+
+    def test_reset_clears_cells_and_winner(self):
+        self.set_up_draw()
+        self.board.reset()
+        self.assertEqual([[0] * 3] * 3, self.board.get_board_data())
+        self.assertFalse(self.board.is_board_full())
+        self.board.add_player_move(2, 0)
+        self.board.add_player_move(2, 4)
+        self.board.add_player_move(2, 8)
+        self.assertEqual(2, self.board.find_winner())
+
+    def test_copy_is_independent_of_original(self):
+        self.board.add_player_move(1, 0)
+        board_copy = self.board.copy()
+        board_copy.add_player_move(1, 1)
+        board_copy.add_player_move(1, 2)
+        self.assertEqual(1, board_copy.find_winner())
+        self.assertEqual(0, self.board.find_winner())
+        self.assertEqual(0, self.board._board[0][1])
+
+    def test_zobrist_hash_depends_only_on_position(self):
+        other_board = Board()
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 4)
+        other_board.add_player_move(2, 4)
+        other_board.add_player_move(1, 0)
+        self.assertEqual(self.board.get_zobrist_hash(),
+                         other_board.get_zobrist_hash())
+
+    def test_zobrist_hash_depends_on_player(self):
+        other_board = Board()
+        self.board.add_player_move(1, 0)
+        other_board.add_player_move(2, 0)
+        self.assertNotEqual(self.board.get_zobrist_hash(),
+                            other_board.get_zobrist_hash())
+
+    def test_zobrist_hash_first_taken_after_moves(self):
+        # The keys are only looked up on the first call, so the hash of
+        # moves made before it must still match one kept from the start.
+        other_board = Board()
+        other_board.get_zobrist_hash()
+        for player, move in ((1, 0), (2, 4), (1, 8)):
+            self.board.add_player_move(player, move)
+            other_board.add_player_move(player, move)
+        self.assertEqual(other_board.get_zobrist_hash(),
+                         self.board.get_zobrist_hash())
+        self.board.undo_move()
+        other_board.undo_move()
+        self.assertEqual(other_board.get_zobrist_hash(),
+                         self.board.get_zobrist_hash())
+
+    def test_undo_move_clears_cell(self):
+        self.board.add_player_move(1, 4)
+        self.assertEqual(4, self.board.undo_move())
+        self.assertEqual(0, self.board._board[1][1])
+        self.assertEqual(0, self.board.get_filled_cell_count())
+
+    def test_undo_with_no_moves_fails(self):
+        self.assertRaises(NoMoveToUndoException, self.board.undo_move)
+
+    def test_undo_winning_move_removes_winner(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(1, 4)
+        self.board.add_player_move(1, 8)
+        self.board.undo_move()
+        self.assertEqual(0, self.board.find_winner())
+
+    def test_undo_restores_full_board_and_hash(self):
+        empty_hash = self.board.get_zobrist_hash()
+        self.set_up_draw()
+        self.assertTrue(self.board.is_board_full())
+        for _ in range(0, 9):
+            self.board.undo_move()
+        self.assertFalse(self.board.is_board_full())
+        self.assertEqual(empty_hash, self.board.get_zobrist_hash())
+
+    def test_undo_restores_state_on_random_games(self):
+        generator = random.Random(11)
+        for _ in range(100):
+            size = generator.randrange(3, 7)
+            win_length = generator.randrange(2, size + 1)
+            board = Board(size, win_length)
+            moves = list(range(0, size * size))
+            generator.shuffle(moves)
+            history = []
+            for move in moves:
+                history.append((board.get_cells(), board.find_winner(),
+                                board.is_board_full(),
+                                board.get_zobrist_hash()))
+                board.add_player_move(generator.randrange(1, 3), move)
+            for state in reversed(history):
+                board.undo_move()
+                self.assertEqual(state, (board.get_cells(),
+                                         board.find_winner(),
+                                         board.is_board_full(),
+                                         board.get_zobrist_hash()))
+
+    def test_new_board_has_every_move_empty(self):
+        self.assertEqual(list(range(0, 9)), self.board.get_empty_moves())
+
+    def test_filled_cells_removed_from_empty_moves(self):
+        self.board.add_player_move(1, 4)
+        self.board.add_player_move(2, 0)
+        self.assertEqual([1, 2, 3, 5, 6, 7, 8], self.board.get_empty_moves())
+        self.assertEqual(7, self.board.get_empty_move_count())
+
+    def test_random_empty_move_is_empty(self):
+        generator = random.Random(3)
+        for move in range(0, 8):
+            self.board.add_player_move(1, move)
+        for _ in range(0, 10):
+            self.assertEqual(8, self.board.get_random_empty_move(generator))
+
+    def test_undo_restores_empty_move_index_exactly(self):
+        generator = random.Random(5)
+        board = Board(5)
+        history = []
+        while board.get_empty_move_count():
+            history.append(list(board._empty_moves))
+            board.add_player_move(1, board.get_random_empty_move(generator))
+        for empty_moves in reversed(history):
+            board.undo_move()
+            self.assertEqual(empty_moves, list(board._empty_moves))
+
+    def test_board_has_no_instance_dictionary(self):
+        self.assertFalse(hasattr(self.board, "__dict__"))
+
+    def test_snapshot_records_cells(self):
+        self.board.add_player_move(2, 5)
+        snapshot = self.board.snapshot()
+        self.assertEqual(2, snapshot.get_cell(1, 2))
+        self.assertEqual(9, len(snapshot.get_cells()))
+
+    def test_snapshot_is_not_changed_by_later_moves(self):
+        snapshot = self.board.snapshot()
+        self.board.add_player_move(1, 0)
+        self.assertEqual(0, snapshot.get_cell(0, 0))
+
+    def test_equal_positions_have_equal_snapshots(self):
+        other_board = Board()
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 8)
+        other_board.add_player_move(2, 8)
+        other_board.add_player_move(1, 0)
+        positions = {self.board.snapshot(): "first"}
+        self.assertEqual("first", positions[other_board.snapshot()])
+
+    def test_snapshots_of_different_sizes_differ(self):
+        self.assertNotEqual(BoardSnapshot(2, bytes(4)),
+                            BoardSnapshot(1, bytes(1)))
+        self.assertNotEqual(Board(2).snapshot(), Board(3).snapshot())
+
+    def test_snapshot_is_immutable(self):
+        snapshot = self.board.snapshot()
+        self.assertRaises(AttributeError, setattr, snapshot, "size", 4)
+
+    def test_snapshot_survives_pickle_and_deepcopy(self):
+        self.board.add_player_move(1, 4)
+        self.board.add_player_move(2, 0)
+        snapshot = self.board.snapshot()
+        for restored in (pickle.loads(pickle.dumps(snapshot)),
+                         copy.deepcopy(snapshot)):
+            self.assertEqual(snapshot, restored)
+            self.assertEqual(hash(snapshot), hash(restored))
+            self.assertEqual(2, restored.get_cell(0, 0))
+
+    def test_snapshot_with_wrong_number_of_cells_fails(self):
+        self.assertRaises(ValueError, BoardSnapshot, 3, bytes(8))
+
+    def test_snapshot_converts_back_to_board(self):
+        self.set_up_draw()
+        board = self.board.snapshot().to_board()
+        self.assertEqual(self.board.get_board_data(), board.get_board_data())
+        self.assertTrue(board.is_board_full())
+
+    def test_cell_buffer_follows_moves_without_copying(self):
+        cells = self.board.get_cell_buffer()
+        self.board.add_player_move(1, 4)
+        self.board.add_player_move(2, 0)
+        self.assertEqual(bytes([2, 0, 0, 0, 1, 0, 0, 0, 0]), cells.tobytes())
+        self.board.undo_move()
+        self.assertEqual(0, cells[0])
+        self.board.reset()
+        self.assertEqual(bytes(9), cells.tobytes())
+
+    def test_cell_buffer_is_read_only(self):
+        cells = self.board.get_cell_buffer()
+        self.assertTrue(cells.readonly)
+        with self.assertRaises(TypeError):
+            cells[0] = 1
+
+    def test_cell_buffer_matches_board_data(self):
+        self.set_up_draw()
+        rows = self.board.get_cell_buffer().cast("B", (3, 3)).tolist()
+        self.assertEqual(self.board.get_board_data(), rows)
+
+    def test_copy_has_its_own_cell_buffer(self):
+        board_copy = self.board.copy()
+        board_copy.add_player_move(1, 4)
+        self.assertEqual(0, self.board.get_cell_buffer()[4])
+
+    def test_player_bitsets_follow_moves(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 4)
+        self.board.add_player_move(1, 8)
+        self.assertEqual(0b100000001, self.board.get_player_bitset(1))
+        self.assertEqual(0b000010000, self.board.get_player_bitset(2))
+        self.board.undo_move()
+        self.assertEqual(0b1, self.board.get_player_bitset(1))
+
+    def test_room_made_for_later_players_keeps_counts(self):
+        self.board.add_player_move(1, 0)
+        self.board.add_player_move(2, 4)
+        self.board.add_player_move(1, 1)
+        self.assertEqual(0, self.board.get_player_bitset(5))
+        self.board.add_player_move(5, 6)
+        self.assertEqual(0b1000000, self.board.get_player_bitset(5))
+        self.board.add_player_move(1, 2)
+        self.assertEqual(1, self.board.find_winner())
+        self.board.undo_move()
+        self.board.add_player_move(5, 7)
+        self.board.add_player_move(5, 8)
+        self.assertEqual(5, self.board.find_winner())
+
+    def test_copy_has_its_own_player_bitsets(self):
+        board_copy = self.board.copy()
+        board_copy.add_player_move(1, 4)
+        self.assertEqual(0, self.board.get_player_bitset(1))
+
+    def test_many_players_on_large_board(self):
+        board = Board(12, number_of_players=12)
+        # Each player fills most of one column, then player 12 finishes
+        # theirs.
+        for row in range(0, 11):
+            for player in range(1, 13):
+                board.add_move_by_coordinates(player, row, player - 1)
+        self.assertEqual(0, board.find_winner())
+        board.add_move_by_coordinates(12, 11, 11)
+        self.assertEqual(12, board.find_winner())
+        column_11 = sum(1 << (row * 12 + 11) for row in range(0, 12))
+        self.assertEqual(column_11, board.get_player_bitset(12))
+
+    def test_player_above_number_of_players_rejected(self):
+        board = Board(number_of_players=3)
+        board.add_player_move(3, 0)
+        with self.assertRaises(ValueError):
+            board.add_player_move(4, 1)
+        with self.assertRaises(ValueError):
+            board.add_player_move(0, 1)
+        self.assertEqual(1, board.get_filled_cell_count())
+
+    def test_number_of_players_must_fit_in_a_byte(self):
+        Board(number_of_players=255)
+        with self.assertRaises(ValueError):
+            Board(number_of_players=256)
+        with self.assertRaises(ValueError):
+            Board(number_of_players=0)
+
+    def test_zobrist_hash_independent_of_number_of_players(self):
+        board = Board(number_of_players=20)
+        board.add_player_move(2, 4)
+        self.board.add_player_move(2, 4)
+        self.assertEqual(self.board.get_zobrist_hash(),
+                         board.get_zobrist_hash())
+        board.undo_move()
+        board.add_player_move(20, 4)
+        self.assertNotEqual(self.board.get_zobrist_hash(),
+                            board.get_zobrist_hash())
+        self.assertNotEqual(0, board.get_zobrist_hash())
+
+    def test_snapshot_with_many_players_to_board(self):
+        board = Board(number_of_players=10)
+        board.add_player_move(10, 4)
+        restored = board.snapshot().to_board()
+        self.assertEqual(10, restored.number_of_players)
+        self.assertEqual(board.get_zobrist_hash(), restored.get_zobrist_hash())
+
     def test_max_move_calculated_correctly(self):
         self.assertEqual(8, self.board.get_maximum_move())
+
+
+def find_run_by_full_scan(board_data: list[list], win_length: int) -> int:
+    """Find any run of win_length equal pieces by checking every cell."""
+    size = len(board_data)
+    for row in range(0, size):
+        for column in range(0, size):
+            player = board_data[row][column]
+            if player == 0:
+                continue
+            for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + row_step * (win_length - 1)
+                end_column = column + column_step * (win_length - 1)
+                if not (0 <= end_row < size and 0 <= end_column < size):
+                    continue
+                if all(board_data[row + row_step * step]
+                       [column + column_step * step] == player
+                       for step in range(0, win_length)):
+                    return player
+    return 0
@@ -0,0 +1,153 @@
+from console_ui import ConsoleUI, PLAYER_SYMBOLS, build_player_map
+from console_ui import DISPLAY_WINDOW_SIZE, format_row_separator
+from sparse_board import SparseBoard
+import contextlib
+import io
+import unittest
+
+
+
+PLAYER_MAP = {0: ' ', 1: 'X', 2: 'O'}
+
+
+class TestConsoleUI(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.ui = ConsoleUI(PLAYER_MAP, output=self.output)
+        self.board_data = [[1, 0, 2], [0, 1, 0], [2, 0, 0]]
+
+    def test_board_displayed_in_grid(self):
+        self.ui.display_2d_board(self.board_data)
+        self.assertEqual("X |   | O\n"
+                         "---------\n"
+                         "  | X |  \n"
+                         "---------\n"
+                         "O |   |  \n"
+                         "\n", self.output.getvalue())
+
+    def test_board_written_in_one_call(self):
+        writes = []
+        self.output.write = writes.append
+        self.ui.display_2d_board(self.board_data)
+        self.assertEqual(1, len(writes))
+
+    def test_displays_to_stdout_by_default(self):
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            ConsoleUI(PLAYER_MAP).display_2d_board(self.board_data)
+        self.assertTrue(captured.getvalue().startswith("X |   | O\n"))
+
+    def test_custom_separators(self):
+        self.ui.display_2d_board([[1, 2], [2, 1]], "=", "|")
+        self.assertEqual("X|O\n===\nO|X\n\n", self.output.getvalue())
+
+    def test_row_separator_is_cached(self):
+        first = format_row_separator(7, "-", " | ")
+        self.assertIs(first, format_row_separator(7, "-", " | "))
+        self.assertEqual(25, len(first))
+
+    def test_player_map_derived_from_number_of_players(self):
+        ui = ConsoleUI(number_of_players=4, output=self.output)
+        self.assertEqual({0: ' ', 1: 'X', 2: 'O', 3: 'A', 4: 'B'},
+                         ui.player_map)
+
+    def test_player_symbols_are_unique(self):
+        player_map = build_player_map(len(PLAYER_SYMBOLS))
+        self.assertEqual(len(player_map), len(set(player_map.values())))
+
+    def test_wide_symbols_when_single_characters_run_out(self):
+        player_map = build_player_map(len(PLAYER_SYMBOLS) + 1)
+        self.assertEqual(" 1", player_map[1])
+        self.assertEqual("  ", player_map[0])
+        ui = ConsoleUI(player_map, output=self.output)
+        ui.display_2d_board([[1, 0], [0, 55]])
+        self.assertEqual(" 1 |   \n-------\n   | 55\n\n",
+                         self.output.getvalue())
+
+    def test_first_diff_frame_clears_screen_and_draws_board(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board_data)
+        self.assertTrue(self.output.getvalue().startswith("\x1b[2J\x1b[H"))
+        self.assertIn("  | X |  \n", self.output.getvalue())
+
+    def test_diff_frame_redraws_only_changed_cells(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board_data)
+        self.output.seek(0)
+        self.output.truncate()
+        self.board_data[2][1] = 1
+        ui.display_2d_board(self.board_data)
+        self.assertEqual("\x1b7\x1b[5;5HX\x1b8", self.output.getvalue())
+
+    def test_unchanged_diff_frame_writes_nothing(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board_data)
+        self.output.seek(0)
+        self.output.truncate()
+        ui.display_2d_board(self.board_data)
+        self.assertEqual("", self.output.getvalue())
+
+    def test_diff_frame_redraws_all_when_size_changes(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board_data)
+        self.output.seek(0)
+        self.output.truncate()
+        ui.display_2d_board([[1, 2], [0, 0]])
+        self.assertTrue(self.output.getvalue().startswith("\x1b[2J"))
+
+
+class TestConsoleUISparseBoard(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.board = SparseBoard(10000)
+        self.board.add_move_by_coordinates(1, 5000, 5000)
+        self.board.add_move_by_coordinates(2, 5001, 5003)
+        self.cells_read = 0
+        get_cell = self.board.get_cell
+
+        def count_cell_reads(row, column):
+            self.cells_read += 1
+            return get_cell(row, column)
+
+        self.board.get_cell = count_cell_reads
+
+    def test_only_window_around_occupied_cells_read(self):
+        ui = ConsoleUI(PLAYER_MAP, output=self.output)
+        ui.display_2d_board(self.board.get_board_data())
+        self.assertEqual(DISPLAY_WINDOW_SIZE ** 2, self.cells_read)
+        lines = self.output.getvalue().split("\n")
+        self.assertEqual(2 * DISPLAY_WINDOW_SIZE, len(lines) - 2)
+        self.assertEqual("Rows 4991-5009, columns 4992-5010 of 10000",
+                         lines[-3])
+        self.assertEqual(1, lines[18].count("X"))
+        self.assertEqual(1, lines[20].count("O"))
+
+    def test_diff_frame_reads_only_window(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board.get_board_data())
+        self.output.seek(0)
+        self.output.truncate()
+        self.cells_read = 0
+        self.board.add_move_by_coordinates(1, 4995, 4995)
+        ui.display_2d_board(self.board.get_board_data())
+        self.assertEqual(DISPLAY_WINDOW_SIZE ** 2, self.cells_read)
+        self.assertEqual("\x1b7\x1b[9;13HX\x1b8", self.output.getvalue())
+
+    def test_window_moves_when_move_played_outside_it(self):
+        ui = ConsoleUI(PLAYER_MAP, diff_mode=True, output=self.output)
+        ui.display_2d_board(self.board.get_board_data())
+        self.output.seek(0)
+        self.output.truncate()
+        self.board.add_move_by_coordinates(1, 0, 9999)
+        ui.display_2d_board(self.board.get_board_data())
+        self.assertTrue(self.output.getvalue().startswith("\x1b[2J"))
+        self.assertIn("Rows 2491-2509, columns 7490-7508 of 10000",
+                      self.output.getvalue())
+
+    def test_small_sparse_board_shown_whole(self):
+        board = SparseBoard(3)
+        board.add_player_move(1, 4)
+        ui = ConsoleUI(PLAYER_MAP, output=self.output)
+        ui.display_2d_board(board.get_board_data())
+        self.assertEqual("  |   |  \n---------\n  | X |  \n---------\n"
+                         "  |   |  \n\n", self.output.getvalue())
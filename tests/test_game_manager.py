@@ -1,4 +1,7 @@
+from board import Board
 from game_manager import GameManager
+from simulation import HeadlessUI
+from strategies import ScriptedStrategy
 import unittest
 
 
@@ -14,3 +17,28 @@ class TestGameManager(unittest.TestCase):
         self.game_manager.switch_players()
         self.game_manager.switch_players()
         self.assertEqual(1, self.game_manager.current_player)
+
+    def test_strategy_move_added_to_board(self):
+        game_manager = GameManager(ui=HeadlessUI({}),
+                                   strategies={1: ScriptedStrategy([4])})
+        game_manager.take_current_player_turn()
+        self.assertEqual(1, game_manager.board.get_board_data()[1][1])
+
+    def test_headless_game_plays_to_completion(self):
+        game_manager = GameManager(ui=HeadlessUI({}),
+                                   strategies={1: ScriptedStrategy([0, 1, 2]),
+                                               2: ScriptedStrategy([3, 4])})
+        game_manager.main()
+        self.assertEqual(1, game_manager.board.find_winner())
+
+    def test_four_players_take_turns(self):
+        game_manager = GameManager(
+            Board(4, 2, number_of_players=4), HeadlessUI({}),
+            number_of_players=4,
+            strategies={1: ScriptedStrategy([0, 4]),
+                        2: ScriptedStrategy([1, 5]),
+                        3: ScriptedStrategy([2, 6]),
+                        4: ScriptedStrategy([3, 7])})
+        game_manager.main()
+        self.assertEqual(1, game_manager.board.find_winner())
+        self.assertEqual('A', game_manager.player_map[3])
@@ -0,0 +1,142 @@
+from game_manager import GameManager
+from game_record import (GameRecord, GameRecordException, GameRecordWriter,
+                         RECORD_HEADER_LENGTH, decode_record,
+                         decode_varint, encode_record, encode_varint,
+                         read_records)
+from simulation import HeadlessUI
+from strategies import ScriptedStrategy
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestVarints(unittest.TestCase):
+    def test_small_value_takes_one_byte(self):
+        buffer = bytearray()
+        encode_varint(127, buffer)
+        self.assertEqual(b"\x7f", bytes(buffer))
+
+    def test_large_value_round_trips(self):
+        for value in [0, 128, 300, 16384, 2 ** 40]:
+            buffer = bytearray()
+            encode_varint(value, buffer)
+            self.assertEqual((value, len(buffer)), decode_varint(buffer, 0))
+
+    def test_negative_value_rejected(self):
+        self.assertRaises(ValueError, encode_varint, -1, bytearray())
+
+
+class TestGameRecordEncoding(unittest.TestCase):
+    def test_3x3_game_takes_one_byte_per_field(self):
+        record = GameRecord(3, 3, 2, [4, 0, 8, 2, 6], 0)
+        self.assertEqual(bytes([3, 3, 2, 5, 4, 0, 8, 2, 6, 0]),
+                         encode_record(record))
+
+    def test_record_round_trips(self):
+        record = GameRecord(3, 3, 2, [0, 3, 1, 4, 2], 1)
+        self.assertEqual((record, 10), decode_record(encode_record(record)))
+
+    def test_large_board_record_round_trips(self):
+        record = GameRecord(100, 5, 3, [0, 127, 128, 9999], 3)
+        data = encode_record(record)
+        self.assertEqual((record, len(data)), decode_record(data))
+
+    def test_truncated_record_raises_index_error(self):
+        data = encode_record(GameRecord(3, 3, 2, [0, 3, 1], 0))
+        self.assertRaises(IndexError, decode_record, data[:-2])
+
+
+class TestGameRecordFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.ttr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_read_back_in_order(self):
+        records = [GameRecord(3, 3, 2, [move, (move + 1) % 9], 0)
+                   for move in range(0, 9)]
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+        self.assertEqual(records, list(read_records(self.path)))
+
+    def test_records_span_chunk_boundaries(self):
+        records = [GameRecord(20, 5, 2, list(range(move, move + 200)), 2)
+                   for move in range(0, 50)]
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+        self.assertEqual(records, list(read_records(self.path, chunk_size=7)))
+
+    def test_writer_appends_to_existing_file(self):
+        first = GameRecord(3, 3, 2, [4], 0)
+        second = GameRecord(4, 4, 2, [15], 0)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(first)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(second)
+        self.assertEqual([first, second], list(read_records(self.path)))
+
+    def test_writer_rejects_other_files(self):
+        with open(self.path, "wb") as other_file:
+            other_file.write(b"not a record file")
+        self.assertRaises(GameRecordException, GameRecordWriter, self.path)
+
+    def test_truncated_file_raises_exception(self):
+        with GameRecordWriter(self.path) as writer:
+            writer.write(GameRecord(3, 3, 2, [0, 3, 1], 0))
+        with open(self.path, "r+b") as record_file:
+            record_file.truncate(RECORD_HEADER_LENGTH + 5)
+        self.assertRaises(GameRecordException, list, read_records(self.path))
+
+    def test_writer_drops_truncated_record_before_appending(self):
+        first = GameRecord(3, 3, 2, [4], 0)
+        second = GameRecord(4, 4, 2, [15], 0)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(first)
+            writer.write(GameRecord(3, 3, 2, [0, 3, 1], 0))
+        with open(self.path, "r+b") as record_file:
+            record_file.truncate(os.path.getsize(self.path) - 2)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(second)
+        self.assertEqual([first, second], list(read_records(self.path)))
+
+    def test_writer_does_not_reread_checked_records(self):
+        with GameRecordWriter(self.path) as writer:
+            for move in range(0, 9):
+                writer.write(GameRecord(3, 3, 2, [move], 0))
+        with mock.patch("game_record.decode_record") as decode:
+            with GameRecordWriter(self.path):
+                pass
+        decode.assert_not_called()
+
+    def test_writer_checks_only_records_after_header_length(self):
+        first = GameRecord(3, 3, 2, [4], 0)
+        second = GameRecord(3, 3, 2, [0, 3, 1], 0)
+        third = GameRecord(4, 4, 2, [15], 0)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(first)
+        # Records written after the header was last updated, as by a run
+        # which was interrupted partway through writing the second one.
+        with open(self.path, "ab") as record_file:
+            record_file.write(encode_record(first))
+            record_file.write(encode_record(second)[:-2])
+        with mock.patch("game_record.decode_record",
+                        wraps=decode_record) as decode:
+            with GameRecordWriter(self.path) as writer:
+                writer.write(third)
+        self.assertEqual(2, decode.call_count)
+        self.assertEqual([first, first, third], list(read_records(self.path)))
+
+    def test_game_manager_records_finished_game(self):
+        with GameRecordWriter(self.path) as writer:
+            game_manager = GameManager(
+                ui=HeadlessUI({}), recorder=writer,
+                strategies={1: ScriptedStrategy([0, 1, 2]),
+                            2: ScriptedStrategy([3, 4])})
+            game_manager.main()
+        self.assertEqual([GameRecord(3, 3, 2, [0, 3, 1, 4, 2], 1)],
+                         list(read_records(self.path)))
@@ -0,0 +1,168 @@
+from game_record import GameRecord, GameRecordWriter, read_records
+from game_server import IDLE_MESSAGE, SERVER_FULL_MESSAGE, GameServer
+from strategies import PlayerStrategy
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+
+class SlowStrategy(PlayerStrategy):
+    """A strategy which takes a while to choose the first empty cell."""
+
+    def choose_move(self, board, player):
+        time.sleep(0.5)
+        return board.get_empty_moves()[0]
+
+
+class StalledWriter:
+    """A stream writer for a client which never reads what is sent."""
+
+    def __init__(self):
+        self.transport = self
+        self.aborted = False
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        await asyncio.Event().wait()
+
+    def abort(self):
+        self.aborted = True
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+async def read_until_prompt(reader: asyncio.StreamReader) -> None:
+    """Read lines from the server until it prompts for a move."""
+    while not (await reader.readline()).startswith(b"Next move"):
+        pass
+
+
+async def play(server: GameServer, lines: list[str],
+               wait: float = 0.0) -> list[str]:
+    """
+    Connect to a new server, send the given lines and collect the replies.
+    :param server: the game server to start.
+    :param lines: the lines to send, one after each prompt.
+    :param wait: seconds to wait before sending each line.
+    :returns: every line received, without line breaks.
+    """
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    received = []
+    lines = list(lines)
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        received.append(line.decode().rstrip("\n"))
+        if received[-1].startswith("Next move") and lines:
+            await asyncio.sleep(wait)
+            writer.write((lines.pop(0) + "\n").encode())
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return received
+
+
+class TestGameServer(unittest.TestCase):
+    def test_game_played_to_win(self):
+        received = asyncio.run(play(GameServer(),
+                                    ["0", "3", "1", "4", "2"]))
+        self.assertEqual("Next move for player X (0-8): ", received[6])
+        self.assertEqual(["X | X | X", "---------", "O | O |  ", "---------",
+                          "  |   |  ", "", "Player X wins!"], received[-7:])
+
+    def test_invalid_input_shows_console_errors(self):
+        server = GameServer()
+        received = asyncio.run(play(server, ["four", "9", "4", "4", "0", "2",
+                                             "6", "3", "5", "1", "7", "8"]))
+        self.assertEqual(3, received.count("Invalid move, try again."))
+        self.assertEqual("It's a tie!", received[-1])
+        self.assertEqual(1, server.games_finished)
+
+    def test_computer_opponent_plays_player_2(self):
+        received = asyncio.run(play(GameServer(opponent="alpha_beta"),
+                                    ["0", "1", "2", "3", "5", "6", "7", "8"]))
+        self.assertNotIn("Next move for player O (0-8): ", received)
+        self.assertIn(received[-1], ["Player O wins!", "It's a tie!"])
+
+    def test_opponent_strategies_reused_between_games(self):
+        server = GameServer(opponent="alpha_beta")
+        for _ in range(0, 3):
+            received = asyncio.run(play(server, [str(move) for move
+                                                 in range(0, 9)]))
+            self.assertIn(received[-1], ["Player O wins!", "It's a tie!"])
+        self.assertEqual(3, server.games_finished)
+        self.assertEqual(1, server.opponents_created)
+
+    def test_slow_opponent_does_not_stall_other_games(self):
+        async def time_second_prompt(server):
+            listener = await server.start()
+            port = listener.sockets[0].getsockname()[1]
+            first_reader, first_writer = await asyncio.open_connection(
+                "127.0.0.1", port)
+            await read_until_prompt(first_reader)
+            # The client shares the server's event loop, so time from
+            # before the first game's opponent starts choosing its move.
+            start = time.perf_counter()
+            first_writer.write(b"4\n")
+            await asyncio.sleep(0.05)
+            second_reader, second_writer = await asyncio.open_connection(
+                "127.0.0.1", port)
+            await read_until_prompt(second_reader)
+            elapsed = time.perf_counter() - start
+            first_writer.close()
+            second_writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return elapsed
+
+        with mock.patch.dict("tournament.STRATEGY_FACTORIES",
+                             {"slow": SlowStrategy}):
+            server = GameServer(opponent="slow")
+            self.assertLess(asyncio.run(time_second_prompt(server)), 0.4)
+
+    def test_idle_game_evicted(self):
+        server = GameServer(idle_timeout=0.05)
+        received = asyncio.run(play(server, ["4"], wait=0.2))
+        self.assertEqual(IDLE_MESSAGE, received[-1])
+        self.assertEqual(1, server.games_evicted)
+        self.assertEqual(0, server.active_games)
+
+    def test_client_not_reading_evicted(self):
+        async def connect(server, writer):
+            await server.handle_connection(asyncio.StreamReader(), writer)
+
+        server = GameServer(idle_timeout=0.05)
+        writer = StalledWriter()
+        asyncio.run(connect(server, writer))
+        self.assertTrue(writer.aborted)
+        self.assertEqual(1, server.games_evicted)
+        self.assertEqual(0, server.active_games)
+
+    def test_full_server_refuses_connection(self):
+        server = GameServer(max_games=0)
+        received = asyncio.run(play(server, []))
+        self.assertEqual([SERVER_FULL_MESSAGE], received)
+
+    def test_finished_game_recorded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.ttr")
+            with GameRecordWriter(path) as writer:
+                asyncio.run(play(GameServer(recorder=writer),
+                                 ["0", "3", "1", "4", "2"]))
+            self.assertEqual([GameRecord(3, 3, 2, [0, 3, 1, 4, 2], 1)],
+                             list(read_records(path)))
+
+    def test_unknown_opponent_fails(self):
+        self.assertRaises(KeyError, GameServer, opponent="telepathic")
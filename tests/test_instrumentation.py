@@ -0,0 +1,66 @@
+from game_manager import GameManager
+from instrumentation import GameInstrumentation, LatencyHistogram, PHASES
+from simulation import HeadlessUI
+from strategies import ScriptedStrategy
+import json
+import unittest
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_latency_counted_in_first_bucket_that_fits(self):
+        histogram = LatencyHistogram((0.001, 0.01))
+        histogram.observe(0.005)
+        histogram.observe(0.01)
+        histogram.observe(5.0)
+        self.assertEqual([0, 2, 1], histogram.counts)
+        self.assertEqual(3, histogram.observations)
+
+    def test_cumulative_counts(self):
+        histogram = LatencyHistogram((0.001, 0.01))
+        for seconds in [0.0001, 0.005, 5.0]:
+            histogram.observe(seconds)
+        self.assertEqual([1, 2, 3], histogram.get_cumulative_counts())
+
+
+class TestGameInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = GameInstrumentation()
+        # Player 1 tries an occupied cell and an out of bounds move first.
+        game_manager = GameManager(
+            ui=HeadlessUI({}), instrumentation=self.instrumentation,
+            strategies={1: ScriptedStrategy([0, 3, 9, 1, 2]),
+                        2: ScriptedStrategy([3, 4])})
+        game_manager.main()
+
+    def test_every_phase_timed(self):
+        counts = {phase: self.instrumentation.histograms[(phase, 3)]
+                  .observations for phase in PHASES}
+        self.assertEqual({"display_board": 6, "check_for_winner": 6,
+                          "check_for_tie": 5,
+                          "take_current_player_turn": 5}, counts)
+
+    def test_retries_counted_by_exception(self):
+        self.assertEqual({"PositionAlreadyFilledException": 1,
+                          "MoveOutOfBoundsException": 1},
+                         dict(self.instrumentation.retries))
+
+    def test_json_export(self):
+        exported = json.loads(self.instrumentation.to_json())
+        self.assertEqual(6, exported["phases"]["display_board"]["3"]["count"])
+        self.assertEqual(1, exported["retries"]["MoveOutOfBoundsException"])
+
+    def test_prometheus_export(self):
+        lines = self.instrumentation.to_prometheus().splitlines()
+        self.assertIn("# TYPE tictactoe_phase_seconds histogram", lines)
+        self.assertIn('tictactoe_phase_seconds_bucket{phase="check_for_tie",'
+                      'board_size="3",le="+Inf"} 5', lines)
+        self.assertIn('tictactoe_invalid_move_retries_total'
+                      '{exception="MoveOutOfBoundsException"} 1', lines)
+
+    def test_uninstrumented_game_unchanged(self):
+        game_manager = GameManager(
+            ui=HeadlessUI({}),
+            strategies={1: ScriptedStrategy([0, 3, 9, 1, 2]),
+                        2: ScriptedStrategy([3, 4])})
+        game_manager.main()
+        self.assertEqual([0, 3, 1, 4, 2], game_manager.moves)
@@ -0,0 +1,102 @@
+from board import Board
+from game_manager import GameManager
+from mcts import MCTSStrategy
+from simulation import HeadlessUI, Simulator
+from strategies import RandomStrategy
+import unittest
+
+
+class TestMCTSStrategy(unittest.TestCase):
+    def test_budget_is_required(self):
+        self.assertRaises(ValueError, MCTSStrategy, 0, None, None)
+
+    def test_budget_must_be_positive(self):
+        self.assertRaises(ValueError, MCTSStrategy, 0, 0)
+        self.assertRaises(ValueError, MCTSStrategy, 0, None, 0.0)
+
+    def test_tiny_time_budget_still_chooses_move(self):
+        strategy = MCTSStrategy(seed=1, playout_budget=None,
+                                time_budget=1e-9)
+        self.assertIn(strategy.choose_move(Board(), 1), range(0, 9))
+
+    def test_takes_winning_move(self):
+        board = Board()
+        for player, move in [(1, 0), (2, 3), (1, 1), (2, 4)]:
+            board.add_player_move(player, move)
+        strategy = MCTSStrategy(seed=1, playout_budget=300)
+        self.assertEqual(2, strategy.choose_move(board, 1))
+
+    def test_blocks_opponent_win(self):
+        board = Board()
+        for player, move in [(1, 0), (2, 4), (1, 8), (2, 1)]:
+            board.add_player_move(player, move)
+        strategy = MCTSStrategy(seed=1, playout_budget=500)
+        self.assertEqual(7, strategy.choose_move(board, 1))
+
+    def test_playout_budget_is_respected(self):
+        strategy = MCTSStrategy(seed=1, playout_budget=50)
+        strategy.choose_move(Board(), 1)
+        self.assertEqual(50, strategy.playouts)
+
+    def test_time_budget_stops_search(self):
+        strategy = MCTSStrategy(seed=1, playout_budget=None, time_budget=0.05)
+        strategy.choose_move(Board(7, 4), 1)
+        self.assertGreater(strategy.playouts, 0)
+        self.assertLess(strategy.search_seconds, 1.0)
+        self.assertGreater(strategy.get_playouts_per_second(), 0)
+
+    def test_does_not_change_board(self):
+        board = Board()
+        MCTSStrategy(seed=1, playout_budget=100).choose_move(board, 1)
+        self.assertEqual(0, board.get_filled_cell_count())
+
+    def test_tree_is_reused_after_opponent_move(self):
+        board = Board()
+        strategy = MCTSStrategy(seed=1, playout_budget=400)
+        move = strategy.choose_move(board, 1)
+        board.add_player_move(1, move)
+        reply = next(cell for cell in range(0, 9) if cell != move)
+        board.add_player_move(2, reply)
+        self.assertIsNotNone(strategy._find_reusable_root(board, 1))
+
+    def test_tree_is_not_reused_in_new_game(self):
+        board = Board()
+        strategy = MCTSStrategy(seed=1, playout_budget=100)
+        board.add_player_move(1, strategy.choose_move(board, 1))
+        board.reset()
+        self.assertIsNone(strategy._find_reusable_root(board, 1))
+
+    def test_tree_is_not_reused_for_other_player(self):
+        board = Board()
+        strategy = MCTSStrategy(seed=1, playout_budget=100)
+        board.add_player_move(1, strategy.choose_move(board, 1))
+        self.assertIsNotNone(strategy._find_reusable_root(board, 2))
+        self.assertIsNone(strategy._find_reusable_root(board, 1))
+
+    def test_rarely_loses_to_random_player(self):
+        strategies = {1: MCTSStrategy(seed=2, playout_budget=200),
+                      2: RandomStrategy(3)}
+        results = Simulator(strategies).run(20)
+        self.assertGreaterEqual(results.wins[1] + results.ties, 18)
+
+    def test_plays_against_human_input_in_game_manager(self):
+        ui = MovesFromListUI(list(range(0, 9)))
+        game_manager = GameManager(
+            ui=ui, strategies={2: MCTSStrategy(seed=4, playout_budget=300)})
+        game_manager.main()
+        self.assertNotEqual(1, game_manager.board.find_winner())
+        self.assertGreater(ui.prompts, 0)
+
+
+class MovesFromListUI(HeadlessUI):
+    """A headless UI which reads the human player's moves from a list."""
+
+    def __init__(self, moves):
+        super().__init__({})
+        self.moves = moves
+        self.prompts = 0
+
+    def get_current_player_move(self, current_player, minimum_move,
+                                maximum_move):
+        self.prompts += 1
+        return self.moves.pop(0)
@@ -0,0 +1,112 @@
+from alpha_beta import AlphaBetaStrategy
+from board import Board
+from perfect_play import (PerfectPlayStrategy, PerfectPlayTable,
+                          PerfectPlayTableException, VALUE_DRAW, VALUE_LOSS,
+                          VALUE_WIN, build_table, rank_cells)
+from simulation import Simulator
+from strategies import RandomStrategy, ScriptedStrategy
+import os
+import tempfile
+import unittest
+
+
+class TestPerfectPlayTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "table.bin")
+        build_table(cls.path)
+        cls.table = PerfectPlayTable(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.table.close()
+        cls.directory.cleanup()
+
+    def test_rank_of_empty_board_is_zero(self):
+        self.assertEqual(0, rank_cells([0] * 9))
+
+    def test_rank_uses_base_3(self):
+        self.assertEqual(2 + 1 * 3 + 2 * 9, rank_cells([2, 1, 2]))
+
+    def test_empty_board_is_a_draw(self):
+        self.assertEqual(VALUE_DRAW, self.table.lookup(Board())[0])
+
+    def test_takes_winning_move(self):
+        board = Board()
+        for player, move in [(1, 6), (2, 0), (1, 7), (2, 1)]:
+            board.add_player_move(player, move)
+        self.assertEqual((VALUE_WIN, 8), self.table.lookup(board))
+
+    def test_finished_game_has_no_move(self):
+        board = Board()
+        for player, move in [(1, 0), (2, 3), (1, 1), (2, 4), (1, 2)]:
+            board.add_player_move(player, move)
+        self.assertEqual((VALUE_LOSS, -1), self.table.lookup(board))
+
+    def test_unreachable_position_is_not_found(self):
+        board = Board()
+        board.add_player_move(2, 0)
+        self.assertRaises(KeyError, self.table.lookup, board)
+
+    def test_invalid_file_fails(self):
+        path = os.path.join(self.directory.name, "invalid.bin")
+        with open(path, "wb") as invalid_file:
+            invalid_file.write(b"not a table")
+        self.assertRaises(PerfectPlayTableException, PerfectPlayTable, path)
+
+    def test_table_matches_live_search(self):
+        search = AlphaBetaStrategy(table_size_bits=14)
+        checked = set()
+
+        def visit(board, player):
+            canonical_hash = board.get_canonical_hash()
+            if canonical_hash in checked:
+                return
+            checked.add(canonical_hash)
+            value, move = self.table.lookup(board)
+            if board.find_winner() or board.is_board_full():
+                return
+            score = search.evaluate_position(board, player)
+            expected = (VALUE_WIN if score > 0 else
+                        VALUE_LOSS if score < 0 else VALUE_DRAW)
+            self.assertEqual(expected, value)
+            child = board.copy()
+            child.add_player_move(player, move)
+            child_value, _ = self.table.lookup(child)
+            self.assertEqual({VALUE_WIN: VALUE_LOSS, VALUE_DRAW: VALUE_DRAW,
+                              VALUE_LOSS: VALUE_WIN}[value], child_value)
+            for cell_move, cell in enumerate(board.get_cells()):
+                if cell == 0:
+                    child = board.copy()
+                    child.add_player_move(player, cell_move)
+                    visit(child, 3 - player)
+
+        visit(Board(), 1)
+        self.assertEqual(765, len(checked))
+
+    def test_strategy_never_loses_to_random_player(self):
+        strategies = {1: RandomStrategy(11),
+                      2: PerfectPlayStrategy(self.table)}
+        results = Simulator(strategies).run(200)
+        self.assertEqual(0, results.wins[1])
+
+    def test_strategy_when_player_2_opens(self):
+        board = Board()
+        for player, move in [(2, 4), (1, 0), (2, 3), (1, 1)]:
+            board.add_player_move(player, move)
+        strategy = PerfectPlayStrategy(self.table, ScriptedStrategy([8]))
+        self.assertEqual(5, strategy.choose_move(board, 2))
+        board.add_player_move(2, 8)
+        self.assertEqual(2, strategy.choose_move(board, 1))
+
+    def test_strategy_uses_fallback_when_turns_do_not_fit(self):
+        board = Board()
+        board.add_player_move(1, 0)
+        board.add_player_move(1, 4)
+        strategy = PerfectPlayStrategy(self.table, ScriptedStrategy([8]))
+        self.assertEqual(8, strategy.choose_move(board, 2))
+
+    def test_strategy_uses_fallback_on_larger_boards(self):
+        strategy = PerfectPlayStrategy(self.table, ScriptedStrategy([5]))
+        self.assertEqual(5, strategy.choose_move(Board(4), 1))
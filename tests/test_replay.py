@@ -0,0 +1,106 @@
+from board import PositionAlreadyFilledException
+from game_record import GameRecord, GameRecordWriter
+from replay import (CellHeatMap, GameLengthHistogram, OpeningFrequencies,
+                    ReplayException, WinRateByFirstMove, analyse_files,
+                    analyse_records, replay_games)
+import os
+import tempfile
+import unittest
+
+GAMES = [
+    GameRecord(3, 3, 2, [0, 3, 1, 4, 2], 1),
+    GameRecord(3, 3, 2, [4, 0, 8, 2, 1, 7, 6, 5, 3], 0),
+    GameRecord(3, 3, 2, [4, 0, 1, 2, 7], 1),
+    GameRecord(3, 3, 2, [0, 4, 1, 2, 3, 6], 2),
+]
+
+
+class TestReplayGames(unittest.TestCase):
+    def test_final_position_replayed(self):
+        replayed = [board.get_cells() for _, board in replay_games(GAMES[:1])]
+        self.assertEqual([(1, 1, 1, 2, 2, 0, 0, 0, 0)], replayed)
+
+    def test_one_board_reused_for_each_size(self):
+        boards = [board for _, board in replay_games(GAMES)]
+        self.assertTrue(all(board is boards[0] for board in boards))
+
+    def test_wrong_winner_rejected(self):
+        record = GameRecord(3, 3, 2, [0, 3, 1, 4, 2], 2)
+        self.assertRaises(ReplayException, list, replay_games([record]))
+
+    def test_moves_after_win_rejected(self):
+        record = GameRecord(3, 3, 2, [0, 3, 1, 4, 2, 5], 1)
+        self.assertRaises(ReplayException, list, replay_games([record]))
+
+    def test_invalid_move_rejected(self):
+        record = GameRecord(3, 3, 2, [0, 0], 0)
+        self.assertRaises(PositionAlreadyFilledException, list,
+                          replay_games([record]))
+
+
+class TestAggregators(unittest.TestCase):
+    def test_opening_frequencies(self):
+        openings, = analyse_records(GAMES, [OpeningFrequencies(2)])
+        self.assertEqual([((4, 0), 2)], openings.get_most_common(1))
+
+    def test_win_rate_by_first_move(self):
+        win_rates, = analyse_records(GAMES, [WinRateByFirstMove()])
+        self.assertEqual(0.5, win_rates.get_win_rate(4))
+        self.assertEqual(0.5, win_rates.get_win_rate(0, player=2))
+        self.assertEqual(0.0, win_rates.get_win_rate(8))
+
+    def test_game_length_histogram(self):
+        lengths, = analyse_records(GAMES, [GameLengthHistogram()])
+        self.assertEqual([(5, 2), (6, 1), (9, 1)], lengths.get_histogram())
+
+    def test_cell_heat_map(self):
+        heat_map, = analyse_records(GAMES, [CellHeatMap()])
+        self.assertEqual([[4, 4, 4], [3, 4, 1], [2, 2, 1]],
+                         heat_map.get_heat_map(3))
+
+    def test_merged_aggregates_match_single_pass(self):
+        whole = analyse_records(GAMES, [OpeningFrequencies(),
+                                        WinRateByFirstMove(),
+                                        GameLengthHistogram(), CellHeatMap()])
+        first = analyse_records(GAMES[:2], [OpeningFrequencies(),
+                                            WinRateByFirstMove(),
+                                            GameLengthHistogram(),
+                                            CellHeatMap()])
+        second = analyse_records(GAMES[2:], [OpeningFrequencies(),
+                                             WinRateByFirstMove(),
+                                             GameLengthHistogram(),
+                                             CellHeatMap()])
+        for aggregator, other in zip(first, second):
+            aggregator.merge(other)
+        self.assertEqual(whole[0].counts, first[0].counts)
+        self.assertEqual(whole[1].results, first[1].results)
+        self.assertEqual(whole[2].counts, first[2].counts)
+        self.assertEqual(whole[3].counts, first[3].counts)
+
+
+class TestAnalyseFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for file_number in range(0, 2):
+            path = os.path.join(self.directory.name, f"{file_number}.ttr")
+            with GameRecordWriter(path) as writer:
+                for record in GAMES[file_number * 2:file_number * 2 + 2]:
+                    writer.write(record)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_results_do_not_depend_on_worker_count(self):
+        single = analyse_files(self.paths, workers=1)
+        pooled = analyse_files(self.paths, workers=2)
+        self.assertEqual(single['heat_map'].counts, pooled['heat_map'].counts)
+        self.assertEqual(single['openings'].counts, pooled['openings'].counts)
+
+    def test_all_games_counted(self):
+        results = analyse_files(self.paths, ('game_lengths',), workers=1)
+        self.assertEqual(4, sum(results['game_lengths'].counts.values()))
+
+    def test_unknown_aggregator_fails(self):
+        self.assertRaises(KeyError, analyse_files, self.paths, ('telepathy',))
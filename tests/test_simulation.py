@@ -0,0 +1,82 @@
+from board import Board
+from simulation import Simulator, run_random_games
+from strategies import RandomStrategy, ScriptedStrategy
+import simulation
+import unittest
+
+
+class TestSimulator(unittest.TestCase):
+    def test_every_game_is_counted_once(self):
+        simulator = Simulator({1: RandomStrategy(1), 2: RandomStrategy(2)})
+        results = simulator.run(500)
+        self.assertEqual(500, results.games)
+        self.assertEqual(500, sum(results.wins) + results.ties)
+
+    def test_scripted_game_result_is_recorded(self):
+        simulator = Simulator({1: ScriptedStrategy([0, 1, 2]),
+                               2: ScriptedStrategy([3, 4])})
+        results = simulator.run(3)
+        self.assertEqual(3, results.wins[1])
+        self.assertEqual(0, results.ties)
+
+    def test_same_seeds_give_same_results(self):
+        first = Simulator({1: RandomStrategy(5),
+                           2: RandomStrategy(6)}).run(200)
+        second = Simulator({1: RandomStrategy(5),
+                            2: RandomStrategy(6)}).run(200)
+        self.assertEqual(first.wins, second.wins)
+        self.assertEqual(first.ties, second.ties)
+
+    def test_larger_board_with_three_players(self):
+        strategies = {player: RandomStrategy(player) for player in (1, 2, 3)}
+        results = Simulator(strategies, Board(5, 3)).run(100)
+        self.assertEqual(100, sum(results.wins) + results.ties)
+
+    def test_games_per_second_reported(self):
+        results = Simulator({1: RandomStrategy(1),
+                             2: RandomStrategy(2)}).run(10)
+        self.assertGreater(results.get_games_per_second(), 0)
+
+
+class TestRunRandomGamesPython(unittest.TestCase):
+    use_numpy = False
+
+    def test_every_game_is_counted_once(self):
+        results = run_random_games(500, seed=1, batch_size=64,
+                                   use_numpy=self.use_numpy)
+        self.assertEqual(500, results.games)
+        self.assertEqual(500, sum(results.wins) + results.ties)
+        self.assertGreater(results.get_games_per_second(), 0)
+
+    def test_fewer_games_than_batch_size(self):
+        results = run_random_games(3, seed=1, use_numpy=self.use_numpy)
+        self.assertEqual(3, sum(results.wins) + results.ties)
+
+    def test_first_player_always_wins_on_2x2(self):
+        # Any two cells of a 2x2 board are in a line, so player 1 wins with
+        # the third move of every game.
+        results = run_random_games(50, 2, seed=1, batch_size=8,
+                                   use_numpy=self.use_numpy)
+        self.assertEqual([0, 50, 0], results.wins)
+        self.assertEqual(0, results.ties)
+
+
+@unittest.skipIf(simulation.numpy is None, "NumPy is not installed")
+class TestRunRandomGamesNumpy(TestRunRandomGamesPython):
+    use_numpy = True
+
+
+class TestRandomStrategy(unittest.TestCase):
+    def test_chooses_only_empty_cell(self):
+        board = Board()
+        for move in range(0, 8):
+            board.add_player_move(1, move)
+        self.assertEqual(8, RandomStrategy(0).choose_move(board, 2))
+
+
+class TestScriptedStrategy(unittest.TestCase):
+    def test_reset_restarts_script(self):
+        strategy = ScriptedStrategy([4, 0])
+        strategy.choose_move(Board(), 1)
+        strategy.reset()
+        self.assertEqual(4, strategy.choose_move(Board(), 1))
@@ -0,0 +1,136 @@
+from board import Board
+from perfect_play import (VALUE_DRAW, VALUE_LOSS, VALUE_WIN, rank_cells,
+                          solve_positions)
+from solver import (CACHE_MAGIC, DRAW, LOSS, WIN, ExactSearcher,
+                    SolverException, find_subtrees, solve)
+import os
+import tempfile
+import unittest
+
+
+def make_board(moves: list[int], size: int = 3) -> Board:
+    """Build a two-player board with the moves made in turn from player 1."""
+    board = Board(size, number_of_players=2)
+    for number, move in enumerate(moves):
+        board.add_player_move(1 + number % 2, move)
+    return board
+
+
+class TestExactSearcher(unittest.TestCase):
+    def setUp(self):
+        self.searcher = ExactSearcher()
+
+    def test_centre_then_edge_is_a_win(self):
+        # After X takes the centre and O an edge, X can force a win.
+        self.assertEqual(WIN, self.searcher.solve(make_board([4, 1])))
+
+    def test_centre_then_corner_draws(self):
+        self.assertEqual(DRAW, self.searcher.solve(make_board([4, 0])))
+
+    def test_unstoppable_double_threat_loses(self):
+        # X holds 0, 4 and 6, threatening both 2 and 3, with O to move.
+        board = make_board([0, 1, 4, 8, 6])
+        self.assertEqual(LOSS, self.searcher.solve(board))
+
+    def test_board_unchanged_after_search(self):
+        board = make_board([4, 0])
+        cells = board.get_cells()
+        self.searcher.solve(board)
+        self.assertEqual(cells, board.get_cells())
+        self.assertEqual(2, board.get_filled_cell_count())
+
+    def test_matches_perfect_play_on_every_3x3_position(self):
+        expected_values = {VALUE_WIN: WIN, VALUE_DRAW: DRAW,
+                           VALUE_LOSS: LOSS}
+        entries = solve_positions()
+        board = Board(3, number_of_players=2)
+
+        def visit(player):
+            for move in board.get_empty_moves():
+                board.add_player_move(player, move)
+                if not board.find_winner() and not board.is_board_full():
+                    canonical_cells, _ = board.get_canonical_form()
+                    expected = entries[rank_cells(canonical_cells)][0]
+                    self.assertEqual(expected_values[expected],
+                                     self.searcher.solve(board))
+                    visit(3 - player)
+                board.undo_move()
+
+        visit(1)
+
+    def test_table_bounded_within_one_search(self):
+        searcher = ExactSearcher(max_table_entries=10)
+        self.assertEqual(DRAW, searcher.solve(Board(3, number_of_players=2)))
+        self.assertGreater(searcher.nodes, 10)
+        self.assertLessEqual(len(searcher.table), 10)
+        self.assertEqual(WIN, searcher.solve(make_board([4, 1])))
+        self.assertLessEqual(len(searcher.table), 10)
+
+
+class TestSolve(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "solver.cache")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_3x3_is_a_draw_from_every_opening(self):
+        result = solve(3, workers=1)
+        self.assertEqual(DRAW, result.value)
+        self.assertEqual(list(range(0, 9)), result.get_best_moves())
+        self.assertEqual({DRAW}, set(result.move_values.values()))
+
+    def test_3x3_results_do_not_depend_on_split_or_workers(self):
+        single = solve(3, split_depth=1, workers=1)
+        pooled = solve(3, split_depth=3, workers=2)
+        self.assertEqual(single.value, pooled.value)
+        self.assertEqual(single.move_values, pooled.move_values)
+
+    def test_short_win_length_is_a_first_player_win(self):
+        result = solve(3, win_length=2, workers=1)
+        self.assertEqual(WIN, result.value)
+
+    def test_subtrees_are_distinct_up_to_symmetry(self):
+        # Corner, edge and centre openings, then each reply to them.
+        self.assertEqual(3, len(find_subtrees(3, 3, 1)))
+        self.assertEqual(12, len(find_subtrees(3, 3, 2)))
+
+    def test_progress_reported_until_every_subtree_done(self):
+        reports = []
+        solve(3, workers=1,
+              progress=lambda progress: reports.append(
+                  (progress.subtrees_done, progress.subtrees_total,
+                   progress.nodes)))
+        self.assertEqual((0, 12, 0), reports[0])
+        self.assertEqual(13, len(reports))
+        self.assertEqual(12, reports[-1][0])
+        self.assertGreater(reports[-1][2], 0)
+
+    def test_cached_subtrees_are_not_searched_again(self):
+        first = solve(3, workers=1, cache_path=self.cache_path)
+        second = solve(3, workers=1, cache_path=self.cache_path)
+        self.assertEqual(first.move_values, second.move_values)
+        self.assertEqual(12, second.progress.subtrees_cached)
+        self.assertEqual(0, second.progress.nodes)
+        self.assertIsNone(second.progress.get_eta_seconds())
+
+    def test_interrupted_cache_resumes(self):
+        solve(3, workers=1, cache_path=self.cache_path)
+        # Drop the last two records and half of the one before.
+        with open(self.cache_path, "r+b") as cache_file:
+            cache_file.truncate(os.path.getsize(self.cache_path) - 22)
+        result = solve(3, workers=1, cache_path=self.cache_path)
+        self.assertEqual(DRAW, result.value)
+        self.assertEqual(9, result.progress.subtrees_cached)
+        self.assertEqual(len(CACHE_MAGIC) + 2 + 12 * 9,
+                         os.path.getsize(self.cache_path))
+
+    def test_cache_for_other_board_fails(self):
+        solve(3, workers=1, cache_path=self.cache_path)
+        with self.assertRaises(SolverException):
+            solve(3, win_length=2, workers=1, cache_path=self.cache_path)
+
+    def test_board_too_large_to_rank_fails(self):
+        with self.assertRaises(ValueError):
+            solve(7)
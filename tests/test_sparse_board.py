@@ -0,0 +1,106 @@
+from board import Board
+from board import MoveOutOfBoundsException, PositionAlreadyFilledException
+from board import NoMoveToUndoException
+from console_ui import ConsoleUI
+from sparse_board import SparseBoard
+import contextlib
+import io
+import random
+import tracemalloc
+import unittest
+
+
+class TestSparseBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = SparseBoard(10000, 5)
+
+    def test_move_added_to_correct_cell(self):
+        self.board.add_move_by_coordinates(1, 9000, 42)
+        self.assertEqual(1, self.board.get_board_data()[9000][42])
+        self.assertEqual(0, self.board.get_board_data()[9000][43])
+
+    def test_move_out_of_bounds_fails(self):
+        self.assertRaises(MoveOutOfBoundsException,
+                          self.board.add_player_move, 1, 10000 * 10000)
+
+    def test_move_fails_if_cell_already_filled(self):
+        self.board.add_player_move(1, 123456)
+        self.assertRaises(PositionAlreadyFilledException,
+                          self.board.add_player_move, 2, 123456)
+
+    def test_five_in_a_row_wins_far_from_origin(self):
+        for step in range(0, 5):
+            self.board.add_move_by_coordinates(2, 5000 + step, 7000 - step)
+        self.assertEqual(2, self.board.find_winner())
+
+    def test_undo_removes_winner(self):
+        for step in range(0, 5):
+            self.board.add_move_by_coordinates(2, 10, 10 + step)
+        self.board.undo_move()
+        self.assertEqual(0, self.board.find_winner())
+        self.assertEqual(4, self.board.get_filled_cell_count())
+
+    def test_undo_with_no_moves_fails(self):
+        self.assertRaises(NoMoveToUndoException, self.board.undo_move)
+
+    def test_view_has_board_dimensions(self):
+        board_data = self.board.get_board_data()
+        self.assertEqual(10000, len(board_data))
+        self.assertEqual(10000, len(board_data[5]))
+
+    def test_window_contains_moves(self):
+        self.board.add_move_by_coordinates(1, 20, 30)
+        self.board.add_move_by_coordinates(2, 21, 32)
+        self.assertEqual((20, 30, 21, 32), self.board.get_occupied_bounds())
+        self.assertEqual([[1, 0, 0], [0, 0, 2]],
+                         self.board.get_board_window(20, 30, 2, 3))
+
+    def test_memory_grows_with_moves_not_area(self):
+        tracemalloc.start()
+        board = SparseBoard(10000, 5)
+        for move in range(0, 200):
+            board.add_player_move(1 + move % 2, move * 7919)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertLess(peak, 200000)
+
+    def test_random_empty_move_is_empty(self):
+        board = SparseBoard(3)
+        for move in range(0, 8):
+            board.add_player_move(1, move)
+        self.assertEqual(8, board.get_random_empty_move(random.Random(1)))
+
+    def test_console_ui_displays_view(self):
+        board = SparseBoard(3)
+        board.add_player_move(1, 4)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ConsoleUI({0: ' ', 1: 'X', 2: 'O'}).display_2d_board(
+                board.get_board_data())
+        self.assertIn("  | X |  ", output.getvalue())
+
+    def test_results_match_board_on_random_games(self):
+        generator = random.Random(13)
+        for _ in range(200):
+            size = generator.randrange(1, 7)
+            win_length = generator.randrange(1, size + 1)
+            board = Board(size, win_length)
+            sparse_board = SparseBoard(size, win_length)
+            moves = list(range(0, size * size))
+            generator.shuffle(moves)
+            for move in moves:
+                player = generator.randrange(1, 3)
+                board.add_player_move(player, move)
+                sparse_board.add_player_move(player, move)
+                self.assertEqual(board.find_winner(),
+                                 sparse_board.find_winner())
+                self.assertEqual(board.is_board_full(),
+                                 sparse_board.is_board_full())
+            self.assertEqual(board.get_board_data(),
+                             [list(row) for row in
+                              sparse_board.get_board_data()])
+            for _ in moves:
+                board.undo_move()
+                sparse_board.undo_move()
+                self.assertEqual(board.find_winner(),
+                                 sparse_board.find_winner())
@@ -0,0 +1,84 @@
+from board import Board
+from symmetry import (get_canonical_form, get_canonical_hash,
+                      get_symmetry_permutations, from_canonical_move,
+                      to_canonical_move)
+import random
+import unittest
+
+
+class TestSymmetryPermutations(unittest.TestCase):
+    def test_eight_distinct_permutations(self):
+        permutations = get_symmetry_permutations(3)
+        self.assertEqual(8, len(set(permutations)))
+
+    def test_first_permutation_is_identity(self):
+        self.assertEqual(tuple(range(0, 16)), get_symmetry_permutations(4)[0])
+
+    def test_permutations_are_closed_under_composition(self):
+        permutations = set(get_symmetry_permutations(4))
+        for first in permutations:
+            for second in permutations:
+                composed = tuple(first[cell] for cell in second)
+                self.assertIn(composed, permutations)
+
+
+class TestCanonicalForm(unittest.TestCase):
+    def test_corner_openings_share_canonical_form(self):
+        forms = set()
+        for corner in (0, 2, 6, 8):
+            board = Board()
+            board.add_player_move(1, corner)
+            forms.add(board.get_canonical_form()[0])
+        self.assertEqual(1, len(forms))
+
+    def test_corner_and_edge_openings_differ(self):
+        corner = Board()
+        corner.add_player_move(1, 0)
+        edge = Board()
+        edge.add_player_move(1, 1)
+        self.assertNotEqual(corner.get_canonical_hash(),
+                            edge.get_canonical_hash())
+
+    def test_all_variants_have_same_hash(self):
+        generator = random.Random(8)
+        for size in range(1, 7):
+            cells = [generator.randrange(0, 3) for _ in range(size * size)]
+            hashes = {get_canonical_hash([cells[cell] for cell in permutation],
+                                         size)
+                      for permutation in get_symmetry_permutations(size)}
+            self.assertEqual(1, len(hashes))
+
+    def test_there_are_765_distinct_3x3_positions(self):
+        positions = set()
+
+        def visit(board, player):
+            canonical_hash = board.get_canonical_hash()
+            if canonical_hash in positions:
+                return
+            positions.add(canonical_hash)
+            if board.find_winner() or board.is_board_full():
+                return
+            for move, cell in enumerate(board.get_cells()):
+                if cell == 0:
+                    child = board.copy()
+                    child.add_player_move(player, move)
+                    visit(child, 3 - player)
+
+        visit(Board(), 1)
+        self.assertEqual(765, len(positions))
+
+    def test_moves_map_to_and_from_canonical_board(self):
+        board = Board(4)
+        board.add_player_move(1, 7)
+        board.add_player_move(2, 2)
+        canonical_cells, symmetry = board.get_canonical_form()
+        for move in range(0, 16):
+            canonical_move = to_canonical_move(move, symmetry, 4)
+            self.assertEqual(board.get_cells()[move],
+                             canonical_cells[canonical_move])
+            self.assertEqual(move, from_canonical_move(canonical_move,
+                                                       symmetry, 4))
+
+    def test_canonical_form_of_cells(self):
+        cells, symmetry = get_canonical_form((0, 0, 1, 0), 2)
+        self.assertEqual((0, 0, 0, 1), cells)
@@ -0,0 +1,163 @@
+from bitboard import BitBoard
+from board import Board
+from perfect_play import VALUE_DRAW, VALUE_LOSS, VALUE_WIN, rank_cells
+from solver import DRAW, LOSS, WIN, ExactSearcher
+from tablebase import (HEADER_LENGTH, VALUE_INVALID, Tablebase,
+                       TablebaseException, build_tablebase, get_table_length)
+import os
+import tablebase
+import tempfile
+import unittest
+from unittest import mock
+
+
+def make_board(moves: list[int], size: int = 3) -> Board:
+    """Build a two-player board with the moves made in turn from player 1."""
+    board = Board(size, number_of_players=2)
+    for number, move in enumerate(moves):
+        board.add_player_move(1 + number % 2, move)
+    return board
+
+
+class TestTablebase(unittest.TestCase):
+    use_numpy = False
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "tablebase.bin")
+        build_tablebase(cls.path, 3, chunk_positions=256,
+                        use_numpy=cls.use_numpy)
+        cls.tablebase = Tablebase(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def test_file_holds_four_values_per_byte(self):
+        self.assertEqual(HEADER_LENGTH + (3 ** 9 + 3) // 4,
+                         os.path.getsize(self.path))
+        self.assertEqual(3, self.tablebase.size)
+
+    def test_empty_board_is_a_draw(self):
+        self.assertEqual(VALUE_DRAW, self.tablebase.lookup(make_board([])))
+
+    def test_won_position_is_a_loss_for_player_to_move(self):
+        board = make_board([0, 3, 1, 4, 2])
+        self.assertEqual(VALUE_LOSS, self.tablebase.lookup(board))
+
+    def test_full_board_without_winner_is_a_draw(self):
+        board = make_board([4, 0, 8, 2, 1, 7, 6, 3, 5])
+        self.assertEqual(VALUE_DRAW, self.tablebase.lookup(board))
+
+    def test_unreachable_positions_are_invalid(self):
+        # Player 1 has two more pieces than player 2.
+        self.assertEqual(VALUE_INVALID,
+                         self.tablebase.lookup_rank(rank_cells(
+                             [1, 1, 0, 0, 0, 0, 0, 0, 0])))
+        # Player 1 is to move, but player 1 has already won.
+        self.assertEqual(VALUE_INVALID,
+                         self.tablebase.lookup_rank(rank_cells(
+                             [1, 1, 1, 2, 2, 0, 2, 0, 0])))
+
+    def test_rank_matches_rank_cells(self):
+        board = make_board([4, 0, 8])
+        self.assertEqual(rank_cells(board.get_cells()),
+                         self.tablebase.get_rank(board))
+
+    def test_bitboard_lookup_matches_board(self):
+        bitboard = BitBoard(3, number_of_players=2)
+        for number, move in enumerate([4, 1, 0]):
+            bitboard.add_player_move(1 + number % 2, move)
+        self.assertEqual(VALUE_LOSS, self.tablebase.lookup(bitboard))
+        self.assertEqual(self.tablebase.get_rank(make_board([4, 1, 0])),
+                         self.tablebase.get_rank(bitboard))
+
+    def test_board_of_other_size_fails(self):
+        for size in (2, 4):
+            board = make_board([], size)
+            self.assertRaises(ValueError, self.tablebase.lookup, board)
+            self.assertRaises(ValueError, self.tablebase.get_rank, board)
+
+    def test_matches_search_on_every_reachable_position(self):
+        expected_values = {WIN: VALUE_WIN, DRAW: VALUE_DRAW,
+                           LOSS: VALUE_LOSS}
+        searcher = ExactSearcher()
+        board = Board(3, number_of_players=2)
+        visited = set()
+
+        def visit(player):
+            for move in board.get_empty_moves():
+                board.add_player_move(player, move)
+                if board.get_zobrist_hash() not in visited:
+                    visited.add(board.get_zobrist_hash())
+                    value = self.tablebase.lookup(board)
+                    if board.find_winner():
+                        self.assertEqual(VALUE_LOSS, value)
+                    elif board.is_board_full():
+                        self.assertEqual(VALUE_DRAW, value)
+                    else:
+                        self.assertEqual(
+                            expected_values[searcher.solve(board)], value)
+                        visit(3 - player)
+                board.undo_move()
+
+        visit(1)
+
+
+@unittest.skipIf(tablebase.numpy is None, "NumPy is not installed")
+class TestTablebaseNumPy(TestTablebase):
+    use_numpy = True
+
+    def test_same_file_as_plain_python(self):
+        path = os.path.join(self.directory.name, "python.bin")
+        build_tablebase(path, 3, use_numpy=False)
+        with open(path, "rb") as python_file:
+            with open(self.path, "rb") as numpy_file:
+                self.assertEqual(python_file.read(), numpy_file.read())
+
+
+class TestBuildTablebase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tablebase.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_chunk_size_does_not_change_table(self):
+        build_tablebase(self.path, 3, chunk_positions=4, use_numpy=False)
+        with open(self.path, "rb") as table_file:
+            small_chunks = table_file.read()
+        build_tablebase(self.path, 3, use_numpy=False)
+        with open(self.path, "rb") as table_file:
+            self.assertEqual(small_chunks, table_file.read())
+
+    def test_chunk_must_fill_whole_bytes(self):
+        with self.assertRaises(ValueError):
+            build_tablebase(self.path, 3, chunk_positions=6)
+
+    def test_board_too_large_fails(self):
+        with self.assertRaises(ValueError):
+            build_tablebase(self.path, 5)
+
+    def test_failed_build_leaves_no_files(self):
+        with mock.patch.object(tablebase, "_solve_chunk_python",
+                               side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                build_tablebase(self.path, 3, use_numpy=False)
+        self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_table_length_rounds_up(self):
+        self.assertEqual(10761681, get_table_length(4))
+
+    def test_open_or_build_builds_missing_file(self):
+        with Tablebase.open_or_build(self.path, 2) as opened:
+            self.assertEqual(VALUE_WIN, opened.lookup(make_board([], 2)))
+
+    def test_invalid_file_rejected(self):
+        with open(self.path, "wb") as table_file:
+            table_file.write(b"not a tablebase")
+        with self.assertRaises(TablebaseException):
+            Tablebase(self.path)
@@ -0,0 +1,25 @@
+from tournament import run_tournament
+import unittest
+
+
+class TestRunTournament(unittest.TestCase):
+    def test_every_game_is_counted_once(self):
+        results = run_tournament(2500, workers=1, chunk_size=1000)
+        self.assertEqual(2500, results.games)
+        self.assertEqual(2500, sum(results.wins) + results.ties)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        single = run_tournament(3000, workers=1, chunk_size=500, seed=3)
+        pooled = run_tournament(3000, workers=2, chunk_size=500, seed=3)
+        self.assertEqual(single.wins, pooled.wins)
+        self.assertEqual(single.ties, pooled.ties)
+
+    def test_different_seeds_give_different_results(self):
+        first = run_tournament(2000, workers=1, seed=1)
+        second = run_tournament(2000, workers=1, seed=2)
+        self.assertNotEqual((first.wins, first.ties),
+                            (second.wins, second.ties))
+
+    def test_unknown_strategy_fails(self):
+        self.assertRaises(KeyError, run_tournament, 10, 1,
+                          strategy_names=('random', 'telepathic'))
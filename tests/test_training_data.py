@@ -0,0 +1,115 @@
+from board import Board, PositionAlreadyFilledException
+from training_data import (HEADER_LENGTH, TrainingDataWriter, build_header,
+                           generate_self_play_data, get_sample_size,
+                           load_shard)
+import os
+import tempfile
+import training_data
+import unittest
+
+
+class TestTrainingDataWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_header_is_aligned(self):
+        header = build_header(15, 10 ** 12)
+        self.assertEqual(HEADER_LENGTH, len(header))
+        self.assertEqual(0, len(header) % 64)
+        self.assertTrue(header.endswith(b"\n"))
+
+    def test_full_shards_started_as_needed(self):
+        with TrainingDataWriter(self.directory.name,
+                                shard_samples=4) as writer:
+            writer.write_game([0, 3, 1, 4, 2], 1)
+            writer.write_game([4, 0], 0)
+        self.assertEqual(2, len(writer.shard_paths))
+        self.assertEqual(7, writer.samples_written)
+        self.assertEqual(HEADER_LENGTH + 4 * get_sample_size(3),
+                         os.path.getsize(writer.shard_paths[0]))
+        self.assertEqual(HEADER_LENGTH + 3 * get_sample_size(3),
+                         os.path.getsize(writer.shard_paths[1]))
+
+    def test_new_writer_continues_numbering(self):
+        with TrainingDataWriter(self.directory.name) as writer:
+            writer.write_game([4], 0)
+        with TrainingDataWriter(self.directory.name) as writer:
+            writer.write_game([4], 0)
+        self.assertEqual(["shard_00000.npy", "shard_00001.npy"],
+                         sorted(os.listdir(self.directory.name)))
+
+    def test_writes_board_buffer(self):
+        board = Board()
+        board.add_player_move(1, 4)
+        with TrainingDataWriter(self.directory.name) as writer:
+            writer.write_sample(board.get_cell_buffer(), 2, 0, -1)
+        with open(writer.shard_paths[0], "rb") as shard_file:
+            shard_file.seek(HEADER_LENGTH)
+            self.assertEqual(bytes([0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 255]),
+                             shard_file.read())
+
+
+    def test_move_off_the_board_fails(self):
+        with TrainingDataWriter(self.directory.name) as writer:
+            cells = bytes(9)
+            for move in (-1, 9, 1 << 16):
+                self.assertRaises(ValueError, writer.write_sample, cells, 1,
+                                  move, 0)
+            self.assertRaises(ValueError, writer.write_game, [4, 70000], 0)
+        self.assertEqual(0, writer.samples_written)
+
+    def test_invalid_game_leaves_shard_unchanged(self):
+        with TrainingDataWriter(self.directory.name) as writer:
+            writer.write_game([4, 0], 0)
+            self.assertRaises(PositionAlreadyFilledException,
+                              writer.write_game, [0, 4, 0], 0)
+            self.assertRaises(ValueError, writer.write_game,
+                              [0, 3, 1, 4, 2, 5], 1)
+            self.assertEqual(2, writer.samples_written)
+        with open(writer.shard_paths[0], "rb") as shard_file:
+            written = shard_file.read()
+        expected_path = os.path.join(self.directory.name, "expected")
+        with TrainingDataWriter(expected_path) as expected_writer:
+            expected_writer.write_game([4, 0], 0)
+        with open(expected_writer.shard_paths[0], "rb") as shard_file:
+            self.assertEqual(shard_file.read(), written)
+
+    def test_board_too_large_for_moves_fails(self):
+        self.assertRaises(ValueError, TrainingDataWriter,
+                          self.directory.name, 257)
+
+
+@unittest.skipIf(training_data.numpy is None, "NumPy is not installed")
+class TestLoadShard(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_samples_read_back(self):
+        with TrainingDataWriter(self.directory.name) as writer:
+            writer.write_game([0, 3, 1, 4, 2], 1)
+        samples = load_shard(writer.shard_paths[0])
+        self.assertEqual(5, len(samples))
+        self.assertEqual([0, 3, 1, 4, 2], samples["move"].tolist())
+        self.assertEqual([1, 2, 1, 2, 1], samples["player"].tolist())
+        self.assertEqual([1, -1, 1, -1, 1], samples["outcome"].tolist())
+        self.assertEqual([1, 0, 0, 2, 0, 0, 0, 0, 0],
+                         samples["position"][2].tolist())
+
+    def test_self_play_data_loads(self):
+        samples_written = generate_self_play_data(self.directory.name, 200,
+                                                  shard_samples=500)
+        total = 0
+        for name in sorted(os.listdir(self.directory.name)):
+            samples = load_shard(os.path.join(self.directory.name, name))
+            total += len(samples)
+            # Every move was made into an empty cell.
+            moved_cells = samples["position"][
+                training_data.numpy.arange(len(samples)), samples["move"]]
+            self.assertTrue((moved_cells == 0).all())
+        self.assertEqual(samples_written, total)
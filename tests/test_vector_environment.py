@@ -0,0 +1,89 @@
+from board import Board, MoveOutOfBoundsException
+from board import PositionAlreadyFilledException
+from vector_environment import (STEP_ALREADY_FILLED, STEP_OK,
+                                STEP_OUT_OF_BOUNDS, VectorEnvironment)
+import random
+import unittest
+import vector_environment
+
+
+class TestVectorEnvironmentPython(unittest.TestCase):
+    use_numpy = False
+
+    def make_environment(self, games: int, size: int = 3):
+        return VectorEnvironment(games, size, use_numpy=self.use_numpy)
+
+    def test_move_made_for_current_player(self):
+        environment = self.make_environment(2)
+        errors, winners, done = environment.step([4, 0])
+        self.assertEqual([STEP_OK, STEP_OK], list(errors))
+        self.assertEqual([[0, 0, 0], [0, 1, 0], [0, 0, 0]],
+                         environment.get_board_data(0))
+        self.assertEqual([2, 2], list(environment.current_players))
+
+    def test_invalid_moves_return_error_codes(self):
+        environment = self.make_environment(3)
+        environment.step([4, 4, 4])
+        errors, _, _ = environment.step([9, 4, -1])
+        self.assertEqual([STEP_OUT_OF_BOUNDS, STEP_ALREADY_FILLED,
+                          STEP_OUT_OF_BOUNDS], list(errors))
+        self.assertEqual([2, 2, 2], list(environment.current_players))
+
+    def test_win_reported_and_game_reset(self):
+        environment = self.make_environment(1)
+        for move in [0, 3, 1, 4]:
+            environment.step([move])
+        errors, winners, done = environment.step([2])
+        self.assertEqual(1, winners[0])
+        self.assertTrue(done[0])
+        self.assertEqual([[0] * 3] * 3, environment.get_board_data(0))
+        self.assertEqual(1, environment.current_players[0])
+
+    def test_tie_reported(self):
+        environment = self.make_environment(1)
+        for move in [4, 0, 2, 6, 3, 5, 1, 7]:
+            _, _, done = environment.step([move])
+            self.assertFalse(done[0])
+        _, winners, done = environment.step([8])
+        self.assertEqual(0, winners[0])
+        self.assertTrue(done[0])
+
+    def test_wrong_number_of_moves_rejected(self):
+        environment = self.make_environment(2)
+        self.assertRaises(ValueError, environment.step, [0])
+
+    def test_results_match_boards(self):
+        generator = random.Random(21)
+        for size in [1, 3, 4]:
+            games = 20
+            environment = self.make_environment(games, size)
+            boards = [Board(size) for _ in range(0, games)]
+            players = [1] * games
+            for _ in range(0, 300):
+                moves = [generator.randrange(-1, size * size + 1)
+                         for _ in range(0, games)]
+                errors, winners, done = environment.step(moves)
+                for game, board in enumerate(boards):
+                    expected = (STEP_OK, 0, False)
+                    try:
+                        board.add_player_move(players[game], moves[game])
+                        if board.find_winner() or board.is_board_full():
+                            expected = (STEP_OK, board.find_winner(), True)
+                            board.reset()
+                            players[game] = 1
+                        else:
+                            players[game] = 3 - players[game]
+                    except MoveOutOfBoundsException:
+                        expected = (STEP_OUT_OF_BOUNDS, 0, False)
+                    except PositionAlreadyFilledException:
+                        expected = (STEP_ALREADY_FILLED, 0, False)
+                    self.assertEqual(expected, (int(errors[game]),
+                                                int(winners[game]),
+                                                bool(done[game])))
+                    self.assertEqual(board.get_board_data(),
+                                     environment.get_board_data(game))
+
+
+@unittest.skipIf(vector_environment.numpy is None, "NumPy is not installed")
+class TestVectorEnvironmentNumpy(TestVectorEnvironmentPython):
+    use_numpy = True